@@ -7,30 +7,77 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import urllib.parse
 from dotenv import load_dotenv
+import click
 from apscheduler.schedulers.background import BackgroundScheduler
 import atexit
 from sqlalchemy import inspect, func, text, desc, or_, and_
 import pytz
 
 # 모듈 import
-from models import db, User, Semester, Subject, TimeSlot, Schedule, StudyLog, Todo, Post, CalendarCategory, CalendarEvent, Comment, PostLike
+from models import db, User, Semester, Subject, TimeSlot, Schedule, StudyLog, StudyDailyTotal, UserGradeTotal, Todo, Post, CalendarCategory, CalendarEvent, Comment, PostLike
 from utils.constants import *
 from utils.decorators import login_required, post_manager_required, admin_required
 from utils.helpers import sort_semesters, calculate_gpa, allowed_file as _allowed_file
+from crawling import crawl_and_save_menu
 from services import (
     load_academic_calendar,
     get_semester_start_date,
     _get_semester_start_date_fallback,
-    create_semesters_for_user,
-    manage_semesters_job,
-    load_meal_data,
-    get_today_meal_key,
-    format_meal_for_client,
-    format_weekly_meal_for_client,
+    provision_semesters_for_all_users,
+    get_semester_years,
+    get_user_semesters,
+    resolve_user_semester,
+    materialize_semester,
+    get_current_semester,
+    get_today_meal,
+    get_weekly_meal,
     load_bus_schedule,
+    build_shuttle_index,
+    get_next_departures,
+    SHUTTLE_NEXT_DEFAULT_LIMIT,
+    SHUTTLE_NEXT_MAX_LIMIT,
+    get_today_schedule,
+    add_study_log,
+    add_study_segments,
+    split_segment_by_date,
+    get_daily_totals_for_dates,
+    get_daily_total,
+    get_total_between,
+    get_streak_and_today_total,
+    get_study_window_aggregates,
+    get_hourly_totals_between,
+    resolve_session_times,
+    rebuild_daily_totals,
+    parse_subject_credits,
+    apply_subject_grade_change,
+    get_user_grade_summary,
+    get_semester_grade_summaries,
+    seed_grade_points,
+    rebuild_grade_totals,
+    queue_post_like,
+    get_pending_like_delta,
+    apply_pending_likes,
+    stop_write_behind,
+    get_write_behind_metrics,
+    check_index_usage,
+    get_daily_memo_note,
+    save_daily_memo,
+    build_weekly_memo_digest,
+    migrate_memo_blobs,
+    increment_post_counter,
+    serialize_posts,
+    get_feed_page,
+    reconcile_post_counters,
     initialize_system_categories,
     initialize_system_events,
-    create_default_categories_for_user
+    sync_system_events,
+    sync_system_events_job,
+    create_default_categories_for_user,
+    event_overlap_filter,
+    serialize_events,
+    serialize_event_occurrences,
+    get_system_event_dicts,
+    backfill_event_spans
 )
 
 load_dotenv()
@@ -69,6 +116,9 @@ def allowed_file(filename):
 # Initialize database with app
 db.init_app(app)
 
+# 종료 시 쓰기 지연 큐(좋아요 토글)의 남은 작업 반영 (gunicorn 워커 포함)
+atexit.register(stop_write_behind)
+
 # --- 시간대 설정 ---
 KST = pytz.timezone('Asia/Seoul')
 
@@ -104,6 +154,89 @@ def init_db_command():
         create_initial_data()
     print("Database initialized.")
 
+@app.cli.command("backfill-study-totals")
+def backfill_study_totals_command():
+    """Rebuilds the daily study totals table from study_logs."""
+    with app.app_context():
+        row_count = rebuild_daily_totals()
+    print(f"Daily study totals rebuilt ({row_count} rows).")
+
+@app.cli.command("sync-system-events")
+def sync_system_events_command():
+    """Applies Calendar.csv / holidays.csv changes to system calendar events."""
+    with app.app_context():
+        initialize_system_categories()
+        result = sync_system_events()
+    if result is None:
+        print("System event sync failed.")
+    else:
+        inserted, updated, deleted = result
+        print(f"System events synced (+{inserted} ~{updated} -{deleted}).")
+
+@app.cli.command("provision-semesters")
+@click.option('--year', 'years', type=int, multiple=True, help='Year to create semesters for (repeatable, defaults to the listed semester years).')
+def provision_semesters_command(years):
+    """Creates semester rows for every user ahead of time (normally created on first subject or todo)."""
+    with app.app_context():
+        created = provision_semesters_for_all_users(list(years or get_semester_years()))
+    print(f"Semesters provisioned ({created} semesters created).")
+
+@app.cli.command("backfill-grade-totals")
+def backfill_grade_totals_command():
+    """Rebuilds the per-semester and per-user grade totals from subjects."""
+    with app.app_context():
+        seed_grade_points()
+        row_count = rebuild_grade_totals()
+    print(f"Grade totals rebuilt ({row_count} semester rows).")
+
+@app.cli.command("migrate-subject-memos")
+def migrate_subject_memos_command():
+    """Moves daily memos out of Subject.memo JSON into subject_daily_memos."""
+    with app.app_context():
+        migrated = migrate_memo_blobs()
+    print(f"Subject daily memos migrated ({migrated} memos).")
+
+@app.cli.command("reconcile-post-counters")
+def reconcile_post_counters_command():
+    """Repairs drifted like/comment counters on posts."""
+    with app.app_context():
+        repaired = reconcile_post_counters()
+    print(f"Post counters reconciled ({repaired} posts repaired).")
+
+
+@app.cli.command("check-study-query-plans")
+@click.option('--user-id', default=None, help='Student ID to run the study endpoints as (defaults to the first user).')
+def check_study_query_plans_command(user_id):
+    """Fails unless every study endpoint query on study_logs range-scans ix_study_logs_user_date."""
+    with app.app_context():
+        user_id = user_id or db.session.query(User.id).order_by(User.id).limit(1).scalar()
+        if not user_id:
+            raise click.ClickException("No users found.")
+        semester = get_current_semester(user_id, datetime.now(KST).date())
+        semester_id = semester.id if semester else 0
+
+        def run_study_requests():
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['student_id'] = user_id
+            client.get('/api/study-stats')
+            for period in ('daily', 'weekly', 'monthly'):
+                client.get(f'/api/study-analysis-data?semester_id={semester_id}&period={period}')
+
+        # PostgreSQL 인덱스는 합계/과목 컬럼을 INCLUDE하므로 그 컬럼만 읽는 조회는 Index Only Scan까지 요구
+        # (SQLite 인덱스는 INCLUDE가 없어 커버링이 아님)
+        covered_columns = None
+        if db.engine.dialect.name == 'postgresql':
+            covered_columns = ('user_id', 'date', 'duration_seconds', 'subject_id')
+        statements, failures = check_index_usage(
+            db.engine, 'study_logs', 'ix_study_logs_user_date', run_study_requests, covered_columns=covered_columns
+        )
+
+    for statement, problems in failures:
+        print(f"study_logs query does not use ix_study_logs_user_date as expected:\n  {statement}\n  -> {'; '.join(problems)}")
+    if failures:
+        raise click.ClickException(f"{len(failures)} of {len(statements)} study_logs queries do not use ix_study_logs_user_date.")
+    print(f"All {len(statements)} study_logs queries range-scan ix_study_logs_user_date.")
 
 
 # --- DB 초기화 함수 ---
@@ -133,6 +266,14 @@ def create_initial_data():
             db.session.execute(text("ALTER TABLE semesters ADD COLUMN start_date DATE NULL"))
             print("--- [MIGRATION] 'start_date' column added. ---")
 
+        # --- [신규] start_date가 비어 있는 학기 채우기 (현재 학기 조회는 start_date 인덱스 범위로 수행) ---
+        semesters_without_start = Semester.query.filter(Semester.start_date == None).all()
+        if semesters_without_start:
+            print(f"--- [MIGRATION] Filling 'start_date' for {len(semesters_without_start)} semesters... ---")
+            for semester in semesters_without_start:
+                semester.start_date = get_semester_start_date(semester.year, semester.season)
+            print("--- [MIGRATION] 'start_date' filled. ---")
+
 
         # Subject 테이블 마이그레이션 (memo)
         subject_columns = [col['name'] for col in inspector.get_columns('subjects')]
@@ -141,6 +282,22 @@ def create_initial_data():
              db.session.execute(text("ALTER TABLE subjects ADD COLUMN memo TEXT DEFAULT '{\"note\": \"\", \"todos\": []}'"))
              db.session.execute(text("UPDATE subjects SET memo = '{\"note\": \"\", \"todos\": []}' WHERE memo IS NULL"))
              print("--- [MIGRATION] 'memo' column added and initialized. ---")
+
+        # --- [신규] 성적 -> 평점 조회 테이블 (GRADE_MAP 기준) ---
+        seed_grade_points()
+
+        # --- [신규] 성적 집계 테이블 백필 (집계가 비어 있고 과목이 있을 때만) ---
+        has_grade_totals = db.session.query(UserGradeTotal.user_id).first() is not None
+        if not has_grade_totals and db.session.query(Subject.id).first() is not None:
+            print("--- [MIGRATION] 'semester_grade_totals' is empty. Backfilling from 'subjects'... ---")
+            row_count = rebuild_grade_totals()
+            print(f"--- [MIGRATION] 'semester_grade_totals' backfilled ({row_count} rows). ---")
+
+        # --- [신규] 과목 메모 JSON의 daily_memos -> subject_daily_memos 테이블 이관 ---
+        if db.session.query(Subject.id).filter(Subject.memo.like('%daily_memos%')).first():
+            print("--- [MIGRATION] Found 'daily_memos' in 'subjects.memo'. Moving to 'subject_daily_memos'... ---")
+            migrated = migrate_memo_blobs()
+            print(f"--- [MIGRATION] {migrated} daily memos moved to 'subject_daily_memos'. ---")
         
         # --- [신규] StudyLog 테이블 마이그레이션 (subject_id 추가 및 UniqueConstraint 제거) ---
         if inspector.has_table('study_logs'):
@@ -154,6 +311,19 @@ def create_initial_data():
                 db.session.execute(text("ALTER TABLE study_logs ADD CONSTRAINT fk_study_logs_subject_id FOREIGN KEY (subject_id) REFERENCES subjects(id) ON DELETE SET NULL"))
                 print("--- [MIGRATION] 'subject_id' column and FK constraint added. ---")
 
+            # --- [신규] 공부 시작/종료 시각 컬럼 추가 (기존 로그는 NULL) ---
+            for column_name in ('started_at', 'ended_at'):
+                if column_name not in study_log_columns:
+                    print(f"--- [MIGRATION] '{column_name}' column not found in 'study_logs' table. Adding column... ---")
+                    db.session.execute(text(f"ALTER TABLE study_logs ADD COLUMN {column_name} TIMESTAMP NULL"))
+                    print(f"--- [MIGRATION] '{column_name}' column added. ---")
+
+            # --- [신규] 타이머 구간 키 컬럼 추가 (일괄 저장 중복 방지용, 기존 로그는 NULL) ---
+            if 'client_key' not in study_log_columns:
+                print("--- [MIGRATION] 'client_key' column not found in 'study_logs' table. Adding column... ---")
+                db.session.execute(text("ALTER TABLE study_logs ADD COLUMN client_key VARCHAR(64) NULL"))
+                print("--- [MIGRATION] 'client_key' column added. ---")
+
             # 기존 UniqueConstraint 제거 (존재할 경우)
             constraints = inspector.get_unique_constraints('study_logs')
             uc_exists = any(uc['name'] == '_user_date_uc' for uc in constraints)
@@ -173,6 +343,14 @@ def create_initial_data():
                          print("--- [MIGRATION] NOTE: SQLite does not support dropping constraints easily. ---")
             
             # duration_seconds 컬럼의 default 값 확인 (기존 0이 맞음)
+
+            # --- [신규] 일일 집계 테이블 백필 (집계가 비어 있고 로그가 있을 때만) ---
+            has_totals = db.session.query(StudyDailyTotal.user_id).first() is not None
+            has_logs = db.session.query(StudyLog.entry_id).first() is not None
+            if has_logs and not has_totals:
+                print("--- [MIGRATION] 'study_daily_totals' is empty. Backfilling from 'study_logs'... ---")
+                row_count = rebuild_daily_totals()
+                print(f"--- [MIGRATION] 'study_daily_totals' backfilled ({row_count} rows). ---")
             
         # --- StudyLog 마이그레이션 끝 ---
 
@@ -226,6 +404,16 @@ def create_initial_data():
             print("--- [MIGRATION] 'is_visible' column not found in 'posts' table. Adding column... ---")
             db.session.execute(text("ALTER TABLE posts ADD COLUMN is_visible BOOLEAN NOT NULL DEFAULT TRUE"))
             print("--- [MIGRATION] 'is_visible' column added with default TRUE. ---")
+
+        # --- [신규] 좋아요/댓글 카운터 컬럼 추가 및 초기값 계산 ---
+        if 'like_count' not in post_columns or 'comment_count' not in post_columns:
+            print("--- [MIGRATION] Counter columns not found in 'posts' table. Adding columns... ---")
+            if 'like_count' not in post_columns:
+                db.session.execute(text("ALTER TABLE posts ADD COLUMN like_count INTEGER NOT NULL DEFAULT 0"))
+            if 'comment_count' not in post_columns:
+                db.session.execute(text("ALTER TABLE posts ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0"))
+            repaired = reconcile_post_counters()
+            print(f"--- [MIGRATION] Counter columns added and backfilled ({repaired} posts). ---")
             
         # --- [신규] Comment 테이블에 parent_id 추가 ---
         if inspector.has_table('comments'):
@@ -367,6 +555,21 @@ def create_initial_data():
                     db.session.rollback()
                     print(f"--- [MIGRATION] ERROR adding 'recurrence_interval': {int_e} ---")
 
+            # --- [신규] span_end_date 컬럼 추가 및 기존 이벤트 백필 (개별 커밋) ---
+            if 'span_end_date' not in get_calendar_columns():
+                print("--- [MIGRATION] Adding 'span_end_date' column to 'calendar_events' table... ---")
+                try:
+                    db.session.execute(text("ALTER TABLE calendar_events ADD COLUMN span_end_date DATE NULL"))
+                    db.session.commit()
+                    print("--- [MIGRATION] 'span_end_date' column added successfully! ---")
+                except Exception as span_e:
+                    db.session.rollback()
+                    print(f"--- [MIGRATION] ERROR adding 'span_end_date': {span_e} ---")
+            if 'span_end_date' in get_calendar_columns():
+                backfilled = backfill_event_spans()
+                if backfilled:
+                    print(f"--- [MIGRATION] 'span_end_date' backfilled for {backfilled} events. ---")
+
             # user_id의 NOT NULL 제약 제거 (시스템 이벤트는 user_id가 NULL)
             print("--- [MIGRATION] Removing NOT NULL constraint from 'user_id' column in 'calendar_events' table... ---")
             try:
@@ -377,6 +580,57 @@ def create_initial_data():
                 db.session.rollback()
                 print(f"--- [MIGRATION] ERROR removing NOT NULL constraint from 'user_id': {user_e} ---")
 
+        # --- [신규] 조회 성능용 인덱스 (오늘 일정, 커뮤니티 피드) ---
+        # db.create_all()은 기존 테이블에 인덱스를 추가하지 않으므로 직접 생성
+        performance_indexes = [
+            ('ix_calendar_events_user_start', 'calendar_events', 'user_id, start_date'),
+            ('ix_calendar_events_system_start', 'calendar_events', 'is_system, start_date'),
+            ('ix_calendar_events_user_span', 'calendar_events', 'user_id, span_end_date, start_date'),
+            ('ix_calendar_events_system_span', 'calendar_events', 'is_system, span_end_date, start_date'),
+            ('ix_schedules_user_date', 'schedules', 'user_id, date'),
+            ('ix_semesters_user_start', 'semesters', 'user_id, start_date'),
+            ('ix_subjects_semester_id', 'subjects', 'semester_id'),
+            ('ix_timeslots_subject_day', 'timeslots', 'subject_id, day_of_week'),
+            # 커뮤니티 피드 키셋 페이지네이션
+            ('ix_posts_feed', 'posts', 'is_approved, is_visible, category, created_at, id'),
+        ]
+        for index_name, table_name, columns in performance_indexes:
+            existing_indexes = [ix['name'] for ix in inspector.get_indexes(table_name)]
+            if index_name not in existing_indexes:
+                print(f"--- [MIGRATION] Creating index '{index_name}' on '{table_name}'... ---")
+                db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
+                print(f"--- [MIGRATION] Index '{index_name}' created. ---")
+
+        # 공부 기록 통계용 복합 인덱스 (user_id, date) - PostgreSQL은 합계/과목 컬럼을 INCLUDE하여 index-only scan
+        if 'ix_study_logs_user_date' not in [ix['name'] for ix in inspector.get_indexes('study_logs')]:
+            print("--- [MIGRATION] Creating index 'ix_study_logs_user_date' on 'study_logs'... ---")
+            include_clause = " INCLUDE (duration_seconds, subject_id)" if db.engine.dialect.name == 'postgresql' else ""
+            db.session.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_study_logs_user_date ON study_logs (user_id, date){include_clause}"
+            ))
+            print("--- [MIGRATION] Index 'ix_study_logs_user_date' created. ---")
+
+        # user_id 단일 인덱스는 (user_id, date) 복합 인덱스와 중복이므로 삭제 (쓰기 비용만 늘림)
+        if 'ix_study_logs_user_id' in [ix['name'] for ix in inspector.get_indexes('study_logs')]:
+            print("--- [MIGRATION] Dropping redundant index 'ix_study_logs_user_id' on 'study_logs'... ---")
+            db.session.execute(text("DROP INDEX IF EXISTS ix_study_logs_user_id"))
+            print("--- [MIGRATION] Index 'ix_study_logs_user_id' dropped. ---")
+
+        # 타이머 구간 키 유니크 인덱스 (user_id, client_key) - NULL 키(단건 API 로그)는 중복 검사 대상 아님
+        if 'uq_study_logs_user_client_key' not in [ix['name'] for ix in inspector.get_indexes('study_logs')]:
+            print("--- [MIGRATION] Creating index 'uq_study_logs_user_client_key' on 'study_logs'... ---")
+            db.session.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_study_logs_user_client_key ON study_logs (user_id, client_key)"
+            ))
+            print("--- [MIGRATION] Index 'uq_study_logs_user_client_key' created. ---")
+
+        # 캘린더 기간 겹침 조회용 GiST 인덱스 (PostgreSQL 전용, event_overlap_filter의 && 연산에 사용)
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_calendar_events_span_gist ON calendar_events "
+                "USING gist (daterange(start_date, span_end_date, '[]'))"
+            ))
+
         # --- 마이그레이션 끝 ---
 
         # DailyMemo 테이블 삭제 (존재할 경우)
@@ -428,14 +682,6 @@ def create_initial_data():
 
         db.session.commit()
 
-        if db.session.get(User, sample_user_id):
-            create_semesters_for_user(sample_user_id)
-
-        if db.session.get(User, admin_id):
-            create_semesters_for_user(admin_id)
-
-        db.session.commit()
-
         # 캘린더 시스템 초기화
         print("--- [CALENDAR] Initializing calendar system... ---")
         initialize_system_categories()
@@ -458,8 +704,8 @@ def create_initial_data():
 
 # --- 앱 시작 시 데이터 로드 ---
 SHUTTLE_SCHEDULE_DATA = load_bus_schedule()
-MEAL_PLAN_DATA = load_meal_data()
-TODAY_MEAL_KEY = get_today_meal_key()
+SHUTTLE_INDEX = build_shuttle_index(SHUTTLE_SCHEDULE_DATA)
+# 식단 데이터는 meal_service 캐시에서 요청 시점의 날짜로 조회 (파일 변경 시 자동 재로드)
 # --- 페이지 엔드포인트 ---
 @app.route('/')
 def index():
@@ -478,26 +724,10 @@ def timetable_management():
     from flask import g
     user = g.user
 
-    all_user_subjects = Subject.query.filter_by(user_id=user.id).all()
-
-    # 총 이수 학점
-    total_earned_credits = sum(subject.credits for subject in all_user_subjects)
-
-    # 전체 평점 계산
-    GRADE_MAP = {
-        "A+": 4.5, "A0": 4.0, "B+": 3.5, "B0": 3.0,
-        "C+": 2.5, "C0": 2.0, "D+": 1.5, "D0": 1.0, "F": 0.0
-    }
-    total_gpa_credits = 0
-    total_gpa_score = 0
-
-    for subject in all_user_subjects:
-        grade_score = GRADE_MAP.get(subject.grade)
-        if grade_score is not None: # 'Not Set' 등은 제외
-            total_gpa_credits += subject.credits
-            total_gpa_score += (grade_score * subject.credits)
-
-    overall_gpa = (total_gpa_score / total_gpa_credits) if total_gpa_credits > 0 else 0.0
+    # 총 이수 학점 / 전체 평점 (성적 집계 행에서 조회)
+    grade_summary = get_user_grade_summary(user.id)
+    total_earned_credits = grade_summary['earned_credits']
+    overall_gpa = grade_summary['gpa']
 
     current_goal = user.total_credits_goal
     remaining_credits = max(0, current_goal - total_earned_credits)
@@ -518,29 +748,16 @@ def study_analysis():
     from flask import g
     user = g.user
     
-    # 현재 학기 정보 조회
-    current_semester = None
+    # 현재 학기 정보 조회 (학기 선택 목록은 가상 학기 포함)
     today_kst = datetime.now(KST).date()
-    
-    all_semesters = Semester.query.filter_by(user_id=user.id).order_by(Semester.year.desc()).all()
-    if all_semesters:
-        current_found = False
-        for s in all_semesters:
-            start = s.start_date if s.start_date else _get_semester_start_date_fallback(s.year, s.season)
-            if start and start <= today_kst and today_kst <= start + timedelta(weeks=16):
-                current_semester = s
-                current_found = True
-                break
-        if not current_found:
-            # 적절한 현재 학기를 찾지 못하면 가장 최신 학기로 대체
-            season_order = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
-            all_semesters.sort(key=lambda s: (s.year, season_order.get(s.season, 99)), reverse=True)
-            current_semester = all_semesters[0] if all_semesters else None
+    all_semesters = get_user_semesters(user.id)
+    current_semester = get_current_semester(user.id, today_kst)
 
     subjects = []
     semester_name = "학기 없음"
     if current_semester:
-        subjects = Subject.query.filter_by(semester_id=current_semester.id).order_by(Subject.name).all()
+        if not current_semester.is_virtual:
+            subjects = Subject.query.filter_by(semester_id=current_semester.id).order_by(Subject.name).all()
         semester_name = current_semester.name
         
     return render_template(
@@ -620,9 +837,6 @@ def register():
             db.session.add(new_user)
             db.session.commit()
 
-            # 새 사용자를 위한 학기 데이터 생성
-            create_semesters_for_user(new_user.id)
-
             # 새 사용자를 위한 기본 캘린더 카테고리 생성
             create_default_categories_for_user(new_user.id)
 
@@ -716,6 +930,12 @@ def admin_update_permission(user_id):
         print(f"Error updating permission for {user_id}: {e}")
         return jsonify({"status": "error", "message": f"권한 업데이트 중 오류 발생: {e}"}), 500
 
+# --- [신규] 쓰기 지연 큐 지표 (큐 길이, 반영 지연 시간, 병합 비율) - 현재 워커 프로세스 기준 ---
+@app.route('/admin/write-behind-metrics')
+@admin_required
+def admin_write_behind_metrics():
+    return jsonify({"status": "success", "data": get_write_behind_metrics()})
+
 @app.route('/admin/users/<string:user_id>', methods=['DELETE'])
 @admin_required
 def admin_delete_user(user_id):
@@ -744,10 +964,20 @@ def admin_delete_user(user_id):
                     print(f"Error deleting image file {filename} for user {user_id}: {img_e}")
             # --- 수정 끝 ---
 
+        # 이 사용자의 좋아요/댓글이 달린 다른 게시물 (삭제 후 카운터 재계산 대상)
+        affected_post_ids = {
+            post_id for (post_id,) in db.session.query(PostLike.post_id).filter_by(user_id=user_id).union(
+                db.session.query(Comment.post_id).filter_by(user_id=user_id)
+            ).all()
+        }
+
         # 사용자 삭제 (관련 데이터는 cascade delete 설정에 따라 삭제됨)
         db.session.delete(user)
         db.session.commit()
 
+        # 남아 있는 게시물의 좋아요/댓글 카운터 보정
+        reconcile_post_counters(list(affected_post_ids))
+
         return jsonify({"status": "success", "message": f"사용자 '{user.name}'({user_id}) 계정 및 관련 데이터(게시물 포함)가 삭제되었습니다."})
     except Exception as e:
         db.session.rollback()
@@ -928,7 +1158,7 @@ def view_post(post_id):
     # --- [신규] 현재 사용자가 좋아요 눌렀는지 확인 ---
     user_liked = False
     if user:
-        user_liked = PostLike.query.filter_by(post_id=post.id, user_id=user.id).first() is not None
+        user_liked = bool(_get_user_liked_post_ids(user.id, [post.id]))
 
     return render_template(
         'view_post.html', 
@@ -1238,116 +1468,57 @@ def get_notifications():
 def get_shuttle():
     return jsonify(SHUTTLE_SCHEDULE_DATA)
 
+# --- [신규] 다음 셔틀 출발편 API (노선별 인덱스 + bisect) ---
+@app.route('/api/shuttle/next')
+def get_next_shuttle():
+    route_code = request.args.get('route', '')
+    route_group = request.args.get('group') or None
+    try:
+        limit = int(request.args.get('limit', SHUTTLE_NEXT_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 개수입니다."}), 400
+    limit = max(1, min(limit, SHUTTLE_NEXT_MAX_LIMIT))
+
+    if route_code not in SHUTTLE_INDEX['route_codes']:
+        return jsonify({"status": "error", "message": "알 수 없는 노선입니다."}), 400
+
+    now_kst = datetime.now(KST)
+    day_type, departures = get_next_departures(SHUTTLE_INDEX, route_code, now_kst, limit, route_group)
+
+    response = jsonify({
+        "status": "success",
+        "route": route_code,
+        "day_type": day_type,
+        "now": now_kst.strftime('%H:%M'),
+        "departures": departures
+    })
+    # 결과는 분 단위로만 바뀌므로 현재 분이 끝날 때까지 캐시 허용
+    response.headers['Cache-Control'] = f"public, max-age={max(1, 60 - now_kst.second)}"
+    return response
+
 @app.route('/api/meal')
 def get_meal():
-    cafeteria = request.args.get('cafeterIA', 'student') # 파라미터 이름 오타 대응
-    if cafeteria in MEAL_PLAN_DATA:
-        formatted_meal = format_meal_for_client(MEAL_PLAN_DATA[cafeteria], TODAY_MEAL_KEY, cafeteria)
+    cafeteria = request.args.get('cafeteria', request.args.get('cafeterIA', 'student')) # 파라미터 이름 오타 대응
+    formatted_meal = get_today_meal(cafeteria)
+    if formatted_meal is not None:
         return jsonify(formatted_meal)
     return jsonify({"error": "Invalid cafeteria type"}), 400
 
 @app.route('/api/meal/week')
-def get_weekly_meal():
-    formatted_data = format_weekly_meal_for_client(MEAL_PLAN_DATA)
-    return jsonify(formatted_data)
+def get_weekly_meal_api():
+    return jsonify(get_weekly_meal())
 
 # --- Secure API Endpoints ---
 @app.route('/api/schedule', methods=['GET'])
 def get_schedule():
-    from flask import g, session
+    from flask import session
 
-    # 로그인 여부 확인
+    # 로그인 여부 확인 (비로그인 사용자는 학사 일정(시스템 이벤트)만 표시)
     user_id = session.get('student_id')
-    is_logged_in = user_id is not None
-
-    today_kst = datetime.now(KST) # KST 기준
-    today_str = today_kst.strftime('%Y-%m-%d')
-    today_date = today_kst.date()
-    today_day_of_week = today_kst.weekday() + 1 # 1:월 ~ 7:일
-
-    schedule_list = []
+    today_date = datetime.now(KST).date() # KST 기준
 
     try:
-        # 비로그인 사용자: 학사 일정(시스템 이벤트)만 표시
-        if not is_logged_in:
-            # 시스템 캘린더 이벤트만 가져오기
-            calendar_events = CalendarEvent.query.filter_by(is_system=True).all()
-        else:
-            # 로그인 사용자: 개인 일정 + 학사 일정 모두 표시
-
-            # 1. 사용자가 직접 추가한 일정
-            user_schedules = Schedule.query.filter_by(user_id=user_id, date=today_str).all()
-            for s in user_schedules:
-                schedule_list.append({"type": "schedule", "time": s.time, "title": s.title, "location": s.location})
-
-            # 2. 캘린더 이벤트 (시스템 + 사용자)
-            calendar_events = CalendarEvent.query.filter(
-                or_(CalendarEvent.user_id == user_id, CalendarEvent.is_system == True)
-            ).all()
-
-        # 오늘 날짜에 직접 관련된 이벤트만 필터링 (시작일이 오늘이거나, 오늘이 기간에 포함)
-        for event in calendar_events:
-            # 단일 일자 이벤트 (end_date가 없거나 start_date와 같은 경우)
-            if event.end_date is None or event.start_date == event.end_date:
-                if event.start_date == today_date:
-                    time_str = event.start_time.strftime('%H:%M') if event.start_time else '종일'
-                    location = event.category.name if event.category else ''
-                    schedule_list.append({
-                        "type": "calendar",
-                        "time": time_str,
-                        "title": event.title,
-                        "location": location
-                    })
-            # 기간 이벤트 (start_date와 end_date가 다른 경우)
-            else:
-                # 오늘이 기간에 포함되는 경우에만 표시
-                if event.start_date <= today_date <= event.end_date:
-                    time_str = event.start_time.strftime('%H:%M') if event.start_time else '종일'
-                    location = event.category.name if event.category else ''
-                    schedule_list.append({
-                        "type": "calendar",
-                        "time": time_str,
-                        "title": event.title,
-                        "location": location
-                    })
-
-            # 3. 오늘 요일의 시간표 (수업) - 로그인 사용자만
-            if is_logged_in:
-                current_semester = None
-                all_semesters = Semester.query.filter_by(user_id=user_id).order_by(Semester.year.desc()).all()
-                if all_semesters:
-                    current_found = False
-                    today_date_obj = today_kst.date()
-                    for s in all_semesters:
-                        start = s.start_date if s.start_date else _get_semester_start_date_fallback(s.year, s.season)
-                        if start and start <= today_date_obj and today_date_obj <= start + timedelta(weeks=16): # 16주로 가정
-                            current_semester = s
-                            current_found = True
-                            break
-
-                    if not current_found and all_semesters:
-                        season_order = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
-                        all_semesters.sort(key=lambda sem: (sem.year, season_order.get(sem.season, 99)), reverse=True)
-                        current_semester = all_semesters[0]
-
-                if current_semester and 1 <= today_day_of_week <= 5:
-                    today_subjects = Subject.query.join(TimeSlot).filter(
-                        Subject.semester_id == current_semester.id
-                    ).filter(
-                        TimeSlot.day_of_week == today_day_of_week
-                    ).all()
-
-                    for subject in today_subjects:
-                        subject_timeslots_today = [ts for ts in subject.timeslots if ts.day_of_week == today_day_of_week]
-                        for ts in subject_timeslots_today:
-                            schedule_list.append({
-                                "type": "class",
-                                "time": ts.start_time,
-                                "title": subject.name,
-                                "location": ts.room
-                            })
-
-        schedule_list.sort(key=lambda x: x['time'] if x['time'] != '종일' else '00:00')
+        schedule_list = get_today_schedule(user_id, today_date)
         return jsonify(schedule_list)
 
     except Exception as e:
@@ -1407,9 +1578,8 @@ def handle_semesters():
     from flask import g
     user_id = g.user.id
     try:
-        semesters = Semester.query.filter_by(user_id=user_id).all()
-        season_order = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
-        semesters.sort(key=lambda s: (s.year, season_order.get(s.season, 99)), reverse=True)
+        # 저장된 학기 + 아직 저장되지 않은 가상 학기 (최신순)
+        semesters = get_user_semesters(user_id)
         return jsonify([{"id": s.id, "name": s.name} for s in semesters])
     except Exception as e:
         print(f"Error fetching semesters: {e}")
@@ -1425,38 +1595,16 @@ def get_timetable_data():
 
     try:
         if semester_id_str:
-            try:
-                semester = db.session.get(Semester, int(semester_id_str))
-            except ValueError:
-                semester = None
-            if semester and semester.user_id != user_id:
-                semester = None
-        else:
-            today_kst = datetime.now(KST).date() # KST 기준
-            all_semesters = Semester.query.filter_by(user_id=user_id).order_by(Semester.year.desc()).all()
-            if all_semesters:
-                current_found = False
-                for s in all_semesters:
-                    start = s.start_date if s.start_date else _get_semester_start_date_fallback(s.year, s.season)
-                    if start and start <= today_kst and today_kst <= start + timedelta(weeks=16):
-                        semester = s
-                        current_found = True
-                        break
-                if not current_found:
-                    season_order = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
-                    all_semesters.sort(key=lambda s: (s.year, season_order.get(s.season, 99)), reverse=True)
-                    semester = all_semesters[0]
+            semester = resolve_user_semester(user_id, semester_id_str)
 
+        # 학기 ID가 없거나 유효하지 않으면 현재 학기 (KST 기준)
         if not semester:
-            all_semesters = Semester.query.filter_by(user_id=user_id).order_by(Semester.year.desc()).all()
-            if all_semesters:
-                season_order = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
-                all_semesters.sort(key=lambda s: (s.year, season_order.get(s.season, 99)), reverse=True)
-                semester = all_semesters[0]
-            else:
+            semester = get_current_semester(user_id, datetime.now(KST).date())
+            if not semester:
                 return jsonify({"semester": None, "subjects": []}), 404
 
-        subjects = Subject.query.filter_by(user_id=user_id, semester_id=semester.id).all()
+        # 가상 학기에는 아직 과목이 없음
+        subjects = [] if semester.is_virtual else Subject.query.filter_by(user_id=user_id, semester_id=semester.id).all()
         result = []
         for s in subjects:
             timeslots_data = [
@@ -1509,24 +1657,32 @@ def create_subject():
     if not semester_id or not name:
         return jsonify({"status": "error", "message": "학기 ID와 과목명은 필수입니다."}), 400
 
-    semester = db.session.get(Semester, semester_id)
-    if not semester or semester.user_id != user_id:
+    try:
+        credits = parse_subject_credits(data.get('credits', 3))
+    except ValueError:
+        return jsonify({"status": "error", "message": "학점은 0 이상의 정수여야 합니다."}), 400
+
+    semester = resolve_user_semester(user_id, semester_id)
+    if not semester:
         return jsonify({"status": "error", "message": "유효하지 않은 학기입니다."}), 404
 
     try:
+        # 첫 과목이 추가될 때 가상 학기를 DB에 저장
+        semester = materialize_semester(semester)
         initial_memo = json.dumps({"note": "", "todos": []})
 
         new_subject = Subject(
             user_id=user_id,
-            semester_id=semester_id,
+            semester_id=semester.id,
             name=name,
             professor=data.get('professor'),
-            credits=data.get('credits', 3),
+            credits=credits,
             grade='Not Set',
             memo=initial_memo
         )
         db.session.add(new_subject)
         db.session.flush()
+        apply_subject_grade_change(user_id, semester.id, new=(new_subject.credits, new_subject.grade))
 
         for ts_data in data.get('timeslots', []):
             if ts_data.get('day') and ts_data.get('start') and ts_data.get('end'):
@@ -1540,8 +1696,7 @@ def create_subject():
 
         db.session.commit()
 
-        all_user_subjects = Subject.query.filter_by(user_id=user_id).all()
-        total_earned_credits = sum(s.credits for s in all_user_subjects)
+        total_earned_credits = get_user_grade_summary(user_id)['earned_credits']
 
         memo_data = json.loads(new_subject.memo)
         created_subject_data = {
@@ -1580,10 +1735,17 @@ def handle_subject(subject_id):
     if request.method == 'PUT':
         data = request.json
         try:
+            credits = parse_subject_credits(data['credits']) if 'credits' in data else subject.credits
+        except ValueError:
+            return jsonify({"status": "error", "message": "학점은 0 이상의 정수여야 합니다."}), 400
+
+        try:
+            old_grade_values = (subject.credits, subject.grade)
             subject.name = data.get('name', subject.name)
             subject.professor = data.get('professor', subject.professor)
-            subject.credits = data.get('credits', subject.credits)
+            subject.credits = credits
             subject.grade = data.get('grade', subject.grade)
+            apply_subject_grade_change(user_id, subject.semester_id, old=old_grade_values, new=(subject.credits, subject.grade))
 
             memo_data = data.get('memo')
             if isinstance(memo_data, dict) and ('note' in memo_data or 'todos' in memo_data):
@@ -1607,8 +1769,7 @@ def handle_subject(subject_id):
 
             db.session.commit()
 
-            all_user_subjects = Subject.query.filter_by(user_id=user_id).all()
-            total_earned_credits = sum(s.credits for s in all_user_subjects)
+            total_earned_credits = get_user_grade_summary(user_id)['earned_credits']
 
             memo_data_resp = json.loads(subject.memo)
             updated_subject_data = {
@@ -1636,11 +1797,11 @@ def handle_subject(subject_id):
 
     if request.method == 'DELETE':
         try:
+            apply_subject_grade_change(user_id, subject.semester_id, old=(subject.credits, subject.grade))
             db.session.delete(subject)
             db.session.commit()
 
-            all_user_subjects = Subject.query.filter_by(user_id=user_id).all()
-            total_earned_credits = sum(s.credits for s in all_user_subjects)
+            total_earned_credits = get_user_grade_summary(user_id)['earned_credits']
 
             return jsonify({
                 "status": "success",
@@ -1665,28 +1826,13 @@ def get_daily_memo(subject_id, date_str):
         return jsonify({"status": "error", "message": "과목을 찾을 수 없거나 권한이 없습니다."}), 404
 
     try:
-        # DB의 memo 필드 (JSON 문자열) 가져오기
-        memo_json_str = subject.memo
-        memo_data = {}
-        if memo_json_str:
-            try:
-                memo_data = json.loads(memo_json_str)
-            except json.JSONDecodeError:
-                # 파싱 실패 시, 이전 문자열 형태 데이터 처리
-                if isinstance(memo_json_str, str):
-                    memo_data = {"note": memo_json_str, "todos": []}
-                else:
-                    memo_data = {"note": "", "todos": []}
-        else:
-             memo_data = {"note": "", "todos": []}
-
-        # daily_memos 필드가 없을 경우 초기화
-        if "daily_memos" not in memo_data or not isinstance(memo_data["daily_memos"], dict):
-            memo_data["daily_memos"] = {}
-
-        # 해당 날짜의 메모 반환
-        daily_note = memo_data["daily_memos"].get(date_str, "")
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 날짜 형식입니다."}), 400
 
+    try:
+        # 해당 날짜의 메모 한 행만 조회
+        daily_note = get_daily_memo_note(subject.id, date_obj)
         return jsonify({"status": "success", "note": daily_note})
 
     except Exception as e:
@@ -1703,33 +1849,17 @@ def update_daily_memo(subject_id, date_str):
     if not subject or subject.user_id != user_id:
         return jsonify({"status": "error", "message": "과목을 찾을 수 없거나 권한이 없습니다."}), 404
 
+    try:
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 날짜 형식입니다."}), 400
+
     data = request.json
     new_note = data.get('note', '')
 
     try:
-        # DB의 memo 필드 (JSON 문자열) 가져오기 및 파싱
-        memo_json_str = subject.memo
-        memo_data = {}
-        if memo_json_str:
-            try:
-                memo_data = json.loads(memo_json_str)
-            except json.JSONDecodeError:
-                 if isinstance(memo_json_str, str):
-                    memo_data = {"note": memo_json_str, "todos": []} # 기존 메모 유지
-                 else:
-                     memo_data = {"note": "", "todos": []}
-        else:
-             memo_data = {"note": "", "todos": []}
-
-        # daily_memos 필드 초기화
-        if "daily_memos" not in memo_data or not isinstance(memo_data["daily_memos"], dict):
-            memo_data["daily_memos"] = {}
-
-        # 해당 날짜 메모 업데이트
-        memo_data["daily_memos"][date_str] = new_note.strip()
-
-        # 업데이트된 memo 데이터를 다시 JSON 문자열로 변환하여 저장
-        subject.memo = json.dumps(memo_data, ensure_ascii=False)
+        # 해당 날짜 메모 한 행만 upsert (빈 메모는 삭제)
+        save_daily_memo(subject.id, date_obj, new_note)
         db.session.commit()
 
         return jsonify({"status": "success", "message": "메모가 저장되었습니다."})
@@ -1740,64 +1870,27 @@ def update_daily_memo(subject_id, date_str):
         return jsonify({"status": "error", "message": "메모 저장 중 오류 발생"}), 500
 
 # --- [신규] 학기별 주차 메모 API ---
-@app.route('/api/semesters/<int:semester_id>/all-memos-by-week', methods=['GET'])
+@app.route('/api/semesters/<int(signed=True):semester_id>/all-memos-by-week', methods=['GET'])
 @login_required
 def get_all_memos_by_week(semester_id):
     from flask import g
     user_id = g.user.id
-    semester = db.session.get(Semester, semester_id)
-    if not semester or semester.user_id != user_id:
+    semester = resolve_user_semester(user_id, semester_id)
+    if not semester:
         return jsonify({"status": "error", "message": "학기를 찾을 수 없거나 권한이 없습니다."}), 404
 
     try:
-        start_date = semester.start_date if semester.start_date else _get_semester_start_date_fallback(semester.year, semester.season)
-        subjects_in_semester = Subject.query.filter_by(semester_id=semester.id).all()
-
-        weekly_memos_data = []
+        weeks = int(request.args.get('weeks', DEFAULT_SEMESTER_WEEKS))
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 주차 수입니다."}), 400
+    weeks = max(1, min(weeks, MAX_SEMESTER_WEEKS))
 
-        # 16주차 반복
-        for week_num in range(1, 17):
-            week_start_date = start_date + timedelta(weeks=week_num - 1)
-            week_end_date = week_start_date + timedelta(days=6)
-            week_subjects_data = []
+    try:
+        start_date = semester.start_date if semester.start_date else _get_semester_start_date_fallback(semester.year, semester.season)
+        subjects_in_semester = [] if semester.is_virtual else Subject.query.filter_by(semester_id=semester.id).order_by(Subject.id).all()
 
-            for subject in subjects_in_semester:
-                subject_memos_this_week = []
-                memo_json_str = subject.memo
-                memo_data = {}
-                try:
-                    memo_data = json.loads(memo_json_str or '{}')
-                except:
-                     memo_data = {} # 파싱 실패 시 빈 객체
-
-                daily_memos = memo_data.get("daily_memos", {})
-
-                # 해당 주차의 날짜 확인
-                current_date = week_start_date
-                while current_date <= week_end_date:
-                    date_str = current_date.strftime('%Y-%m-%d')
-                    if date_str in daily_memos and daily_memos[date_str].strip():
-                        subject_memos_this_week.append({
-                            "date": date_str,
-                            "note": daily_memos[date_str].strip()
-                        })
-                    current_date += timedelta(days=1)
-
-                if subject_memos_this_week:
-                     subject_memos_this_week.sort(key=lambda x: x['date']) # 날짜순 정렬
-                     week_subjects_data.append({
-                         "subject_id": subject.id,
-                         "subject_name": subject.name,
-                         "memos": subject_memos_this_week
-                     })
-
-            # 해당 주차에 메모가 있는 과목이 있을 경우에만 추가
-            if week_subjects_data:
-                 weekly_memos_data.append({
-                     "week_number": week_num,
-                     "date_range": f"{week_start_date.strftime('%m.%d')}~{week_end_date.strftime('%m.%d')}",
-                     "subjects": week_subjects_data
-                 })
+        # 학기 기간의 메모를 한 번에 조회하여 주차별로 묶음 (여름/겨울학기는 weeks로 기간 조정)
+        weekly_memos_data = build_weekly_memo_digest(subjects_in_semester, start_date, weeks)
 
         return jsonify({"status": "success", "data": weekly_memos_data})
 
@@ -1813,42 +1906,15 @@ def get_gpa_stats():
     user_id = g.user.id
 
     try:
-        semesters = Semester.query.filter_by(user_id=user_id).all()
-        season_order = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
-        semesters.sort(key=lambda s: (s.year, season_order.get(s.season, 99)))
-
-        stats = []
-        GRADE_MAP = {
-            "A+": 4.5, "A0": 4.0, "B+": 3.5, "B0": 3.0,
-            "C+": 2.5, "C0": 2.0, "D+": 1.5, "D0": 1.0, "F": 0.0
-        }
-
-        for semester in semesters:
-            subjects = semester.subjects
-            semester_gpa_credits = 0
-            semester_gpa_score = 0
-            for subject in subjects:
-                grade_score = GRADE_MAP.get(subject.grade)
-                if grade_score is not None:
-                    semester_gpa_credits += subject.credits
-                    semester_gpa_score += (grade_score * subject.credits)
-
-            if semester_gpa_credits > 0:
-                semester_gpa = (semester_gpa_score / semester_gpa_credits)
-                stats.append({"semester_name": semester.name, "gpa": round(semester_gpa, 2)})
-
-        all_subjects = Subject.query.filter_by(user_id=user_id).all()
-        total_earned_credits = sum(s.credits for s in all_subjects)
-
-        total_gpa_credits = 0
-        total_gpa_score = 0
-        for subject in all_subjects:
-            grade_score = GRADE_MAP.get(subject.grade)
-            if grade_score is not None:
-                total_gpa_credits += subject.credits
-                total_gpa_score += (grade_score * subject.credits)
-
-        overall_gpa = (total_gpa_score / total_gpa_credits) if total_gpa_credits > 0 else 0.0
+        # 학기별/전체 성적 집계 행만 조회 (과목 전체를 읽지 않음)
+        stats = [
+            {"semester_name": summary['semester_name'], "gpa": summary['gpa']}
+            for summary in get_semester_grade_summaries(user_id)
+            if summary['total_credits'] > 0
+        ]
+        grade_summary = get_user_grade_summary(user_id)
+        overall_gpa = grade_summary['gpa']
+        total_earned_credits = grade_summary['earned_credits']
 
         return jsonify({
             "semesters": stats,
@@ -1869,27 +1935,13 @@ def get_study_stats():
     user_id = g.user.id
     try:
         today_kst = datetime.now(KST).date()
-        today_str = today_kst.strftime('%Y-%m-%d')
-        
-        # 오늘 총 공부 시간 (모든 과목 + 개인)
-        today_seconds_agg = db.session.query(
-            func.sum(StudyLog.duration_seconds)
-        ).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date == today_str
-        ).scalar() or 0
+
+        # 오늘 총 공부 시간 (모든 과목 + 개인) - 일일 집계에서 조회
+        today_seconds_agg = get_daily_total(user_id, today_kst)
 
         # 주간 평균 계산
         seven_days_ago_kst = today_kst - timedelta(days=6)
-        seven_days_ago_str = seven_days_ago_kst.strftime('%Y-%m-%d')
-
-        weekly_total_seconds_agg = db.session.query(
-            func.sum(StudyLog.duration_seconds)
-        ).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date >= seven_days_ago_str,
-            StudyLog.date <= today_str
-        ).scalar() or 0
+        weekly_total_seconds_agg = get_total_between(user_id, seven_days_ago_kst, today_kst)
 
         weekly_avg_seconds = weekly_total_seconds_agg / 7.0
 
@@ -1911,27 +1963,21 @@ def save_study_time():
     from flask import g
     user_id = g.user.id
 
-    if not isinstance(duration_to_add, int) or duration_to_add <= 0 or not date_str:
+    if not isinstance(duration_to_add, int) or not 0 < duration_to_add <= STUDY_SEGMENT_MAX_SECONDS or not date_str:
         return jsonify({"status": "error", "message": "잘못된 요청입니다 (duration or date)."}), 400
 
     try:
         date_obj = datetime.strptime(date_str, '%Y-%m-%d').date() # 날짜 형식 검증 (KST 기준)
 
-        # 모델 변경: 매번 새 로그 생성 (subject_id=None)
-        new_log_entry = StudyLog(
-            user_id=user_id,
-            date=date_obj,
-            duration_seconds=duration_to_add,
-            subject_id=None # 홈페이지 타이머는 "개인 공부"
-        )
-        db.session.add(new_log_entry)
+        # 모델 변경: 매번 새 로그 생성 (subject_id=None, 홈페이지 타이머는 "개인 공부")
+        # 일일/시간대별 집계도 같은 트랜잭션에서 갱신됨 (타이머 종료 시 저장되므로 요청 시각을 종료 시각으로 사용)
+        # 성공 응답을 받은 클라이언트는 기록을 버리므로 쓰기 지연 큐에 넣지 않고 바로 저장
+        started_at, ended_at = resolve_session_times(date_obj, duration_to_add, datetime.now(KST).replace(tzinfo=None))
+        add_study_log(user_id, date_obj, duration_to_add, subject_id=None, started_at=started_at, ended_at=ended_at)
         db.session.commit()
         
-        # 오늘 총 시간 다시 계산해서 반환
-        today_total = db.session.query(func.sum(StudyLog.duration_seconds)).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date == date_obj
-        ).scalar() or 0
+        # 오늘 총 시간은 일일 집계에서 바로 조회
+        today_total = get_daily_total(user_id, date_obj)
         
         return jsonify({"status": "success", "data": {"total_duration": today_total}})
 
@@ -1949,12 +1995,18 @@ def log_subject_study_time():
     user_id = g.user.id
     data = request.json
     
-    subject_id = data.get('subject_id', type=int)
-    duration_seconds = data.get('duration_seconds', type=int)
+    # dict.get()은 type= 인수를 지원하지 않으므로 직접 변환
+    try:
+        subject_id = int(data.get('subject_id') or 0)
+        duration_seconds = int(data.get('duration_seconds') or 0)
+    except (ValueError, TypeError):
+        return jsonify({"status": "error", "message": "과목 ID와 시간은 숫자여야 합니다."}), 400
     date_str = data.get('date_str') # KST 기준 날짜
 
     if not all([subject_id, duration_seconds, date_str]):
         return jsonify({"status": "error", "message": "과목 ID, 시간, 날짜는 필수입니다."}), 400
+    if not 0 < duration_seconds <= STUDY_SEGMENT_MAX_SECONDS:
+        return jsonify({"status": "error", "message": "공부 시간은 하루(24시간)를 넘을 수 없습니다."}), 400
     
     try:
         date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
@@ -1964,14 +2016,9 @@ def log_subject_study_time():
         if not subject or subject.user_id != user_id:
              return jsonify({"status": "error", "message": "유효하지 않은 과목입니다."}), 404
 
-        # 새 로그 생성
-        new_log = StudyLog(
-            user_id=user_id,
-            subject_id=subject_id,
-            date=date_obj,
-            duration_seconds=duration_seconds
-        )
-        db.session.add(new_log)
+        # 새 로그 생성 (일일/시간대별 집계 함께 갱신)
+        started_at, ended_at = resolve_session_times(date_obj, duration_seconds, datetime.now(KST).replace(tzinfo=None))
+        add_study_log(user_id, date_obj, duration_seconds, subject_id=subject_id, started_at=started_at, ended_at=ended_at)
         db.session.commit()
         
         return jsonify({"status": "success", "message": "공부 시간이 기록되었습니다."}), 201
@@ -1983,6 +2030,95 @@ def log_subject_study_time():
         print(f"Error logging subject study time: {e}")
         return jsonify({"status": "error", "message": f"기록 중 오류 발생: {e}"}), 500
 
+# --- [신규] 타이머 구간 일괄 저장 API (script.js / study_analysis.js의 StudyTimeBuffer가 전송) ---
+# 페이지 종료 시 navigator.sendBeacon으로도 호출되므로 Content-Type과 무관하게 JSON 본문을 읽습니다.
+# 구간마다 클라이언트가 만든 key가 있어, 같은 구간을 다시 보내도 한 번만 저장됩니다.
+@app.route('/api/study-log/batch', methods=['POST'])
+@login_required
+def save_study_log_batch():
+    from flask import g
+    user_id = g.user.id
+    data = request.get_json(force=True, silent=True) or {}
+    segments = data.get('segments')
+
+    if not isinstance(segments, list) or not segments:
+        return jsonify({"status": "error", "message": "저장할 구간이 없습니다."}), 400
+    if len(segments) > STUDY_BATCH_MAX_SEGMENTS:
+        return jsonify({"status": "error", "message": f"한 번에 최대 {STUDY_BATCH_MAX_SEGMENTS}개 구간까지 저장할 수 있습니다."}), 400
+
+    now = datetime.now(KST).replace(tzinfo=None)
+    valid_segments = []
+    part_keys = {}  # {저장하는 client_key: 클라이언트가 보낸 key}
+    rejected = []
+    for segment in segments:
+        if not isinstance(segment, dict):
+            continue
+        key = segment.get('key')
+        if not isinstance(key, str) or not key or len(key) > STUDY_CLIENT_KEY_MAX_LENGTH:
+            continue
+        try:
+            duration_seconds = int(segment.get('duration_seconds') or 0)
+            subject_id = int(segment['subject_id']) if segment.get('subject_id') else None
+            if segment.get('ended_at') is not None:
+                # 종료 시각(epoch ms)이 있으면 KST 기준 날짜와 시작/종료 시각을 그대로 사용
+                ended_at = datetime.fromtimestamp(int(segment['ended_at']) / 1000, KST).replace(tzinfo=None)
+                ended_at = min(ended_at, now)
+                started_at = ended_at - timedelta(seconds=duration_seconds)
+                date_obj = ended_at.date()
+            else:
+                date_obj = datetime.strptime(segment.get('date') or '', '%Y-%m-%d').date()
+                started_at, ended_at = resolve_session_times(date_obj, duration_seconds, now)
+        except (ValueError, TypeError, OverflowError, OSError):
+            rejected.append(key)
+            continue
+        if not 0 < duration_seconds <= STUDY_SEGMENT_MAX_SECONDS:
+            rejected.append(key)
+            continue
+        # 자정을 넘는 구간은 날짜별로 나누어 저장 (나뉜 구간도 원래 key로 응답)
+        for part in split_segment_by_date({
+            'client_key': key,
+            'subject_id': subject_id,
+            'date': date_obj,
+            'duration_seconds': duration_seconds,
+            'started_at': started_at,
+            'ended_at': ended_at
+        }):
+            part_keys[part['client_key']] = key
+            valid_segments.append(part)
+
+    try:
+        # 과목 유효성 검사 (요청에 포함된 과목을 한 번에 조회)
+        subject_ids = {s['subject_id'] for s in valid_segments if s['subject_id']}
+        owned_ids = set()
+        if subject_ids:
+            owned_ids = {row.id for row in Subject.query.with_entities(Subject.id).filter(
+                Subject.id.in_(subject_ids), Subject.user_id == user_id
+            )}
+        rejected.extend(sorted({
+            part_keys[s['client_key']] for s in valid_segments if s['subject_id'] and s['subject_id'] not in owned_ids
+        }))
+        valid_segments = [s for s in valid_segments if not s['subject_id'] or s['subject_id'] in owned_ids]
+
+        # 구간 INSERT 1회 + 일일/시간대별 집계 갱신 후, 영향받은 날짜의 합계를 집계에서 조회
+        inserted_keys = {part_keys[key] for key in add_study_segments(user_id, valid_segments)}
+        db.session.commit()
+        day_totals = get_daily_totals_for_dates(user_id, {s['date'] for s in valid_segments})
+
+        return jsonify({
+            "status": "success",
+            "data": {
+                "inserted": sorted(inserted_keys),
+                "duplicates": sorted({part_keys[s['client_key']] for s in valid_segments} - inserted_keys),
+                "rejected": rejected,
+                "day_totals": {d.strftime('%Y-%m-%d'): total for d, total in sorted(day_totals.items())}
+            }
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error saving study log batch: {e}")
+        return jsonify({"status": "error", "message": f"공부 시간 저장 중 오류 발생: {e}"}), 500
+
 # --- [신규] 공부 분석 페이지: 데이터 조회 API ---
 @app.route('/api/study-analysis-data')
 @login_required
@@ -2002,6 +2138,12 @@ def get_study_analysis_data():
     if not semester_id:
          return jsonify({"status": "error", "message": "학기 ID가 필요합니다."}), 400
 
+    # 가상 학기 ID는 저장된 학기 ID로 변환 (저장되지 않은 학기는 과목이 없으므로 과목별 기록도 없음)
+    semester = resolve_user_semester(user_id, semester_id)
+    if not semester:
+        return jsonify({"status": "error", "message": "유효하지 않은 학기입니다."}), 404
+    semester_id = semester.id
+
     # 1. 기간(start_date, end_date) 설정
     if period == 'daily':
         start_date = end_date = target_date
@@ -2020,79 +2162,7 @@ def get_study_analysis_data():
         return jsonify({"status": "error", "message": "유효하지 않은 기간입니다."}), 400
 
     try:
-        # 2. 메인 그래프용 시계열 데이터
-        if period == 'daily':
-            # 일간: 시간대별 데이터 (0-23시)
-            # 실제 시간 정보가 없으므로 전체 시간을 하루 전체에 표시
-            day_total = db.session.query(
-                func.sum(StudyLog.duration_seconds)
-            ).filter(
-                StudyLog.user_id == user_id,
-                StudyLog.date == target_date
-            ).scalar() or 0
-
-            # 임시: 전체 시간을 임의의 시간대에 분산 (실제로는 로그에 시간 정보 필요)
-            timeseries_data = [0] * 24
-            if day_total > 0:
-                # 9-21시 사이에 균등하게 분산
-                study_hours = list(range(9, 22))  # 9시-21시 (13개 시간대)
-                avg_per_hour = day_total // len(study_hours)
-                remainder = day_total % len(study_hours)
-
-                for i, hour in enumerate(study_hours):
-                    timeseries_data[hour] = avg_per_hour
-                    if i < remainder:  # 나머지를 앞쪽 시간대에 배분
-                        timeseries_data[hour] += 1
-        else:
-            # 주간/월간: 날짜별 데이터
-            timeseries_query = db.session.query(
-                StudyLog.date,
-                func.sum(StudyLog.duration_seconds).label('total_duration')
-            ).filter(
-                StudyLog.user_id == user_id,
-                StudyLog.date.between(start_date, end_date)
-            ).group_by(
-                StudyLog.date
-            ).all()
-
-            # 날짜 레이블에 맞춰 데이터 매핑
-            time_data_map = {str(result.date): result.total_duration for result in timeseries_query}
-            timeseries_data = [time_data_map.get(label, 0) for label in date_labels]
-
-        # 3. 과목별 데이터 (도넛 차트용) + 총 시간
-        # 3a. 과목별 집계
-        subject_times_query = db.session.query(
-            Subject.name,
-            func.sum(StudyLog.duration_seconds).label('total_duration')
-        ).join(
-            Subject, Subject.id == StudyLog.subject_id
-        ).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date.between(start_date, end_date),
-            StudyLog.subject_id != None, # 과목이 있는 로그
-            Subject.semester_id == semester_id # 현재 선택된 학기
-        ).group_by(
-            Subject.name
-        ).all()
-
-        subject_data = [{"name": name, "time": time} for name, time in subject_times_query]
-
-        # 3b. '개인 공부' (subject_id=None) 집계
-        personal_time = db.session.query(
-            func.sum(StudyLog.duration_seconds)
-        ).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date.between(start_date, end_date),
-            StudyLog.subject_id == None
-        ).scalar() or 0
-
-        if personal_time > 0:
-            subject_data.append({"name": "개인 공부", "time": personal_time})
-
-        # 3c. 총 시간 (timeseries_data의 합계와 동일해야 함)
-        total_time = sum(timeseries_data)
-
-        # 4. 이전 기간 총 시간 계산 (변화율 비교용)
+        # 2. 이전 기간 (변화율 비교용)
         if period == 'daily':
             prev_date = start_date - timedelta(days=1)
             prev_start = prev_end = prev_date
@@ -2106,58 +2176,45 @@ def get_study_analysis_data():
                 prev_start = start_date.replace(month=start_date.month - 1, day=1)
             prev_end = start_date - timedelta(days=1)
 
-        previous_total = db.session.query(
-            func.sum(StudyLog.duration_seconds)
-        ).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date.between(prev_start, prev_end)
-        ).scalar() or 0
+        # 3. 현재/이전 기간의 날짜별·과목별 합계, 로그 수를 study_logs 쿼리 1회로 집계
+        aggregates = get_study_window_aggregates(user_id, start_date, end_date, prev_start, prev_end)
+        total_time = aggregates['total']
+        previous_total = aggregates['previous_total']
+        log_count = aggregates['log_count']
 
-        # 5. 연속 학습 일수 계산
-        today = datetime.now(KST).date()
-        streak = 0
-        check_date = today
-        while True:
-            day_total = db.session.query(
-                func.sum(StudyLog.duration_seconds)
-            ).filter(
-                StudyLog.user_id == user_id,
-                StudyLog.date == check_date
-            ).scalar() or 0
-
-            if day_total > 0:
-                streak += 1
-                check_date -= timedelta(days=1)
-            else:
-                break
+        # 4. 기간 내 시간대별 합계 (시간대별 집계에서 GROUP BY 1회, 시각 정보가 없는 기존 로그는 포함되지 않음)
+        hourly_totals = get_hourly_totals_between(user_id, start_date, end_date)
 
-            # 최대 100일까지만 확인
-            if streak >= 100:
-                break
+        # 5. 메인 그래프용 시계열 데이터
+        if period == 'daily':
+            # 일간: 시간대별 데이터 (0-23시)
+            timeseries_data = hourly_totals
+        else:
+            # 주간/월간: 날짜 레이블에 맞춰 날짜별 합계 매핑
+            timeseries_data = [aggregates['daily'].get(start_date + timedelta(days=i), 0) for i in range(len(date_labels))]
+
+        # 6. 과목별 데이터 (도넛 차트용) - 현재 선택된 학기의 과목 + '개인 공부' (subject_id=None)
+        subject_times = {}
+        for subject_id, subject in aggregates['subjects'].items():
+            if subject_id is not None and subject['semester_id'] == semester_id:
+                subject_times[subject['name']] = subject_times.get(subject['name'], 0) + subject['time']
+        subject_data = [{"name": name, "time": time} for name, time in subject_times.items()]
+        personal_time = aggregates['subjects'].get(None, {}).get('time', 0)
+        if personal_time > 0:
+            subject_data.append({"name": "개인 공부", "time": personal_time})
 
-        # 6. 일일 평균 계산
+        # 7. 연속 학습 일수 + 오늘 총 시간 (일일 집계에서 최대 100일을 한 번에 조회)
+        today = datetime.now(KST).date()
+        streak, today_total_time = get_streak_and_today_total(user_id, today)
+
+        # 8. 일일 평균 계산
         days_count = (end_date - start_date).days + 1
         daily_average = total_time // days_count if days_count > 0 else 0
 
-        # 7. 시간대별 데이터 (0-23시)
-        # 이 부분은 실제 로그 시각 정보가 없으므로 임시로 랜덤 분포 생성
-        # 실제로는 로그에 시각 정보가 있어야 함
-        hourly_data = {}
-        # 간단한 예시: 9-22시 사이에 공부 시간 분산
-        if total_time > 0:
-            import random
-            study_hours = [9, 10, 11, 13, 14, 15, 16, 17, 18, 19, 20, 21]
-            for hour in study_hours:
-                hourly_data[hour] = int(total_time * random.uniform(0.05, 0.15))
-
-        # 8. 평균 세션 시간 (로그 당 평균)
-        log_count = db.session.query(
-            func.count(StudyLog.entry_id)
-        ).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.date.between(start_date, end_date)
-        ).scalar() or 0
+        # 시간대별 데이터 (0-23시, 공부 기록이 있는 시간대만)
+        hourly_data = {hour: seconds for hour, seconds in enumerate(hourly_totals) if seconds > 0}
 
+        # 평균 세션 시간 (로그 당 평균)
         average_session = total_time // log_count if log_count > 0 else 0
 
         # 9. 주간 트렌드 (이전 주 대비 % 변화)
@@ -2187,7 +2244,7 @@ def get_study_analysis_data():
             "subject_name": log.subject_name
         } for log in recent_logs_query]
 
-        return jsonify({
+        response = jsonify({
             "status": "success",
             "period": period,
             "date_range": {
@@ -2198,12 +2255,7 @@ def get_study_analysis_data():
             "previous_total": previous_total,
             "streak": streak,
             "daily_average": daily_average,
-            "today_total_time": db.session.query(
-                func.sum(StudyLog.duration_seconds)
-            ).filter(
-                StudyLog.user_id == user_id,
-                StudyLog.date == datetime.now(KST).date()
-            ).scalar() or 0,
+            "today_total_time": today_total_time,
             "subject_data": sorted(subject_data, key=lambda x: x['time'], reverse=True),
             "timeseries_data": timeseries_data,  # 배열로 반환
             "hourly_data": hourly_data,
@@ -2211,6 +2263,10 @@ def get_study_analysis_data():
             "week_trend": week_trend,
             "recent_logs": recent_logs
         })
+        # 같은 데이터면 같은 응답이므로 ETag로 재검증 (변경 없으면 304)
+        response.add_etag()
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response.make_conditional(request)
 
     except Exception as e:
         db.session.rollback()
@@ -2259,23 +2315,12 @@ def community_feed():
     selected_category = request.args.get('category', 'all')
     
     try:
-        now_utc = datetime.utcnow()
-        
-        # 기본 쿼리: 승인되고, 노출 가능하며, 만료되지 않은 게시물
-        query = Post.query.filter(
-            Post.is_approved == True,
-            Post.is_visible == True,
-            or_(Post.expires_at == None, Post.expires_at > now_utc)
-        )
-        
         # 카테고리 필터링 적용
-        if selected_category != 'all' and selected_category in categories:
-            query = query.filter(Post.category == selected_category)
+        category_filter = selected_category if selected_category in categories else None
 
-        posts = query.order_by(desc(Post.created_at)).all()
-        
-        user_likes = db.session.query(PostLike.post_id).filter_by(user_id=user.id).all()
-        user_likes_set = {like.post_id for like in user_likes}
+        # 첫 페이지만 렌더링 (이후 페이지는 /api/community/posts 로 스크롤 시 로드)
+        posts, next_cursor = get_feed_page(category=category_filter)
+        user_likes_set = _get_user_liked_post_ids(user.id, [post.id for post in posts])
 
         return render_template(
             'community.html', 
@@ -2283,7 +2328,8 @@ def community_feed():
             posts=posts, 
             user_likes=user_likes_set,
             post_categories=categories, # 템플릿에 카테고리 목록 전달
-            selected_category=selected_category # 템플릿에 현재 카테고리 전달
+            selected_category=selected_category, # 템플릿에 현재 카테고리 전달
+            next_cursor=next_cursor
         )
     except Exception as e:
         print(f"Error loading community feed: {e}")
@@ -2294,9 +2340,60 @@ def community_feed():
             posts=[], 
             user_likes=set(),
             post_categories=categories,
-            selected_category=selected_category
+            selected_category=selected_category,
+            next_cursor=None
         )
 
+def _get_user_liked_post_ids(user_id, post_ids):
+    """주어진 게시물 중 사용자가 좋아요를 누른 게시물 ID 집합 (쓰기 지연 큐에 대기 중인 토글 포함)"""
+    if not post_ids:
+        return set()
+    liked = db.session.query(PostLike.post_id).filter(
+        PostLike.user_id == user_id,
+        PostLike.post_id.in_(post_ids)
+    ).all()
+    return apply_pending_likes(user_id, {like.post_id for like in liked}, post_ids)
+
+@app.route('/api/community/posts', methods=['GET'])
+@login_required
+def get_community_posts():
+    """커뮤니티 피드 페이지 API (created_at, id 커서 기반 무한 스크롤)"""
+    from flask import g
+    user = g.user
+
+    category = request.args.get('category', 'all')
+    cursor = request.args.get('cursor') or None
+    limit = request.args.get('limit', COMMUNITY_PAGE_SIZE, type=int)
+
+    if category != 'all' and category not in POST_CATEGORIES:
+        return jsonify({"status": "error", "message": "유효하지 않은 카테고리입니다."}), 400
+
+    try:
+        posts, next_cursor = get_feed_page(
+            category=None if category == 'all' else category,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError:
+        return jsonify({"status": "error", "message": "잘못된 커서 형식입니다."}), 400
+
+    try:
+        liked_ids = _get_user_liked_post_ids(user.id, [post.id for post in posts])
+        posts_data = serialize_posts(posts, include_content=True)
+        for post, post_data in zip(posts, posts_data):
+            post_data['liked'] = post.id in liked_ids
+            post_data['author_permission'] = post.author.permission if post.author else 'general'
+            post_data['created_at_kst'] = format_datetime_kst(post.created_at)
+
+        return jsonify({
+            "status": "success",
+            "posts": posts_data,
+            "next_cursor": next_cursor
+        })
+    except Exception as e:
+        print(f"Error fetching community posts: {e}")
+        return jsonify({"status": "error", "message": "게시물 조회 중 오류 발생"}), 500
+
 @app.route('/api/posts/<int:post_id>/like', methods=['POST'])
 @login_required
 def toggle_like(post_id):
@@ -2308,30 +2405,23 @@ def toggle_like(post_id):
     if not post:
         return jsonify({"status": "error", "message": "게시물을 찾을 수 없습니다."}), 404
 
-    like = PostLike.query.filter_by(post_id=post_id, user_id=user_id).first()
+    # --- [신규] 원하는 상태(liked)를 받으면 그 상태로 설정 (재전송해도 결과가 같음), 없으면 기존처럼 토글 ---
+    data = request.get_json(silent=True) or {}
+    desired = data.get('liked')
+    if desired is not None and not isinstance(desired, bool):
+        return jsonify({"status": "error", "message": "liked 값이 올바르지 않습니다."}), 400
 
     try:
-        if like:
-            # 좋아요 취소
-            db.session.delete(like)
-            db.session.commit()
-            return jsonify({
-                "status": "success", 
-                "message": "좋아요를 취소했습니다.",
-                "liked": False,
-                "like_count": post.likes.count() # lazy='dynamic'이므로 count() 사용
-            })
-        else:
-            # 좋아요 추가
-            new_like = PostLike(post_id=post_id, user_id=user_id)
-            db.session.add(new_like)
-            db.session.commit()
-            return jsonify({
-                "status": "success", 
-                "message": "좋아요를 눌렀습니다.",
-                "liked": True,
-                "like_count": post.likes.count()
-            })
+        # 변경은 쓰기 지연 큐에서 (게시물, 사용자)별로 합쳐져 반영됨 (좋아요 후 바로 취소하면 DB 쓰기 없음)
+        # 좋아요 행과 like_count는 반영 시 같은 트랜잭션에서 갱신되므로, 응답에는 대기 중인 변화량을 더함
+        # (이 워커의 대기분만 보이므로 다른 워커에 대기 중인 변경과의 한계는 write_behind_service 설명 참고)
+        liked = queue_post_like(post_id, user_id, desired)
+        return jsonify({
+            "status": "success", 
+            "message": "좋아요를 눌렀습니다." if liked else "좋아요를 취소했습니다.",
+            "liked": liked,
+            "like_count": post.like_count + get_pending_like_delta(post_id)
+        })
     except Exception as e:
         db.session.rollback()
         print(f"Error toggling like: {e}")
@@ -2452,12 +2542,13 @@ def post_comment(post_id):
             parent_id=parent_id 
         )
         db.session.add(new_comment)
+        increment_post_counter(post_id, 'comment_count', 1)
         db.session.commit()
         
         return jsonify({
             "status": "success",
             "message": "댓글이 등록되었습니다.",
-            "total_comments": post.comments.count()
+            "total_comments": post.comment_count
         }), 201
         
     except Exception as e:
@@ -2599,24 +2690,30 @@ def get_calendar_events():
     end_date_str = request.args.get('end')
 
     try:
-        query = CalendarEvent.query.filter(
-            or_(CalendarEvent.user_id == user_id, CalendarEvent.is_system == True)
-        )
-
-        # 날짜 범위 필터링 (선택적)
-        if start_date_str:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            query = query.filter(CalendarEvent.start_date >= start_date)
-
-        if end_date_str:
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            query = query.filter(CalendarEvent.start_date <= end_date)
-
-        events = query.all()
+        # 날짜 범위 필터링 (선택적) - 범위와 겹치는 이벤트 (여러 날/반복 일정 포함)
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else None
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+
+        if start_date and end_date:
+            # 사용자 이벤트만 조회하고, 시스템 이벤트는 프로세스 캐시에서 가져와 합침
+            events = CalendarEvent.query.filter(
+                CalendarEvent.user_id == user_id,
+                event_overlap_filter(start_date, end_date)
+            ).all()
+            event_dicts = list(get_system_event_dicts(start_date, end_date))
+            # 범위 안의 반복 일정은 발생별로 펼침 (카테고리는 한 번만 조회)
+            event_dicts.extend(serialize_event_occurrences(events, start_date, end_date))
+        else:
+            query = CalendarEvent.query.filter(
+                or_(CalendarEvent.user_id == user_id, CalendarEvent.is_system == True)
+            )
+            if start_date or end_date:
+                query = query.filter(event_overlap_filter(start_date, end_date))
+            event_dicts = serialize_events(query.all())
 
         return jsonify({
             'status': 'success',
-            'events': [event.to_dict() for event in events]
+            'events': event_dicts
         })
     except Exception as e:
         print(f"Error fetching events: {e}")
@@ -2665,6 +2762,10 @@ def create_calendar_event():
         if recurrence_type and 'recurrence_end_date' in data and data['recurrence_end_date']:
             recurrence_end_date = datetime.strptime(data['recurrence_end_date'], '%Y-%m-%d').date()
 
+        # --- [신규] 종료일이 시작일보다 앞서는 일정 거부 ---
+        if (end_date and end_date < start_date) or (recurrence_end_date and recurrence_end_date < start_date):
+            return jsonify({'status': 'error', 'message': '종료 날짜는 시작 날짜보다 빠를 수 없습니다.'}), 400
+
         new_event = CalendarEvent(
             user_id=user_id,
             category_id=category_id,
@@ -2746,6 +2847,12 @@ def update_calendar_event(event_id):
         if 'recurrence_interval' in data:
             event.recurrence_interval = int(data['recurrence_interval']) if data['recurrence_interval'] else 1
 
+        # --- [신규] 종료일이 시작일보다 앞서는 일정 거부 ---
+        if (event.end_date and event.end_date < event.start_date) or \
+                (event.recurrence_type and event.recurrence_end_date and event.recurrence_end_date < event.start_date):
+            db.session.rollback()
+            return jsonify({'status': 'error', 'message': '종료 날짜는 시작 날짜보다 빠를 수 없습니다.'}), 400
+
         db.session.commit()
         return jsonify({'status': 'success', 'event': event.to_dict()})
     except Exception as e:
@@ -2792,6 +2899,12 @@ def get_todos():
         start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d').date()
         end_date_obj = datetime.strptime(end_date_str, '%Y-%m-%d').date()
 
+        # 가상 학기에는 아직 Todo가 없음
+        semester = resolve_user_semester(user_id, semester_id)
+        if not semester or semester.is_virtual:
+            return jsonify({'status': 'success', 'todos': []})
+        semester_id = semester.id
+
         todos = Todo.query.filter(
             Todo.user_id == user_id,
             Todo.semester_id == semester_id,
@@ -2824,13 +2937,16 @@ def create_todo():
         if not task:
             return jsonify({'status': 'error', 'message': 'Todo 내용이 없습니다.'}), 400
 
-        semester = db.session.get(Semester, semester_id)
-        if not semester or semester.user_id != user_id:
+        semester = resolve_user_semester(user_id, semester_id)
+        if not semester:
             return jsonify({'status': 'error', 'message': '유효하지 않은 학기입니다.'}), 404
 
+        # 첫 Todo가 추가될 때 가상 학기를 DB에 저장
+        semester = materialize_semester(semester)
+
         new_todo = Todo(
             user_id=user_id,
-            semester_id=semester_id,
+            semester_id=semester.id,
             task=task,
             due_date=due_date_obj
         )
@@ -2881,11 +2997,13 @@ if __name__ == '__main__':
 
     # APScheduler 설정
     scheduler = BackgroundScheduler(timezone='Asia/Seoul')
-    # 매일 자정(KST)에 학기 관리 작업 실행
-    # scheduler.add_job(lambda: manage_semesters_job(app), 'cron', month=12, day=1, hour=3, id='semester_management_job')
+    # 학기는 과목/Todo가 처음 추가될 때 저장되므로 (가상 학기) 학기 사전 생성 작업은 등록하지 않음
+
+    # 식단 크롤링: 1시간마다 조건부 요청, 내용이 바뀐 경우에만 파일 저장 및 식단 캐시 갱신
+    scheduler.add_job(crawl_and_save_menu, 'interval', minutes=60, id='meal_crawl_job')
 
-    # 테스트용: 10시간마다 실행
-    scheduler.add_job(lambda: manage_semesters_job(app), 'interval', minutes=600, id='semester_management_job_test')
+    # 학사일정/공휴일 CSV가 바뀐 경우에만 시스템 이벤트 차등 동기화
+    scheduler.add_job(lambda: sync_system_events_job(app), 'interval', minutes=10, id='system_events_sync_job')
 
     try:
         scheduler.start()
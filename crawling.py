@@ -2,7 +2,26 @@ import requests
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
+import hashlib
 import os
+import tempfile
+
+MENU_URL = 'https://sejong.korea.ac.kr/dietMa/koreaSejong/artclView.do'
+SAVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'menu_data')
+# 조건부 요청(ETag/Last-Modified)과 마지막 저장 내용의 해시를 기록하는 파일
+CRAWL_STATE_PATH = os.path.join(SAVE_DIR, '.crawl_state.json')
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+def get_html_parser():
+    """설치되어 있으면 더 빠른 lxml 파서를, 없으면 기본 html.parser를 사용"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
 
 def extract_menu_items(cell):
     """td 셀에서 메뉴 항목들을 추출"""
@@ -63,59 +82,124 @@ def process_menu_table(table, menu_dict):
                     "메뉴": menu_items
                 }
 
-def crawl_and_save_menu():
-    """고려대학교 세종캠퍼스 식당 메뉴를 크롤링하여 JSON 파일로 저장"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    save_dir = os.path.join(current_dir, 'menu_data')
+def load_crawl_state():
+    """이전 크롤링 상태 로드 (없거나 손상된 경우 빈 상태)"""
+    try:
+        with open(CRAWL_STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_json_atomic(path, data):
+    """같은 디렉터리의 임시 파일에 쓴 뒤 교체하여, 읽는 쪽이 쓰다 만 파일을 보지 않도록 저장"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        # mkstemp는 0600으로 만들므로 기존 파일 권한(없으면 0644)을 유지
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def compute_menu_hash(student_data, staff_data):
+    """파싱된 식단 내용의 해시 (내용이 바뀌었는지 판단용)"""
+    payload = json.dumps([student_data, staff_data], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def parse_menu_page(html):
+    """식단 페이지 HTML을 (학생식당, 교직원식당) 데이터로 변환 (식단표가 없으면 None)"""
+    soup = BeautifulSoup(html, get_html_parser())
+
+    diet_menus = soup.find_all('div', class_='diet-menu')
+    if len(diet_menus) < 2:
+        print("식단표를 찾을 수 없습니다.")
+        return None
+
+    student_menu = diet_menus[1]
+    staff_menu = diet_menus[0]
+
+    date_range = student_menu.find('p', class_='title').text.split(' ')[0:3]
+    period_info = {
+        "시작일": date_range[0],
+        "종료일": date_range[2]
+    }
+
+    student_data = {"기간": period_info, "메뉴": {}}
+    student_table = student_menu.find('table')
+    process_menu_table(student_table, student_data["메뉴"])
 
-    if not os.path.exists(save_dir):
-        os.makedirs(save_dir)
+    staff_data = {"기간": period_info, "메뉴": {}}
+    staff_table = staff_menu.find('table')
+    process_menu_table(staff_table, staff_data["메뉴"])
 
-    url = 'https://sejong.korea.ac.kr/dietMa/koreaSejong/artclView.do'
+    return student_data, staff_data
 
+def notify_meal_cache():
+    """같은 프로세스의 식단 캐시에 파일 변경을 알림 (앱 밖에서 단독 실행 시에는 무시)"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        from services.meal_service import invalidate_meal_cache
+        invalidate_meal_cache()
+    except ImportError:
+        pass
+
+def crawl_and_save_menu(force=False):
+    """
+    고려대학교 세종캠퍼스 식당 메뉴를 크롤링하여 JSON 파일로 저장
+    - ETag/Last-Modified로 조건부 요청하여 페이지가 그대로면(304) 파싱하지 않음
+    - 파싱 결과의 해시가 이전과 같으면 파일을 다시 쓰지 않음
+    - force=True이면 조건부 요청과 해시 비교를 건너뜀
+    저장한 경우 데이터를, 변경이 없거나 실패한 경우 None을 반환합니다.
+    """
+    if not os.path.exists(SAVE_DIR):
+        os.makedirs(SAVE_DIR)
+
+    state = {} if force else load_crawl_state()
+
+    try:
+        headers = dict(REQUEST_HEADERS)
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+
+        response = requests.get(MENU_URL, headers=headers, timeout=10)
+        if response.status_code == 304:
+            print("식단 페이지 변경 없음 (304).")
+            return None
         response.raise_for_status()
 
         if not response.text.strip():
             print("빈 응답을 받았습니다.")
             return None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        diet_menus = soup.find_all('div', class_='diet-menu')
-        if len(diet_menus) < 2:
-            print("식단표를 찾을 수 없습니다.")
+        parsed = parse_menu_page(response.text)
+        if parsed is None:
             return None
+        student_data, staff_data = parsed
 
-        student_menu = diet_menus[1]
-        staff_menu = diet_menus[0]
-
-        date_range = student_menu.find('p', class_='title').text.split(' ')[0:3]
-        period_info = {
-            "시작일": date_range[0],
-            "종료일": date_range[2]
+        new_state = {
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "content_hash": compute_menu_hash(student_data, staff_data),
+            "checked_at": datetime.now().isoformat()
         }
 
-        student_data = {"기간": period_info, "메뉴": {}}
-        student_table = student_menu.find('table')
-        process_menu_table(student_table, student_data["메뉴"])
-
-        staff_data = {"기간": period_info, "메뉴": {}}
-        staff_table = staff_menu.find('table')
-        process_menu_table(staff_table, staff_data["메뉴"])
-
-        student_file_path = os.path.join(save_dir, 'student_menu.json')
-        staff_file_path = os.path.join(save_dir, 'staff_menu.json')
-
-        with open(student_file_path, 'w', encoding='utf-8') as f:
-            json.dump(student_data, f, ensure_ascii=False, indent=2)
+        if new_state["content_hash"] == state.get('content_hash'):
+            write_json_atomic(CRAWL_STATE_PATH, new_state)
+            print("식단 내용 변경 없음.")
+            return None
 
-        with open(staff_file_path, 'w', encoding='utf-8') as f:
-            json.dump(staff_data, f, ensure_ascii=False, indent=2)
+        write_json_atomic(os.path.join(SAVE_DIR, 'student_menu.json'), student_data)
+        write_json_atomic(os.path.join(SAVE_DIR, 'staff_menu.json'), staff_data)
+        write_json_atomic(CRAWL_STATE_PATH, new_state)
+        notify_meal_cache()
 
         print("메뉴 데이터가 성공적으로 저장되었습니다.")
 
@@ -129,7 +213,7 @@ def crawl_and_save_menu():
         return None
 
 if __name__ == "__main__":
-    menu_data = crawl_and_save_menu()
+    menu_data = crawl_and_save_menu(force=True)
     if menu_data:
         print("\n변환된 JSON 데이터 예시:")
         print(json.dumps(menu_data, ensure_ascii=False, indent=2))
\ No newline at end of file
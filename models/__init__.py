@@ -7,9 +7,10 @@ db = SQLAlchemy()
 
 from .user import User
 from .semester import Semester
-from .subject import Subject, TimeSlot
+from .subject import Subject, TimeSlot, SubjectDailyMemo
 from .schedule import Schedule
-from .study import StudyLog
+from .study import StudyLog, StudyDailyTotal, StudyHourlyTotal
+from .grade import SemesterGradeTotal, UserGradeTotal, GradePoint
 from .todo import Todo
 from .post import Post
 from .calendar import CalendarCategory, CalendarEvent
@@ -17,8 +18,9 @@ from .calendar import CalendarCategory, CalendarEvent
 from .community import Comment, PostLike
 
 __all__ = [
-    'db', 'User', 'Semester', 'Subject', 'TimeSlot', 
-    'Schedule', 'StudyLog', 'Todo', 'Post', 
+    'db', 'User', 'Semester', 'Subject', 'TimeSlot', 'SubjectDailyMemo',
+    'Schedule', 'StudyLog', 'StudyDailyTotal', 'StudyHourlyTotal', 'SemesterGradeTotal', 'UserGradeTotal', 'GradePoint',
+    'Todo', 'Post', 
     'CalendarCategory', 'CalendarEvent',
     # --- [신규] __all__에 추가 ---
     'Comment', 'PostLike'
@@ -1,9 +1,28 @@
 """
 캘린더 모델
 """
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from sqlalchemy import event
 from . import db
 
+# 종료일 없이 계속 반복되는 일정의 span_end_date (인덱스 범위 비교를 위해 NULL 대신 사용)
+OPEN_ENDED_SPAN_DATE = date(9999, 12, 31)
+
+
+def compute_span_end_date(start_date, end_date, recurrence_type, recurrence_end_date):
+    """
+    이벤트(반복 포함)가 마지막으로 걸치는 날짜
+    - 단일 일정: coalesce(end_date, start_date)
+    - 반복 일정: 마지막 반복 시작일(recurrence_end_date) + 일정 길이, 종료일이 없으면 OPEN_ENDED_SPAN_DATE
+    종료일이 시작일보다 앞서도 start_date 이전으로는 내려가지 않음 (daterange 하한 > 상한 오류 방지)
+    """
+    last_day = max(start_date, end_date or start_date)
+    if not recurrence_type:
+        return last_day
+    if not recurrence_end_date:
+        return OPEN_ENDED_SPAN_DATE
+    return max(start_date, recurrence_end_date + (last_day - start_date))
+
 class CalendarCategory(db.Model):
     """캘린더 카테고리 모델"""
     __tablename__ = 'calendar_categories'
@@ -49,23 +68,46 @@ class CalendarEvent(db.Model):
     recurrence_type = db.Column(db.String(20))  # 'daily', 'weekly', 'monthly', 'yearly', None
     recurrence_end_date = db.Column(db.Date)  # 반복 종료 날짜
     recurrence_interval = db.Column(db.Integer, default=1)  # 반복 간격 (예: 2주마다 = 2)
+    # 이벤트가 걸치는 마지막 날짜 (저장 시 자동 계산, 기간 조회용)
+    span_end_date = db.Column(db.Date)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    def to_dict(self):
-        """FullCalendar.js 형식에 맞게 반환"""
+    # 날짜 범위 조회용 인덱스 (사용자 이벤트 / 시스템 이벤트)
+    __table_args__ = (
+        db.Index('ix_calendar_events_user_start', 'user_id', 'start_date'),
+        db.Index('ix_calendar_events_system_start', 'is_system', 'start_date'),
+        db.Index('ix_calendar_events_user_span', 'user_id', 'span_end_date', 'start_date'),
+        db.Index('ix_calendar_events_system_span', 'is_system', 'span_end_date', 'start_date'),
+    )
+
+    def refresh_span_end_date(self):
+        """현재 날짜/반복 설정으로 span_end_date 재계산"""
+        self.span_end_date = compute_span_end_date(
+            self.start_date, self.end_date, self.recurrence_type, self.recurrence_end_date
+        )
+
+    def to_dict(self, category=None):
+        """
+        FullCalendar.js 형식에 맞게 반환
+        category를 넘기면 관계(self.category)를 지연 로딩하지 않고 그 값을 사용 (일괄 직렬화용)
+        """
+        if category is None:
+            category = self.category
+        color = category.color if category else '#3788d8'
+
         event_dict = {
             'id': self.id,
             'title': self.title,
             'start': self.start_date.isoformat(),
             'allDay': self.all_day,
-            'backgroundColor': self.category.color if self.category else '#3788d8',
-            'borderColor': self.category.color if self.category else '#3788d8',
+            'backgroundColor': color,
+            'borderColor': color,
             'extendedProps': {
                 'description': self.description,
                 'category_id': self.category_id,
-                'category_name': self.category.name if self.category else '',
+                'category_name': category.name if category else '',
                 'is_system': self.is_system,
                 'user_id': self.user_id,
                 'recurrence_type': self.recurrence_type,
@@ -79,7 +121,6 @@ class CalendarEvent(db.Model):
             # FullCalendar는 종일 이벤트의 end를 exclusive로 처리 (다음날 00:00)
             # 그래서 DB에 저장된 end_date에 1일을 더해야 함
             if self.all_day:
-                from datetime import timedelta
                 end_date_adjusted = self.end_date + timedelta(days=1)
                 event_dict['end'] = end_date_adjusted.isoformat()
             else:
@@ -93,3 +134,10 @@ class CalendarEvent(db.Model):
                 event_dict['end'] = f"{end_date.isoformat()}T{self.end_time.isoformat()}"
 
         return event_dict
+
+
+@event.listens_for(CalendarEvent, 'before_insert')
+@event.listens_for(CalendarEvent, 'before_update')
+def _set_span_end_date(mapper, connection, target):
+    """ORM으로 저장되는 모든 이벤트의 span_end_date를 최신 상태로 유지"""
+    target.refresh_span_end_date()
@@ -0,0 +1,35 @@
+"""
+성적 집계 모델
+"""
+from . import db
+
+class SemesterGradeTotal(db.Model):
+    """
+    학기별 성적/학점 집계 (과목 추가/수정/삭제 시 같은 트랜잭션에서 갱신)
+    평점 합계는 실수 누적 오차를 피하기 위해 (학점 x 평점 x 10)의 정수로 저장
+    """
+    __tablename__ = 'semester_grade_totals'
+
+    semester_id = db.Column(db.Integer, db.ForeignKey('semesters.id'), primary_key=True)
+    user_id = db.Column(db.String(10), db.ForeignKey('users.id'), nullable=False, index=True)
+    graded_credits = db.Column(db.Integer, default=0, nullable=False)  # 성적이 입력된 과목의 학점 합
+    grade_point_tenths = db.Column(db.Integer, default=0, nullable=False)  # 학점 x 평점 x 10 의 합
+    earned_credits = db.Column(db.Integer, default=0, nullable=False)  # 전체 과목 학점 합
+
+
+class UserGradeTotal(db.Model):
+    """사용자 전체 성적/학점 집계 (SemesterGradeTotal과 같은 트랜잭션에서 갱신)"""
+    __tablename__ = 'user_grade_totals'
+
+    user_id = db.Column(db.String(10), db.ForeignKey('users.id'), primary_key=True)
+    graded_credits = db.Column(db.Integer, default=0, nullable=False)
+    grade_point_tenths = db.Column(db.Integer, default=0, nullable=False)
+    earned_credits = db.Column(db.Integer, default=0, nullable=False)
+
+
+class GradePoint(db.Model):
+    """성적 -> 평점 조회 테이블 (utils.constants.GRADE_MAP으로 초기화, 평점 x 10 정수)"""
+    __tablename__ = 'grade_points'
+
+    grade = db.Column(db.String(10), primary_key=True)
+    point_tenths = db.Column(db.Integer, nullable=False)
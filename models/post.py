@@ -19,11 +19,20 @@ class Post(db.Model):
     expires_at = db.Column(db.DateTime, nullable=True)
     is_visible = db.Column(db.Boolean, default=True, nullable=False)
 
+    # 비정규화 카운터 (좋아요/댓글 추가·삭제 시 같은 트랜잭션에서 갱신)
+    like_count = db.Column(db.Integer, default=0, nullable=False)
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+
     # --- [신규] 커뮤니티 관계 추가 ---
     comments = db.relationship('Comment', back_populates='post', lazy='dynamic', cascade="all, delete-orphan")
     likes = db.relationship('PostLike', back_populates='post', lazy='dynamic', cascade="all, delete-orphan")
     # --- [신규] 추가 끝 ---
 
+    # 커뮤니티 피드 키셋 페이지네이션용 인덱스 ((created_at, id) 커서)
+    __table_args__ = (
+        db.Index('ix_posts_feed', 'is_approved', 'is_visible', 'category', 'created_at', 'id'),
+    )
+
     def to_dict(self, include_content=False):
         image_list = self.image_filenames.split(',') if self.image_filenames else []
         data = {
@@ -37,9 +46,9 @@ class Post(db.Model):
             'category': self.category,
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
             'is_visible': self.is_visible,
-            # --- [신규] 커뮤니티 데이터 추가 ---
-            'like_count': self.likes.count(),
-            'comment_count': self.comments.count()
+            # --- [신규] 커뮤니티 데이터 추가 (비정규화 카운터 사용) ---
+            'like_count': self.like_count or 0,
+            'comment_count': self.comment_count or 0
             # --- [신규] 추가 끝 ---
         }
         if include_content:
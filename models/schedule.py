@@ -12,3 +12,5 @@ class Schedule(db.Model):
     time = db.Column(db.String(5), nullable=False)
     title = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(100))
+
+    __table_args__ = (db.Index('ix_schedules_user_date', 'user_id', 'date'),)
@@ -13,7 +13,15 @@ class Semester(db.Model):
     season = db.Column(db.String(50), nullable=False)
     start_date = db.Column(db.Date)
 
+    # 저장된 학기 (services.semester_service.VirtualSemester와 구분)
+    is_virtual = False
+
     subjects = db.relationship('Subject', backref='semester', lazy=True, cascade="all, delete-orphan")
     todos = db.relationship('Todo', backref='semester', lazy=True, cascade="all, delete-orphan")
+    grade_total = db.relationship('SemesterGradeTotal', lazy=True, uselist=False, cascade="all, delete-orphan")
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'name', name='_user_semester_name_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'name', name='_user_semester_name_uc'),
+        # 현재 학기 조회 (user_id, start_date 범위)
+        db.Index('ix_semesters_user_start', 'user_id', 'start_date'),
+    )
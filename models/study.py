@@ -7,12 +7,43 @@ class StudyLog(db.Model):
     __tablename__ = 'study_logs'
 
     entry_id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.String(10), db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.String(10), db.ForeignKey('users.id'), nullable=False) # (user_id, date) 복합 인덱스가 user_id 조회도 처리
     subject_id = db.Column(db.Integer, db.ForeignKey('subjects.id'), nullable=True, index=True) # [수정] nullable=True
     date = db.Column(db.Date, nullable=False, index=True) # [수정] String -> Date 타입으로 변경
     duration_seconds = db.Column(db.Integer, nullable=False) # [수정] default=0 제거 (매번 새 로그이므로)
+    # [신규] 공부 시작/종료 시각 (KST 기준, timezone 없음) - 시각을 알 수 없는 기존 로그는 NULL
+    started_at = db.Column(db.DateTime, nullable=True)
+    ended_at = db.Column(db.DateTime, nullable=True)
+    # [신규] 클라이언트가 붙인 구간 키 (일괄 저장 재전송 시 중복 방지, 단건 API 로그는 NULL)
+    client_key = db.Column(db.String(64), nullable=True)
 
     subject = db.relationship('Subject') # [신규] Subject 모델과 관계 설정
 
+    # 통계 조회 (user_id, 날짜 범위) 합계용 복합 인덱스 - PostgreSQL은 INCLUDE로 index-only scan
+    __table_args__ = (
+        db.Index('ix_study_logs_user_date', 'user_id', 'date', postgresql_include=['duration_seconds', 'subject_id']),
+        db.Index('uq_study_logs_user_client_key', 'user_id', 'client_key', unique=True),
+    )
+
     # [수정] UniqueConstraint 제거 (하루에 여러 과목/개인 공부 기록 가능)
-    # __table_args__ = (db.UniqueConstraint('user_id', 'date', name='_user_date_uc'),)
\ No newline at end of file
+    # __table_args__ = (db.UniqueConstraint('user_id', 'date', name='_user_date_uc'),)
+
+
+class StudyDailyTotal(db.Model):
+    """사용자별 일일 공부 시간 집계 (StudyLog 삽입 시 같은 트랜잭션에서 갱신)"""
+    __tablename__ = 'study_daily_totals'
+
+    user_id = db.Column(db.String(10), db.ForeignKey('users.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    total_seconds = db.Column(db.Integer, default=0, nullable=False)
+    session_count = db.Column(db.Integer, default=0, nullable=False)
+
+
+class StudyHourlyTotal(db.Model):
+    """사용자별 날짜 x 시간대(0-23시) 공부 시간 집계 (시각이 있는 StudyLog 삽입 시 시간대별로 나누어 갱신)"""
+    __tablename__ = 'study_hourly_totals'
+
+    user_id = db.Column(db.String(10), db.ForeignKey('users.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    hour = db.Column(db.SmallInteger, primary_key=True)
+    total_seconds = db.Column(db.Integer, default=0, nullable=False)
@@ -1,6 +1,7 @@
 """
 과목 및 시간표 모델
 """
+from datetime import datetime
 from . import db
 
 class Subject(db.Model):
@@ -8,7 +9,7 @@ class Subject(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(10), db.ForeignKey('users.id'), nullable=False)
-    semester_id = db.Column(db.Integer, db.ForeignKey('semesters.id'), nullable=False)
+    semester_id = db.Column(db.Integer, db.ForeignKey('semesters.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     professor = db.Column(db.String(50))
     credits = db.Column(db.Integer, default=3, nullable=False)
@@ -16,6 +17,7 @@ class Subject(db.Model):
     memo = db.Column(db.Text, default='{"note": "", "todos": []}')
 
     timeslots = db.relationship('TimeSlot', backref='subject', lazy=True, cascade="all, delete-orphan")
+    daily_memos = db.relationship('SubjectDailyMemo', backref='subject', lazy='dynamic', cascade="all, delete-orphan")
 
 class TimeSlot(db.Model):
     __tablename__ = 'timeslots'
@@ -26,3 +28,16 @@ class TimeSlot(db.Model):
     start_time = db.Column(db.String(5), nullable=False)
     end_time = db.Column(db.String(5), nullable=False)
     room = db.Column(db.String(50))
+
+    __table_args__ = (db.Index('ix_timeslots_subject_day', 'subject_id', 'day_of_week'),)
+
+class SubjectDailyMemo(db.Model):
+    """과목별 날짜 메모 (기존 Subject.memo JSON의 daily_memos를 행 단위로 분리)"""
+    __tablename__ = 'subject_daily_memos'
+
+    # (subject_id, date) 기본키 인덱스로 하루/기간 조회를 처리 (note는 테이블 행에서 읽음)
+    # 커버링 인덱스가 아님: 길이 제한이 없는 note를 INCLUDE하면 B-tree 항목 크기 제한(약 2.7KB)을 넘는 메모를 저장할 수 없음
+    subject_id = db.Column(db.Integer, db.ForeignKey('subjects.id', ondelete='CASCADE'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    note = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -20,6 +20,10 @@ class User(db.Model):
     subjects = db.relationship('Subject', backref='user', lazy=True, cascade="all, delete-orphan")
     schedules = db.relationship('Schedule', backref='user', lazy=True, cascade="all, delete-orphan")
     study_logs = db.relationship('StudyLog', backref='user', lazy=True, cascade="all, delete-orphan")
+    study_daily_totals = db.relationship('StudyDailyTotal', backref='user', lazy=True, cascade="all, delete-orphan")
+    study_hourly_totals = db.relationship('StudyHourlyTotal', lazy=True, cascade="all, delete-orphan")
+    semester_grade_totals = db.relationship('SemesterGradeTotal', lazy=True, cascade="all, delete-orphan")
+    grade_total = db.relationship('UserGradeTotal', lazy=True, uselist=False, cascade="all, delete-orphan")
     todos = db.relationship('Todo', backref='user', lazy=True, cascade="all, delete-orphan")
     posts = db.relationship('Post', backref='author', lazy=True, cascade="all, delete-orphan")
 
@@ -2,37 +2,184 @@
 서비스 계층 모듈
 비즈니스 로직을 처리하는 서비스 함수들
 """
+from .academic_calendar_service import (
+    AcademicCalendarIndex,
+    get_academic_calendar
+)
+from .query_plan_service import check_index_usage
 from .semester_service import (
     load_academic_calendar,
     get_semester_start_date,
     _get_semester_start_date_fallback,
-    create_semesters_for_user,
-    manage_semesters_job
+    provision_semesters,
+    provision_semesters_for_all_users,
+    get_semester_years,
+    get_user_semesters,
+    resolve_user_semester,
+    materialize_semester,
+    get_current_semester,
+    invalidate_current_semester_cache
+)
+from .meal_service import (
+    load_meal_data,
+    get_today_meal_key,
+    format_meal_for_client,
+    format_weekly_meal_for_client,
+    get_meal_for_date,
+    get_today_meal,
+    get_weekly_meal,
+    invalidate_meal_cache
+)
+from .bus_service import (
+    load_bus_schedule,
+    build_shuttle_index,
+    get_shuttle_day_type,
+    get_next_departures,
+    SHUTTLE_NEXT_DEFAULT_LIMIT,
+    SHUTTLE_NEXT_MAX_LIMIT
+)
+from .schedule_service import get_today_schedule
+from .study_service import (
+    add_study_log,
+    add_study_segments,
+    split_segment_by_date,
+    get_daily_totals_for_dates,
+    get_daily_total,
+    get_total_between,
+    get_daily_totals_between,
+    get_study_streak,
+    get_streak_and_today_total,
+    get_study_window_aggregates,
+    get_hourly_totals_between,
+    resolve_session_times,
+    rebuild_daily_totals
+)
+from .grade_service import (
+    parse_subject_credits,
+    apply_subject_grade_change,
+    get_user_grade_summary,
+    get_semester_grade_summaries,
+    seed_grade_points,
+    query_gpa_by_semester,
+    rebuild_grade_totals
+)
+from .write_behind_service import (
+    queue_post_like,
+    get_pending_like_delta,
+    apply_pending_likes,
+    flush_write_behind,
+    stop_write_behind,
+    get_write_behind_metrics
+)
+from .memo_service import (
+    get_daily_memo_note,
+    save_daily_memo,
+    get_memos_between,
+    build_weekly_memo_digest,
+    migrate_memo_blobs
+)
+from .community_service import (
+    increment_post_counter,
+    with_feed_options,
+    serialize_posts,
+    get_feed_page,
+    reconcile_post_counters
 )
-from .meal_service import load_meal_data, get_today_meal_key, format_meal_for_client, format_weekly_meal_for_client
-from .bus_service import load_bus_schedule
 from .calendar_service import (
     load_holidays,
     load_academic_schedule,
     initialize_system_categories,
     initialize_system_events,
-    create_default_categories_for_user
+    sync_system_events,
+    sync_system_events_job,
+    create_default_categories_for_user,
+    event_overlap_filter,
+    expand_occurrence_dates,
+    serialize_events,
+    serialize_event_occurrences,
+    bump_system_events_version,
+    get_system_event_dicts,
+    backfill_event_spans
 )
 
 __all__ = [
+    'check_index_usage',
+    'AcademicCalendarIndex',
+    'get_academic_calendar',
     'load_academic_calendar',
     'get_semester_start_date',
     '_get_semester_start_date_fallback',
-    'create_semesters_for_user',
-    'manage_semesters_job',
+    'provision_semesters',
+    'provision_semesters_for_all_users',
+    'get_semester_years',
+    'get_user_semesters',
+    'resolve_user_semester',
+    'materialize_semester',
+    'get_current_semester',
+    'invalidate_current_semester_cache',
     'load_meal_data',
     'get_today_meal_key',
     'format_meal_for_client',
     'format_weekly_meal_for_client',
+    'get_meal_for_date',
+    'get_today_meal',
+    'get_weekly_meal',
+    'invalidate_meal_cache',
     'load_bus_schedule',
+    'build_shuttle_index',
+    'get_shuttle_day_type',
+    'get_next_departures',
+    'SHUTTLE_NEXT_DEFAULT_LIMIT',
+    'SHUTTLE_NEXT_MAX_LIMIT',
+    'get_today_schedule',
+    'add_study_log',
+    'add_study_segments',
+    'split_segment_by_date',
+    'get_daily_totals_for_dates',
+    'get_daily_total',
+    'get_total_between',
+    'get_daily_totals_between',
+    'get_study_streak',
+    'get_streak_and_today_total',
+    'get_study_window_aggregates',
+    'get_hourly_totals_between',
+    'resolve_session_times',
+    'rebuild_daily_totals',
+    'parse_subject_credits',
+    'apply_subject_grade_change',
+    'get_user_grade_summary',
+    'get_semester_grade_summaries',
+    'seed_grade_points',
+    'query_gpa_by_semester',
+    'rebuild_grade_totals',
+    'queue_post_like',
+    'get_pending_like_delta',
+    'apply_pending_likes',
+    'flush_write_behind',
+    'stop_write_behind',
+    'get_write_behind_metrics',
+    'get_daily_memo_note',
+    'save_daily_memo',
+    'get_memos_between',
+    'build_weekly_memo_digest',
+    'migrate_memo_blobs',
+    'increment_post_counter',
+    'with_feed_options',
+    'serialize_posts',
+    'get_feed_page',
+    'reconcile_post_counters',
     'load_holidays',
     'load_academic_schedule',
     'initialize_system_categories',
     'initialize_system_events',
-    'create_default_categories_for_user'
+    'sync_system_events',
+    'sync_system_events_job',
+    'create_default_categories_for_user',
+    'event_overlap_filter',
+    'expand_occurrence_dates',
+    'serialize_events',
+    'serialize_event_occurrences',
+    'bump_system_events_version',
+    'get_system_event_dicts',
+    'backfill_event_spans'
 ]
@@ -0,0 +1,112 @@
+"""
+학사일정 인덱스 서비스
+Calendar.csv를 한 번만 파싱하여 변경 불가능한 인덱스로 보관하고, 파일이 바뀐 경우(mtime)에만 다시 읽습니다.
+mtime은 ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS마다 한 번만 확인하며, 학기 개강일 조회는 O(1)입니다.
+"""
+import csv
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import date
+from types import MappingProxyType
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+CALENDAR_PATH = os.path.join(BASE_DIR, 'schedules', 'Calendar.csv')
+# 파일 변경(mtime) 확인 간격 - 그 사이의 조회는 stat 호출 없이 캐시된 인덱스를 반환
+ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS = 10
+
+# 학사일정 한 건 (단일 날짜 일정은 end_date가 None)
+AcademicCalendarEntry = namedtuple('AcademicCalendarEntry', ['start_date', 'end_date', 'title'])
+
+
+def _parse_day_range(day_str):
+    """일(day) 칸을 (시작일, 종료일)로 변환 (예: "4" -> (4, None), "4~21" -> (4, 21))"""
+    day_str = day_str.strip()
+    if '~' in day_str:
+        start_day, end_day = day_str.split('~')
+        return int(start_day.strip()), int(end_day.strip())
+    return int(day_str), None
+
+
+class AcademicCalendarIndex:
+    """파싱된 학사일정 (생성 후 변경하지 않으므로 여러 스레드에서 락 없이 읽을 수 있음)"""
+
+    def __init__(self, entries):
+        self.entries = tuple(sorted(entries, key=lambda e: (e.start_date, e.title)))
+
+        # {"YYYY-MM": 개강일} - 같은 달에 개강 일정이 여러 개면 가장 이른 날짜
+        semester_starts = {}
+        for entry in self.entries:
+            if "개강" in entry.title:
+                month_key = f"{entry.start_date.year}-{entry.start_date.month:02d}"
+                if month_key not in semester_starts or entry.start_date < semester_starts[month_key]:
+                    semester_starts[month_key] = entry.start_date
+        self.semester_starts = MappingProxyType(semester_starts)
+
+    def get_semester_start(self, month_key):
+        """개강일 조회 (month_key 예: "2025-03", 없으면 None)"""
+        return self.semester_starts.get(month_key)
+
+
+def parse_academic_calendar(path=CALENDAR_PATH):
+    """학사일정 CSV를 AcademicCalendarIndex로 파싱 (파일을 열 수 없으면 예외 발생, 잘못된 행은 건너뜀)"""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 4:
+                continue
+            year, month, day, event_name = row[0:4]
+            try:
+                start_day, end_day = _parse_day_range(day)
+                start_date = date(int(year), int(month), start_day)
+                end_date = date(int(year), int(month), end_day) if end_day else None
+            except ValueError as ve:
+                print(f"Error parsing date in row {row}: {ve}")
+                continue
+            entries.append(AcademicCalendarEntry(start_date, end_date, event_name.strip()))
+    return AcademicCalendarIndex(entries)
+
+
+# 현재 학사일정 인덱스 (재로드 시 통째로 교체하므로 읽는 쪽은 락이 필요 없음)
+_academic_calendar = {'mtime': None, 'checked_at': 0.0, 'index': None}
+_academic_calendar_lock = threading.Lock()
+
+
+def _get_calendar_mtime():
+    try:
+        return os.path.getmtime(CALENDAR_PATH)
+    except OSError:
+        return None
+
+
+def get_academic_calendar():
+    """최신 학사일정 인덱스 반환 (확인 간격이 지난 뒤 파일이 바뀐 경우에만 다시 파싱)"""
+    global _academic_calendar
+
+    cache = _academic_calendar
+    if cache['index'] is not None and time.monotonic() - cache['checked_at'] < ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS:
+        return cache['index']
+
+    with _academic_calendar_lock:
+        cache = _academic_calendar
+        now = time.monotonic()
+        if cache['index'] is not None and now - cache['checked_at'] < ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS:
+            return cache['index']
+        mtime = _get_calendar_mtime()
+        if cache['index'] is not None and cache['mtime'] == mtime:
+            _academic_calendar = {'mtime': mtime, 'checked_at': now, 'index': cache['index']}
+            return cache['index']
+        try:
+            index = parse_academic_calendar(CALENDAR_PATH)
+        except Exception as e:
+            # 파일을 쓰는 중이거나 없는 경우: 이전 인덱스 유지 후 다음 확인 때 재시도
+            print(f"Error loading academic calendar: {e}")
+            _academic_calendar = {
+                'mtime': cache['mtime'],
+                'checked_at': now,
+                'index': cache['index'] if cache['index'] is not None else AcademicCalendarIndex([])
+            }
+            return _academic_calendar['index']
+        _academic_calendar = {'mtime': mtime, 'checked_at': now, 'index': index}
+        return index
@@ -1,12 +1,20 @@
 """
 셔틀버스 스케줄 서비스
+CSV 로드, 노선/운행일/노선그룹별 출발 시각 인덱스 구성 및 다음 출발편 조회
 """
 import csv
 import os
+from bisect import bisect_right
+from heapq import merge
+from .calendar_service import load_holidays
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 BUS_TIME_PATH = os.path.join(BASE_DIR, 'schedules', 'bus_time.csv')
 
+SHUTTLE_DAY_TYPES = ('평일', '일요일')
+SHUTTLE_NEXT_DEFAULT_LIMIT = 3
+SHUTTLE_NEXT_MAX_LIMIT = 10
+
 def load_bus_schedule():
     """셔틀버스 스케줄 CSV 파일 로드 및 파싱"""
     schedule = []
@@ -40,6 +48,7 @@ def load_bus_schedule():
 
                 schedule.append({
                     "time": row.get('Departure_Time'),
+                    "route_code": route,
                     "route": route_kr,
                     "type": type_kr,
                     "note": note,
@@ -49,3 +58,72 @@ def load_bus_schedule():
     except Exception as e:
         print(f"Error loading bus schedule: {e}")
         return []
+
+
+def _time_to_minutes(time_str):
+    """'HH:MM' 문자열을 자정 기준 분(minute-of-day)으로 변환"""
+    hour, minute = time_str.split(':')
+    return int(hour) * 60 + int(minute)
+
+def build_shuttle_index(schedule):
+    """
+    셔틀 스케줄을 {(노선 코드, 운행일 종류): {노선 그룹: (정렬된 출발 분 리스트, 출발편 리스트)}}로 인덱싱
+    운행일 종류가 '기타'인 출발편은 평일/일요일 양쪽에 포함합니다.
+    공휴일 날짜 집합도 함께 담아 운행일 판단에 사용합니다.
+    """
+    grouped = {}
+    for entry in schedule:
+        try:
+            minutes = _time_to_minutes(entry['time'])
+        except (AttributeError, ValueError):
+            continue
+        day_types = [entry['type']] if entry['type'] in SHUTTLE_DAY_TYPES else list(SHUTTLE_DAY_TYPES)
+        for day_type in day_types:
+            key = (entry['route_code'], day_type)
+            grouped.setdefault(key, {}).setdefault(entry['route_group'], []).append((minutes, entry))
+
+    routes = {}
+    for key, groups in grouped.items():
+        routes[key] = {}
+        for route_group, departures in groups.items():
+            departures.sort(key=lambda item: item[0])
+            routes[key][route_group] = ([minutes for minutes, _ in departures], [entry for _, entry in departures])
+
+    holidays = {(h['year'], h['month'], h['day']) for h in load_holidays()}
+    route_codes = {route_code for route_code, _ in routes}
+    return {'routes': routes, 'route_codes': route_codes, 'holidays': holidays}
+
+def get_shuttle_day_type(shuttle_index, date_obj):
+    """일요일 또는 공휴일이면 '일요일', 그 외에는 '평일' 시간표"""
+    if date_obj.weekday() == 6 or (date_obj.year, date_obj.month, date_obj.day) in shuttle_index['holidays']:
+        return '일요일'
+    return '평일'
+
+def get_next_departures(shuttle_index, route_code, now, limit=SHUTTLE_NEXT_DEFAULT_LIMIT, route_group=None):
+    """
+    now(KST datetime) 이후 route_code 노선의 다음 출발편 최대 limit개
+    노선 그룹별 정렬 리스트에서 bisect로 시작 위치를 찾고, 그룹이 여러 개면 정렬 병합합니다.
+    """
+    day_type = get_shuttle_day_type(shuttle_index, now.date())
+    now_minutes = now.hour * 60 + now.minute
+
+    candidates = []
+    for group, (minutes_list, entries) in shuttle_index['routes'].get((route_code, day_type), {}).items():
+        if route_group and group != route_group:
+            continue
+        start = bisect_right(minutes_list, now_minutes)
+        end = start + limit
+        candidates.append(list(zip(minutes_list[start:end], entries[start:end])))
+
+    departures = []
+    for minutes, entry in merge(*candidates, key=lambda item: item[0]):
+        if len(departures) >= limit:
+            break
+        departures.append({
+            "time": entry['time'],
+            "route": entry['route'],
+            "route_group": entry['route_group'],
+            "note": entry['note'],
+            "minutes_until": minutes - now_minutes
+        })
+    return day_type, departures
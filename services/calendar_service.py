@@ -4,12 +4,32 @@
 """
 import csv
 import os
-from datetime import date, datetime
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from .academic_calendar_service import CALENDAR_PATH, get_academic_calendar
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-CALENDAR_PATH = os.path.join(BASE_DIR, 'schedules', 'Calendar.csv')
 HOLIDAYS_PATH = os.path.join(BASE_DIR, 'schedules', 'holidays.csv')
 
+RECURRENCE_TYPES = ('daily', 'weekly', 'monthly', 'yearly')
+# 한 번의 조회 범위에서 반복 일정 하나가 만들 수 있는 최대 발생 수
+MAX_OCCURRENCES_PER_WINDOW = 1000
+# span_end_date 백필 시 한 번에 처리할 이벤트 수
+SPAN_BACKFILL_BATCH_SIZE = 1000
+# 다른 프로세스(CLI 등)에서 시스템 이벤트를 바꾼 경우를 대비한 캐시 최대 유지 시간
+SYSTEM_EVENT_CACHE_TTL_SECONDS = 600
+# 시스템 이벤트 캐시에 보관할 최대 월 수 (가장 오래 조회되지 않은 달부터 제거)
+SYSTEM_EVENT_CACHE_MAX_MONTHS = 36
+
+# 시스템 이벤트(학사일정/공휴일) 직렬화 결과 캐시: {(년, 월): [(발생 시작일, 발생 마지막 날, dict)]}
+# initialize_system_events가 버전을 올리면 다음 조회 때 비워짐
+# 버전, 캐시 교체, 월 조회/추가/제거는 모두 _system_event_cache_lock 안에서 수행
+_system_events_version = 0
+_system_event_cache = {'version': None, 'loaded_at': 0.0, 'months': OrderedDict()}
+_system_event_cache_lock = threading.Lock()
+
 
 def load_holidays():
     """공휴일 CSV 파일 로드"""
@@ -31,48 +51,18 @@ def load_holidays():
 
 
 def load_academic_schedule():
-    """학사일정 CSV 파일 로드"""
-    schedules = []
-    try:
-        with open(CALENDAR_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) >= 4:
-                    year, month, day, event_name = row[0:4]
-                    try:
-                        # 날짜 범위 파싱 (예: "3,4~21" -> "4~21")
-                        day_str = day.strip()
-
-                        # 기간이 있는 경우 (예: "4~21", "1~3")
-                        if '~' in day_str:
-                            start_day, end_day = day_str.split('~')
-                            start_day = int(start_day.strip())
-                            end_day = int(end_day.strip())
-
-                            schedules.append({
-                                'year': int(year),
-                                'month': int(month),
-                                'start_day': start_day,
-                                'end_day': end_day,
-                                'title': event_name.strip(),
-                                'is_range': True
-                            })
-                        else:
-                            # 단일 날짜
-                            schedules.append({
-                                'year': int(year),
-                                'month': int(month),
-                                'start_day': int(day_str),
-                                'end_day': None,
-                                'title': event_name.strip(),
-                                'is_range': False
-                            })
-                    except ValueError as ve:
-                        print(f"Error parsing date in row {row}: {ve}")
-                        continue
-    except Exception as e:
-        print(f"Error loading academic schedule: {e}")
-    return schedules
+    """학사일정 목록 (기간 일정은 is_range=True, end_day 포함)"""
+    return [
+        {
+            'year': entry.start_date.year,
+            'month': entry.start_date.month,
+            'start_day': entry.start_date.day,
+            'end_day': entry.end_date.day if entry.end_date else None,
+            'title': entry.title,
+            'is_range': entry.end_date is not None
+        }
+        for entry in get_academic_calendar().entries
+    ]
 
 
 def initialize_system_categories():
@@ -120,77 +110,133 @@ def initialize_system_categories():
         return None, None
 
 
-def initialize_system_events():
-    """시스템 이벤트 초기화 (학사일정, 공휴일)"""
-    from models import db, CalendarCategory, CalendarEvent
+def _build_system_event_rows(academic_category_id, holiday_category_id):
+    """CSV(학사일정, 공휴일)를 시스템 이벤트 행으로 변환 {(category_id, title, start_date): end_date}"""
+    rows = {}
 
-    try:
-        # 카테고리 가져오기
-        academic_category = CalendarCategory.query.filter_by(
-            name='학사일정',
-            is_system=True
-        ).first()
+    for entry in get_academic_calendar().entries:
+        rows[(academic_category_id, entry.title, entry.start_date)] = entry.end_date
 
-        holiday_category = CalendarCategory.query.filter_by(
-            name='공휴일',
-            is_system=True
-        ).first()
+    for holiday in load_holidays():
+        try:
+            holiday_date = date(holiday['year'], holiday['month'], holiday['day'])
+        except ValueError as e:
+            print(f"Error creating holiday event: {e}")
+            continue
+        rows[(holiday_category_id, holiday['name'], holiday_date)] = None
 
-        if not academic_category or not holiday_category:
-            print("System categories not found. Please initialize categories first.")
-            return
-
-        # 기존 시스템 이벤트 삭제 (업데이트를 위해)
-        CalendarEvent.query.filter_by(is_system=True).delete()
-
-        # 학사일정 로드
-        academic_schedules = load_academic_schedule()
-        for schedule in academic_schedules:
-            try:
-                start_date = date(schedule['year'], schedule['month'], schedule['start_day'])
-                end_date = None
-
-                if schedule['is_range'] and schedule['end_day']:
-                    end_date = date(schedule['year'], schedule['month'], schedule['end_day'])
-
-                event = CalendarEvent(
-                    user_id=None,
-                    category_id=academic_category.id,
-                    title=schedule['title'],
-                    start_date=start_date,
-                    end_date=end_date,
-                    all_day=True,
-                    is_system=True
-                )
-                db.session.add(event)
-            except Exception as e:
-                print(f"Error creating academic event: {e}")
-                continue
+    return rows
 
-        # 공휴일 로드
-        holidays = load_holidays()
-        for holiday in holidays:
-            try:
-                holiday_date = date(holiday['year'], holiday['month'], holiday['day'])
-
-                event = CalendarEvent(
-                    user_id=None,
-                    category_id=holiday_category.id,
-                    title=holiday['name'],
-                    start_date=holiday_date,
-                    all_day=True,
-                    is_system=True
-                )
-                db.session.add(event)
-            except Exception as e:
-                print(f"Error creating holiday event: {e}")
-                continue
 
+def sync_system_events():
+    """
+    CSV와 DB의 시스템 이벤트를 비교하여 바뀐 행만 반영 (추가/수정/삭제)
+    (카테고리, 제목, 시작일)을 행의 키로, 종료일을 내용으로 비교하며 변경은 일괄 INSERT/UPDATE/DELETE로 처리합니다.
+    변경된 행이 없으면 DB와 캐시를 건드리지 않습니다. 반환: (추가 수, 수정 수, 삭제 수) 또는 실패 시 None
+    """
+    from models import db, CalendarCategory, CalendarEvent
+    from models.calendar import compute_span_end_date
+    from sqlalchemy import insert, update
+
+    try:
+        academic_category = CalendarCategory.query.filter_by(name='학사일정', is_system=True).first()
+        holiday_category = CalendarCategory.query.filter_by(name='공휴일', is_system=True).first()
+        if not academic_category or not holiday_category:
+            print("System categories not found. Please initialize categories first.")
+            return None
+
+        desired = _build_system_event_rows(academic_category.id, holiday_category.id)
+
+        existing = {}
+        duplicate_ids = []
+        for row in db.session.query(
+            CalendarEvent.id, CalendarEvent.category_id, CalendarEvent.title,
+            CalendarEvent.start_date, CalendarEvent.end_date
+        ).filter(CalendarEvent.is_system == True).all():
+            key = (row.category_id, row.title, row.start_date)
+            if key in existing:
+                duplicate_ids.append(row.id)
+            else:
+                existing[key] = (row.id, row.end_date)
+
+        inserts = [
+            {
+                'user_id': None,
+                'category_id': category_id,
+                'title': title,
+                'start_date': start_date,
+                'end_date': end_date,
+                'span_end_date': compute_span_end_date(start_date, end_date, None, None),
+                'all_day': True,
+                'is_system': True
+            }
+            for (category_id, title, start_date), end_date in desired.items()
+            if (category_id, title, start_date) not in existing
+        ]
+        updates = [
+            {
+                'id': event_id,
+                'end_date': desired[key],
+                'span_end_date': compute_span_end_date(key[2], desired[key], None, None)
+            }
+            for key, (event_id, end_date) in existing.items()
+            if key in desired and desired[key] != end_date
+        ]
+        delete_ids = duplicate_ids + [event_id for key, (event_id, _) in existing.items() if key not in desired]
+
+        if inserts:
+            db.session.execute(insert(CalendarEvent), inserts)
+        if updates:
+            db.session.execute(update(CalendarEvent), updates)
+        if delete_ids:
+            CalendarEvent.query.filter(CalendarEvent.id.in_(delete_ids)).delete(synchronize_session=False)
         db.session.commit()
-        print("System events initialized successfully.")
+
+        if inserts or updates or delete_ids:
+            bump_system_events_version()
+        return len(inserts), len(updates), len(delete_ids)
     except Exception as e:
         db.session.rollback()
-        print(f"Error initializing system events: {e}")
+        print(f"Error syncing system events: {e}")
+        return None
+
+
+def initialize_system_events():
+    """시스템 이벤트 초기화 (학사일정, 공휴일) - CSV와 달라진 행만 반영"""
+    result = sync_system_events()
+    if result is not None:
+        inserted, updated, deleted = result
+        print(f"System events initialized successfully. (+{inserted} ~{updated} -{deleted})")
+
+
+def _get_calendar_csv_mtimes():
+    """학사일정/공휴일 CSV 파일의 수정 시각"""
+    mtimes = []
+    for path in (CALENDAR_PATH, HOLIDAYS_PATH):
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+_last_synced_csv_mtimes = None
+
+
+def sync_system_events_job(app):
+    """스케줄러 작업: CSV 파일이 바뀐 경우에만 시스템 이벤트 동기화"""
+    global _last_synced_csv_mtimes
+
+    mtimes = _get_calendar_csv_mtimes()
+    if mtimes == _last_synced_csv_mtimes:
+        return
+
+    with app.app_context():
+        result = sync_system_events()
+    if result is not None:
+        _last_synced_csv_mtimes = mtimes
+        inserted, updated, deleted = result
+        print(f"[{datetime.now()}] System events synced. (+{inserted} ~{updated} -{deleted})")
 
 
 def create_default_categories_for_user(user_id):
@@ -224,3 +270,271 @@ def create_default_categories_for_user(user_id):
     except Exception as e:
         db.session.rollback()
         print(f"Error creating default categories for user {user_id}: {e}")
+
+
+def event_overlap_filter(window_start=None, window_end=None):
+    """
+    [window_start, window_end]와 겹치는 이벤트 조건 (캘린더/오늘 일정 공용)
+    start_date <= window_end AND span_end_date >= window_start
+    span_end_date는 단일 일정이면 coalesce(end_date, start_date)와 같고, 반복 일정이면 마지막 발생까지 포함합니다.
+    PostgreSQL에서 양쪽 범위가 모두 있으면 GiST 인덱스를 타는 daterange 겹침(&&) 연산을 사용합니다.
+    """
+    from models import db, CalendarEvent
+    from sqlalchemy import and_, func, literal_column
+
+    if window_start and window_end and db.session.get_bind().dialect.name == 'postgresql':
+        # 인덱스 식과 똑같아야 하므로 '[]'는 바인드 파라미터가 아닌 리터럴로 둠
+        bounds = literal_column("'[]'")
+        event_range = func.daterange(CalendarEvent.start_date, CalendarEvent.span_end_date, bounds)
+        return event_range.op('&&')(func.daterange(window_start, window_end, bounds))
+
+    conditions = []
+    if window_end:
+        conditions.append(CalendarEvent.start_date <= window_end)
+    if window_start:
+        conditions.append(CalendarEvent.span_end_date >= window_start)
+    return and_(*conditions)
+
+
+def _add_months(date_obj, months):
+    """date_obj에서 months개월 뒤의 같은 날짜 (해당 월에 그 날짜가 없으면 None)"""
+    month_index = date_obj.month - 1 + months
+    try:
+        return date(date_obj.year + month_index // 12, month_index % 12 + 1, date_obj.day)
+    except ValueError:
+        return None
+
+
+def expand_occurrence_dates(start_date, end_date, recurrence_type, recurrence_interval,
+                            recurrence_end_date, window_start, window_end):
+    """
+    [window_start, window_end]와 겹치는 발생(occurrence)의 시작일 목록
+    - 일/주 단위: 창 이전의 반복 횟수를 나눗셈으로 건너뛰고 창 안에서만 순회
+    - 월/년 단위: 개월 수 차이로 첫 후보를 계산 (해당 월에 같은 날짜가 없으면 그 회차는 건너뜀)
+    여러 날에 걸친 일정은 창 시작 전에 시작했더라도 창과 겹치면 포함합니다.
+    """
+    duration = max((end_date or start_date) - start_date, timedelta(0))
+    if recurrence_type not in RECURRENCE_TYPES:
+        if start_date <= window_end and start_date + duration >= window_start:
+            return [start_date]
+        return []
+
+    interval = max(1, int(recurrence_interval or 1))
+    # 이 날짜보다 먼저 시작한 발생은 창에 닿지 않음
+    first_start = window_start - duration
+    last_start = min(window_end, recurrence_end_date) if recurrence_end_date else window_end
+    if last_start < start_date:
+        return []
+
+    occurrences = []
+    if recurrence_type in ('daily', 'weekly'):
+        step_days = interval * (1 if recurrence_type == 'daily' else 7)
+        skip = max(0, -(-(first_start - start_date).days // step_days))  # 올림 나눗셈
+        occurrence = start_date + timedelta(days=skip * step_days)
+        step = timedelta(days=step_days)
+        while occurrence <= last_start and len(occurrences) < MAX_OCCURRENCES_PER_WINDOW:
+            occurrences.append(occurrence)
+            occurrence += step
+        return occurrences
+
+    step_months = interval * (1 if recurrence_type == 'monthly' else 12)
+    months_to_first = (first_start.year - start_date.year) * 12 + first_start.month - start_date.month
+    count = max(0, months_to_first // step_months)
+    while len(occurrences) < MAX_OCCURRENCES_PER_WINDOW:
+        month_index = start_date.month - 1 + count * step_months
+        year, month = start_date.year + month_index // 12, month_index % 12 + 1
+        if year > last_start.year or (year == last_start.year and month > last_start.month):
+            break
+        occurrence = _add_months(start_date, count * step_months)
+        count += 1
+        if occurrence is None or occurrence < first_start or occurrence > last_start:
+            continue
+        occurrences.append(occurrence)
+    return occurrences
+
+
+def _shift_event_dict(event_dict, start_date, occurrence_date):
+    """to_dict() 결과를 occurrence_date에 시작하는 발생으로 이동한 복사본"""
+    delta = occurrence_date - start_date
+    shifted = dict(event_dict)
+    # 'start'/'end'는 'YYYY-MM-DD' 또는 'YYYY-MM-DDTHH:MM:SS' 형식
+    shifted['start'] = occurrence_date.isoformat() + event_dict['start'][10:]
+    if 'end' in event_dict:
+        end_day = date.fromisoformat(event_dict['end'][:10]) + delta
+        shifted['end'] = end_day.isoformat() + event_dict['end'][10:]
+    # 편집 폼은 반복 전체(원본)의 시작/종료를 보여주도록 원본 값을 함께 전달
+    shifted['extendedProps'] = dict(
+        event_dict['extendedProps'],
+        occurrence_date=occurrence_date.isoformat(),
+        series_start=event_dict['start'],
+        series_end=event_dict.get('end')
+    )
+    # 드래그로 옮기면 반복 전체의 시작일이 바뀌므로 개별 발생은 이동 불가
+    shifted['startEditable'] = False
+    shifted['durationEditable'] = False
+    return shifted
+
+
+def _load_categories_for(events):
+    """이벤트들의 카테고리를 한 번의 쿼리로 조회 {category_id: CalendarCategory}"""
+    from models import CalendarCategory
+
+    category_ids = {event.category_id for event in events}
+    if not category_ids:
+        return {}
+    categories = CalendarCategory.query.filter(CalendarCategory.id.in_(category_ids)).all()
+    return {category.id: category for category in categories}
+
+
+def serialize_events(events):
+    """이벤트 목록을 FullCalendar dict 목록으로 일괄 직렬화 (카테고리는 한 번만 조회)"""
+    categories = _load_categories_for(events)
+    return [event.to_dict(category=categories.get(event.category_id)) for event in events]
+
+
+def serialize_event_occurrences(events, window_start, window_end):
+    """이벤트 목록을 범위 안의 발생별 FullCalendar dict 목록으로 일괄 직렬화"""
+    categories = _load_categories_for(events)
+    event_dicts = []
+    for event in events:
+        event_dict = event.to_dict(category=categories.get(event.category_id))
+        for _, _, occurrence_dict in _event_occurrence_entries(event, window_start, window_end, event_dict):
+            event_dicts.append(occurrence_dict)
+    return event_dicts
+
+
+def _event_occurrence_entries(event, window_start, window_end, event_dict=None):
+    """범위 안의 발생별 (시작일, 마지막 날, FullCalendar dict) 목록"""
+    if event_dict is None:
+        event_dict = event.to_dict()
+    duration = max((event.end_date or event.start_date) - event.start_date, timedelta(0))
+    if event.recurrence_type not in RECURRENCE_TYPES:
+        return [(event.start_date, event.start_date + duration, event_dict)]
+
+    occurrence_dates = expand_occurrence_dates(
+        event.start_date, event.end_date, event.recurrence_type, event.recurrence_interval,
+        event.recurrence_end_date, window_start, window_end
+    )
+    return [
+        (occurrence, occurrence + duration, _shift_event_dict(event_dict, event.start_date, occurrence))
+        for occurrence in occurrence_dates
+    ]
+
+
+def bump_system_events_version():
+    """시스템 이벤트가 바뀌었음을 알려 프로세스 캐시를 무효화"""
+    global _system_events_version
+    with _system_event_cache_lock:
+        _system_events_version += 1
+
+
+def _month_range(year, month):
+    """해당 월의 첫날과 마지막 날"""
+    first_day = date(year, month, 1)
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return first_day, next_month - timedelta(days=1)
+
+
+def _load_system_event_month(year, month):
+    """한 달과 겹치는 시스템 이벤트를 조회하여 발생별로 직렬화"""
+    from models import CalendarEvent
+
+    month_start, month_end = _month_range(year, month)
+    events = CalendarEvent.query.filter(
+        CalendarEvent.is_system == True,
+        event_overlap_filter(month_start, month_end)
+    ).all()
+
+    categories = _load_categories_for(events)
+    entries = []
+    for event in events:
+        event_dict = event.to_dict(category=categories.get(event.category_id))
+        entries.extend(_event_occurrence_entries(event, month_start, month_end, event_dict))
+    return entries
+
+
+def _get_system_event_month(year, month):
+    """
+    한 달의 시스템 이벤트 항목 (캐시에 없으면 DB에서 읽어 캐시에 추가)
+    DB 조회는 락 밖에서 하고, 조회하는 동안 버전이 바뀌었으면 오래된 결과일 수 있으므로 캐시에 넣지 않습니다.
+    """
+    global _system_event_cache
+
+    key = (year, month)
+    with _system_event_cache_lock:
+        cache = _system_event_cache
+        now = time.monotonic()
+        if cache['version'] != _system_events_version or now - cache['loaded_at'] > SYSTEM_EVENT_CACHE_TTL_SECONDS:
+            cache = {'version': _system_events_version, 'loaded_at': now, 'months': OrderedDict()}
+            _system_event_cache = cache
+        entries = cache['months'].get(key)
+        if entries is not None:
+            cache['months'].move_to_end(key)
+            return entries
+        version = cache['version']
+
+    entries = _load_system_event_month(year, month)
+
+    with _system_event_cache_lock:
+        cache = _system_event_cache
+        if cache['version'] == version == _system_events_version:
+            months = cache['months']
+            months[key] = entries
+            while len(months) > SYSTEM_EVENT_CACHE_MAX_MONTHS:
+                months.popitem(last=False)
+    return entries
+
+
+def get_system_event_dicts(window_start, window_end):
+    """
+    범위와 겹치는 시스템 이벤트의 FullCalendar dict 목록 (프로세스 캐시 사용)
+    월 단위로 캐시하며, 캐시에 없는 달만 DB에서 읽습니다. 반환된 dict는 공유되므로 수정하지 마세요.
+    """
+    result = []
+    seen = set()
+    year, month = window_start.year, window_start.month
+    while (year, month) <= (window_end.year, window_end.month):
+        entries = _get_system_event_month(year, month)
+
+        for occurrence_start, occurrence_end, event_dict in entries:
+            # 여러 달에 걸친 이벤트는 각 달 버킷에 모두 들어 있으므로 한 번만 포함
+            key = (event_dict['id'], occurrence_start)
+            if key in seen or occurrence_start > window_end or occurrence_end < window_start:
+                continue
+            seen.add(key)
+            result.append(event_dict)
+
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return result
+
+
+def backfill_event_spans():
+    """span_end_date가 비어 있는 기존 이벤트를 배치로 채움. 갱신한 이벤트 수 반환"""
+    from models import db, CalendarEvent
+    from models.calendar import compute_span_end_date
+    from sqlalchemy import update
+
+    updated_count = 0
+    while True:
+        rows = db.session.query(
+            CalendarEvent.id,
+            CalendarEvent.start_date,
+            CalendarEvent.end_date,
+            CalendarEvent.recurrence_type,
+            CalendarEvent.recurrence_end_date
+        ).filter(CalendarEvent.span_end_date == None).limit(SPAN_BACKFILL_BATCH_SIZE).all()
+        if not rows:
+            break
+
+        db.session.execute(update(CalendarEvent), [
+            {
+                'id': row.id,
+                'span_end_date': compute_span_end_date(
+                    row.start_date, row.end_date, row.recurrence_type, row.recurrence_end_date
+                )
+            }
+            for row in rows
+        ])
+        db.session.commit()
+        updated_count += len(rows)
+    return updated_count
@@ -0,0 +1,97 @@
+"""
+커뮤니티 서비스
+게시물 좋아요/댓글 카운터 관리 및 피드 직렬화
+"""
+from datetime import datetime
+from sqlalchemy import func, select, or_, and_, desc
+from sqlalchemy.orm import joinedload
+from utils.constants import COMMUNITY_PAGE_SIZE, COMMUNITY_MAX_PAGE_SIZE
+
+
+def increment_post_counter(post_id, column_name, amount=1):
+    """posts 테이블의 카운터 컬럼(like_count/comment_count)을 원자적으로 증감 (commit은 호출자가 수행)"""
+    from models import Post
+
+    column = getattr(Post, column_name)
+    Post.query.filter_by(id=post_id).update({column: column + amount}, synchronize_session=False)
+
+
+def with_feed_options(query):
+    """피드 렌더링에 필요한 작성자 정보를 JOIN으로 함께 로드"""
+    from models import Post
+
+    return query.options(joinedload(Post.author))
+
+
+def serialize_posts(posts, include_content=False):
+    """
+    게시물 목록을 한 번에 직렬화
+    카운터는 posts 컬럼에서, 작성자는 eager load된 관계에서 읽으므로 행마다 추가 쿼리가 없습니다.
+    """
+    return [post.to_dict(include_content=include_content) for post in posts]
+
+
+def encode_feed_cursor(post):
+    """게시물의 (created_at, id)를 커서 문자열로 변환"""
+    return f"{post.created_at.isoformat()}|{post.id}"
+
+
+def decode_feed_cursor(cursor):
+    """커서 문자열을 (created_at, id)로 변환 (형식 오류 시 ValueError)"""
+    created_at_str, post_id_str = cursor.rsplit('|', 1)
+    return datetime.fromisoformat(created_at_str), int(post_id_str)
+
+
+def get_feed_page(category=None, cursor=None, limit=COMMUNITY_PAGE_SIZE):
+    """
+    커뮤니티 피드 한 페이지 조회 (created_at, id 내림차순 키셋 페이지네이션)
+    반환: (게시물 리스트, 다음 페이지 커서 또는 None)
+    """
+    from models import Post
+
+    limit = max(1, min(limit, COMMUNITY_MAX_PAGE_SIZE))
+    now_utc = datetime.utcnow()
+
+    # 승인되고, 노출 가능하며, 만료되지 않은 게시물
+    query = Post.query.filter(
+        Post.is_approved == True,
+        Post.is_visible == True,
+        or_(Post.expires_at == None, Post.expires_at > now_utc)
+    )
+    if category:
+        query = query.filter(Post.category == category)
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_feed_cursor(cursor)
+        query = query.filter(or_(
+            Post.created_at < cursor_created_at,
+            and_(Post.created_at == cursor_created_at, Post.id < cursor_id)
+        ))
+
+    # 다음 페이지 존재 여부 확인을 위해 한 개 더 조회
+    posts = with_feed_options(query).order_by(desc(Post.created_at), desc(Post.id)).limit(limit + 1).all()
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_feed_cursor(posts[-1])
+    return posts, next_cursor
+
+
+def reconcile_post_counters(post_ids=None):
+    """실제 좋아요/댓글 수와 다른 카운터를 바로잡고, 수정된 게시물 수를 반환"""
+    from models import db, Post, PostLike, Comment
+
+    like_count_sq = select(func.count(PostLike.id)).where(PostLike.post_id == Post.id).scalar_subquery()
+    comment_count_sq = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+
+    stmt = Post.__table__.update().where(
+        or_(Post.like_count != like_count_sq, Post.comment_count != comment_count_sq)
+    ).values(like_count=like_count_sq, comment_count=comment_count_sq)
+    if post_ids is not None:
+        if not post_ids:
+            return 0
+        stmt = stmt.where(Post.id.in_(post_ids))
+
+    result = db.session.execute(stmt)
+    db.session.commit()
+    return result.rowcount
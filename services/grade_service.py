@@ -0,0 +1,215 @@
+"""
+성적 집계 서비스
+과목의 학점/성적이 바뀔 때 학기별·사용자별 집계(semester_grade_totals, user_grade_totals)를 갱신하고,
+GPA/이수 학점 조회는 집계 행만 읽습니다.
+"""
+from sqlalchemy import case, func, select
+from utils.constants import GRADE_MAP
+from utils.helpers import get_upsert_insert
+
+# 집계에는 평점을 10배한 정수로 저장 (GRADE_MAP의 평점은 0.5 단위)
+GRADE_POINT_SCALE = 10
+
+
+def parse_subject_credits(value):
+    """과목 학점 입력값을 0 이상의 정수로 변환 (정수 또는 "3" 같은 숫자 문자열만 허용, 그 외에는 ValueError)"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"학점은 정수여야 합니다: {value!r}")
+    try:
+        credits = int(value)
+    except ValueError:
+        raise ValueError(f"학점은 정수여야 합니다: {value!r}")
+    if credits < 0:
+        raise ValueError(f"학점은 0 이상이어야 합니다: {credits}")
+    return credits
+
+
+def subject_grade_contribution(credits, grade):
+    """과목 하나가 집계에 더하는 값 (graded_credits, grade_point_tenths, earned_credits)"""
+    credits = int(credits or 0)
+    grade_score = GRADE_MAP.get(grade)
+    if grade_score is None:  # 'Not Set' 등은 평점 계산에서 제외
+        return 0, 0, credits
+    return credits, int(round(grade_score * GRADE_POINT_SCALE)) * credits, credits
+
+
+def _upsert_grade_total(model, key_values, graded_credits, grade_point_tenths, earned_credits):
+    """집계 행에 변화량을 원자적으로 더함 (없으면 생성)"""
+    from models import db
+
+    insert = get_upsert_insert(db.session)
+    if insert is not None:
+        stmt = insert(model).values(
+            graded_credits=graded_credits,
+            grade_point_tenths=grade_point_tenths,
+            earned_credits=earned_credits,
+            **key_values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(model.__table__.primary_key.columns),
+            set_={
+                'graded_credits': model.graded_credits + stmt.excluded.graded_credits,
+                'grade_point_tenths': model.grade_point_tenths + stmt.excluded.grade_point_tenths,
+                'earned_credits': model.earned_credits + stmt.excluded.earned_credits
+            }
+        )
+        db.session.execute(stmt)
+        return
+
+    # 기타 DB: UPDATE 후 갱신된 행이 없으면 INSERT
+    updated = model.query.filter_by(**key_values).update({
+        model.graded_credits: model.graded_credits + graded_credits,
+        model.grade_point_tenths: model.grade_point_tenths + grade_point_tenths,
+        model.earned_credits: model.earned_credits + earned_credits
+    }, synchronize_session=False)
+    if not updated:
+        db.session.add(model(
+            graded_credits=graded_credits,
+            grade_point_tenths=grade_point_tenths,
+            earned_credits=earned_credits,
+            **key_values
+        ))
+
+
+def apply_subject_grade_change(user_id, semester_id, old=None, new=None):
+    """
+    과목 추가/수정/삭제를 집계에 반영 (commit은 호출자가 수행)
+    old/new: 변경 전/후의 (credits, grade) - 추가는 old=None, 삭제는 new=None
+    """
+    from models import SemesterGradeTotal, UserGradeTotal
+
+    old_values = subject_grade_contribution(*old) if old else (0, 0, 0)
+    new_values = subject_grade_contribution(*new) if new else (0, 0, 0)
+    delta = tuple(n - o for n, o in zip(new_values, old_values))
+    if not any(delta):
+        return
+
+    _upsert_grade_total(SemesterGradeTotal, {'semester_id': semester_id, 'user_id': user_id}, *delta)
+    _upsert_grade_total(UserGradeTotal, {'user_id': user_id}, *delta)
+
+
+def _grade_summary(graded_credits, grade_point_tenths, earned_credits):
+    gpa = (grade_point_tenths / GRADE_POINT_SCALE / graded_credits) if graded_credits else 0.0
+    return {
+        'gpa': round(gpa, 2),
+        'total_credits': graded_credits,
+        'earned_credits': earned_credits
+    }
+
+
+def get_user_grade_summary(user_id):
+    """사용자 전체 GPA/학점 (utils.helpers.calculate_gpa와 같은 형식) - 집계 행 1개 조회"""
+    from models import db, UserGradeTotal
+
+    total = db.session.get(UserGradeTotal, user_id)
+    if not total:
+        return _grade_summary(0, 0, 0)
+    return _grade_summary(total.graded_credits, total.grade_point_tenths, total.earned_credits)
+
+
+def get_semester_grade_summaries(user_id):
+    """
+    학기별 GPA/학점 목록 (학기 순서대로) - 학기 집계 행과 학기 정보를 JOIN으로 1회 조회
+    반환: [{"semester_id", "semester_name", "year", "season", "gpa", "total_credits", "earned_credits"}]
+    """
+    from models import db, Semester, SemesterGradeTotal
+    from utils.helpers import sort_semesters
+
+    rows = db.session.query(Semester, SemesterGradeTotal).join(
+        SemesterGradeTotal, SemesterGradeTotal.semester_id == Semester.id
+    ).filter(SemesterGradeTotal.user_id == user_id).all()
+
+    totals = {semester.id: total for semester, total in rows}
+    summaries = []
+    for semester in sort_semesters([semester for semester, _ in rows], reverse=False):
+        total = totals[semester.id]
+        summary = _grade_summary(total.graded_credits, total.grade_point_tenths, total.earned_credits)
+        summary.update({
+            'semester_id': semester.id,
+            'semester_name': semester.name,
+            'year': semester.year,
+            'season': semester.season
+        })
+        summaries.append(summary)
+    return summaries
+
+
+def seed_grade_points():
+    """grade_points 조회 테이블을 GRADE_MAP과 맞춤 (없는 성적 추가, 달라진 평점 수정, 없어진 성적 삭제)"""
+    from models import db, GradePoint
+
+    desired = {grade: int(round(score * GRADE_POINT_SCALE)) for grade, score in GRADE_MAP.items()}
+    existing = {row.grade: row for row in GradePoint.query.all()}
+    for grade, point_tenths in desired.items():
+        if grade not in existing:
+            db.session.add(GradePoint(grade=grade, point_tenths=point_tenths))
+        elif existing[grade].point_tenths != point_tenths:
+            existing[grade].point_tenths = point_tenths
+    for grade, row in existing.items():
+        if grade not in desired:
+            db.session.delete(row)
+    db.session.commit()
+
+
+def _grade_totals_select(*group_columns):
+    """
+    과목을 grade_points와 LEFT JOIN하여 group_columns별 (graded_credits, grade_point_tenths, earned_credits)를 계산하는 SELECT
+    성적이 조회 테이블에 없는 과목('Not Set' 등)은 이수 학점에만 포함됩니다.
+    """
+    from models import Subject, GradePoint
+
+    return select(
+        *group_columns,
+        func.coalesce(func.sum(case((GradePoint.grade.is_not(None), Subject.credits), else_=0)), 0),
+        func.coalesce(func.sum(Subject.credits * GradePoint.point_tenths), 0),
+        func.coalesce(func.sum(Subject.credits), 0)
+    ).select_from(Subject).outerjoin(
+        GradePoint, GradePoint.grade == Subject.grade
+    ).group_by(*group_columns)
+
+
+def query_gpa_by_semester(user_id):
+    """
+    과목 테이블에서 직접 학기별/전체 GPA와 학점을 계산 (GROUP BY semester_id 쿼리 1회)
+    집계 테이블 검증이나 복구에 사용합니다.
+    반환: {"semesters": {semester_id: 요약}, "overall": 요약} - 요약은 calculate_gpa와 같은 형식
+    """
+    from models import db, Subject
+
+    rows = db.session.execute(
+        _grade_totals_select(Subject.semester_id).where(Subject.user_id == user_id)
+    ).all()
+
+    semesters = {}
+    overall = [0, 0, 0]
+    for semester_id, graded_credits, grade_point_tenths, earned_credits in rows:
+        semesters[semester_id] = _grade_summary(graded_credits, grade_point_tenths, earned_credits)
+        overall[0] += graded_credits
+        overall[1] += grade_point_tenths
+        overall[2] += earned_credits
+    return {'semesters': semesters, 'overall': _grade_summary(*overall)}
+
+
+def rebuild_grade_totals(user_id=None):
+    """subjects로부터 학기별/사용자별 성적 집계를 다시 생성 (백필/복구용). 생성된 학기 집계 행 수 반환"""
+    from models import db, Subject, SemesterGradeTotal, UserGradeTotal
+
+    semester_delete = SemesterGradeTotal.query
+    user_delete = UserGradeTotal.query
+    semester_source = _grade_totals_select(Subject.semester_id, Subject.user_id)
+    user_source = _grade_totals_select(Subject.user_id)
+    if user_id:
+        semester_delete = semester_delete.filter_by(user_id=user_id)
+        user_delete = user_delete.filter_by(user_id=user_id)
+        semester_source = semester_source.where(Subject.user_id == user_id)
+        user_source = user_source.where(Subject.user_id == user_id)
+
+    semester_delete.delete(synchronize_session=False)
+    user_delete.delete(synchronize_session=False)
+    columns = ['graded_credits', 'grade_point_tenths', 'earned_credits']
+    result = db.session.execute(
+        SemesterGradeTotal.__table__.insert().from_select(['semester_id', 'user_id'] + columns, semester_source)
+    )
+    db.session.execute(UserGradeTotal.__table__.insert().from_select(['user_id'] + columns, user_source))
+    db.session.commit()
+    return result.rowcount
@@ -1,9 +1,11 @@
 """
 식단 정보 서비스
+식단 JSON 파일의 변경(mtime)을 감지하여 다시 읽고, 날짜/식당별 응답을 미리 만들어 캐시합니다.
 """
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import date, datetime
 import pytz
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
@@ -12,24 +14,33 @@ STAFF_MENU_PATH = os.path.join(BASE_DIR, 'menu_data', 'staff_menu.json')
 
 KST = pytz.timezone('Asia/Seoul')
 
+CAFETERIA_TYPES = ('student', 'faculty')
+
+# 현재 식단 캐시 (재로드 시 새 dict를 만들어 통째로 교체하므로 읽는 쪽은 락이 필요 없음)
+_meal_cache = {'mtimes': None, 'data': None, 'formatted': {}, 'weekly': None}
+_meal_cache_lock = threading.Lock()
+
+def _read_meal_files():
+    """식단 JSON 파일 로드 (실패 시 예외 발생)"""
+    data = {}
+    with open(STUDENT_MENU_PATH, 'r', encoding='utf-8') as f:
+        student_data = json.load(f)
+        data['student'] = student_data.get('메뉴', {})
+        data['student_period'] = student_data.get('기간', {})
+
+    with open(STAFF_MENU_PATH, 'r', encoding='utf-8') as f:
+        staff_data = json.load(f)
+        data['faculty'] = staff_data.get('메뉴', {})
+        data['faculty_period'] = staff_data.get('기간', {})
+    return data
+
 def load_meal_data():
     """식단 JSON 파일 로드"""
-    data = {}
     try:
-        with open(STUDENT_MENU_PATH, 'r', encoding='utf-8') as f:
-            student_data = json.load(f)
-            data['student'] = student_data.get('메뉴', {})
-            data['student_period'] = student_data.get('기간', {})
-
-        with open(STAFF_MENU_PATH, 'r', encoding='utf-8') as f:
-            staff_data = json.load(f)
-            data['faculty'] = staff_data.get('메뉴', {})
-            data['faculty_period'] = staff_data.get('기간', {})
-
+        return _read_meal_files()
     except Exception as e:
         print(f"Error loading meal data: {e}")
-        data = {'student': {}, 'faculty': {}, 'student_period': {}, 'faculty_period': {}}
-    return data
+        return {'student': {}, 'faculty': {}, 'student_period': {}, 'faculty_period': {}}
 
 def get_today_meal_key():
     """오늘 날짜의 식단 키 반환 (예: '3.15(월)')"""
@@ -112,3 +123,110 @@ def format_weekly_meal_for_client(weekly_meal_data):
         }
     }
     return formatted_data
+
+def _get_menu_mtimes():
+    """식단 파일들의 수정 시각 (파일이 없으면 None)"""
+    mtimes = []
+    for path in (STUDENT_MENU_PATH, STAFF_MENU_PATH):
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+def _parse_meal_date_key(date_key):
+    """식단 키('11.03(월)')를 (월, 일)로 변환"""
+    month, day = date_key.split('(')[0].split('.')
+    return int(month), int(day)
+
+def _parse_period_start(period):
+    """식단 기간의 시작일('2025.11.03')을 date로 변환 (없거나 형식이 다르면 None)"""
+    try:
+        return datetime.strptime(period.get('시작일', ''), '%Y.%m.%d').date()
+    except (AttributeError, ValueError):
+        return None
+
+def _resolve_meal_date(month, day, period_start, today):
+    """
+    연도가 없는 식단 키의 (월, 일)을 날짜로 변환
+    기간 시작일이 있으면 그 연도 기준 (시작 월보다 앞선 월은 연말을 넘긴 다음 해), 없으면 today와 가장 가까운 연도
+    """
+    if period_start:
+        return date(period_start.year + (1 if month < period_start.month else 0), month, day)
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    if not candidates:
+        raise ValueError(f"invalid meal date: {month}.{day}")
+    return min(candidates, key=lambda candidate: abs(candidate - today))
+
+def _build_meal_cache(data, mtimes):
+    """날짜, 식당별 클라이언트 응답과 주간 응답을 미리 계산 (작년 같은 날짜의 식단을 보여주지 않도록 연도까지 포함)"""
+    formatted = {}
+    today = datetime.now(KST).date()
+    for cafeteria in CAFETERIA_TYPES:
+        menu_data = data.get(cafeteria, {})
+        period_start = _parse_period_start(data.get(f'{cafeteria}_period'))
+        # 식단이 없는 날짜에 사용할 기본 응답
+        formatted[(None, cafeteria)] = format_meal_for_client({}, None, cafeteria)
+        for date_key in menu_data:
+            try:
+                meal_date = _resolve_meal_date(*_parse_meal_date_key(date_key), period_start, today)
+            except ValueError:
+                continue
+            formatted[(meal_date, cafeteria)] = format_meal_for_client(menu_data, date_key, cafeteria)
+
+    return {
+        'mtimes': mtimes,
+        'data': data,
+        'formatted': formatted,
+        'weekly': format_weekly_meal_for_client(data)
+    }
+
+def _get_meal_cache():
+    """최신 식단 캐시 반환 (파일이 바뀐 경우에만 다시 읽음)"""
+    global _meal_cache
+
+    mtimes = _get_menu_mtimes()
+    cache = _meal_cache
+    if cache['mtimes'] == mtimes:
+        return cache
+
+    with _meal_cache_lock:
+        cache = _meal_cache
+        if cache['mtimes'] == mtimes:
+            return cache
+        try:
+            data = _read_meal_files()
+        except Exception as e:
+            # 크롤러가 파일을 쓰는 중이거나 파일이 없는 경우: 이전 캐시 유지 후 다음 요청에서 재시도
+            print(f"Error loading meal data: {e}")
+            if cache['data'] is None:
+                _meal_cache = _build_meal_cache(load_meal_data(), None)
+            return _meal_cache
+        _meal_cache = _build_meal_cache(data, mtimes)
+        return _meal_cache
+
+def invalidate_meal_cache():
+    """다음 조회 시 식단 파일을 다시 읽도록 캐시 무효화"""
+    global _meal_cache
+    with _meal_cache_lock:
+        _meal_cache = dict(_meal_cache, mtimes=None)
+
+def get_meal_for_date(cafeteria_type, date_obj):
+    """특정 날짜의 클라이언트용 식단 (잘못된 식당 종류면 None)"""
+    if cafeteria_type not in CAFETERIA_TYPES:
+        return None
+    formatted = _get_meal_cache()['formatted']
+    return formatted.get((date_obj, cafeteria_type)) or formatted[(None, cafeteria_type)]
+
+def get_today_meal(cafeteria_type):
+    """요청 시점의 KST 날짜 기준 오늘 식단"""
+    return get_meal_for_date(cafeteria_type, datetime.now(KST).date())
+
+def get_weekly_meal():
+    """클라이언트용 주간 식단"""
+    return _get_meal_cache()['weekly']
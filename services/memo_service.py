@@ -0,0 +1,150 @@
+"""
+과목 날짜별 메모 서비스
+subject_daily_memos 테이블 조회/저장 및 기존 Subject.memo JSON(daily_memos)의 이관
+"""
+import json
+from datetime import datetime, timedelta
+from utils.helpers import get_upsert_insert
+from utils.constants import DEFAULT_SEMESTER_WEEKS
+
+# 이관 시 한 번에 처리할 과목 수
+MEMO_MIGRATION_BATCH_SIZE = 200
+
+
+def get_daily_memo_note(subject_id, date_obj):
+    """특정 날짜의 메모 내용 (없으면 빈 문자열)"""
+    from models import db, SubjectDailyMemo
+
+    return db.session.query(SubjectDailyMemo.note).filter_by(
+        subject_id=subject_id, date=date_obj
+    ).scalar() or ""
+
+
+def save_daily_memo(subject_id, date_obj, note):
+    """
+    특정 날짜의 메모를 단일 행 upsert로 저장 (commit은 호출자가 수행)
+    빈 메모는 행을 삭제하여 테이블에 내용 있는 날짜만 남깁니다.
+    """
+    from models import db, SubjectDailyMemo
+
+    note = (note or "").strip()
+    if not note:
+        SubjectDailyMemo.query.filter_by(subject_id=subject_id, date=date_obj).delete(synchronize_session=False)
+        return
+
+    insert = get_upsert_insert(db.session)
+    if insert is not None:
+        stmt = insert(SubjectDailyMemo).values(
+            subject_id=subject_id,
+            date=date_obj,
+            note=note,
+            updated_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SubjectDailyMemo.subject_id, SubjectDailyMemo.date],
+            set_={'note': stmt.excluded.note, 'updated_at': stmt.excluded.updated_at}
+        )
+        db.session.execute(stmt)
+        return
+
+    existing = db.session.get(SubjectDailyMemo, (subject_id, date_obj))
+    if existing:
+        existing.note = note
+    else:
+        db.session.add(SubjectDailyMemo(subject_id=subject_id, date=date_obj, note=note))
+
+
+def get_memos_between(subject_ids, start_date, end_date):
+    """여러 과목의 기간 내 메모를 (subject_id, date) 순으로 조회"""
+    from models import SubjectDailyMemo
+
+    if not subject_ids:
+        return []
+    return SubjectDailyMemo.query.filter(
+        SubjectDailyMemo.subject_id.in_(subject_ids),
+        SubjectDailyMemo.date.between(start_date, end_date)
+    ).order_by(SubjectDailyMemo.subject_id, SubjectDailyMemo.date).all()
+
+
+def build_weekly_memo_digest(subjects, start_date, weeks=DEFAULT_SEMESTER_WEEKS):
+    """
+    학기 주차별 메모 요약 생성
+    기간 내 메모를 범위 쿼리 1회로 읽고 한 번의 순회로 주차에 배정합니다.
+    반환: [{"week_number", "date_range", "subjects": [{"subject_id", "subject_name", "memos"}]}]
+    """
+    end_date = start_date + timedelta(weeks=weeks, days=-1)
+    subject_names = {subject.id: subject.name for subject in subjects}
+
+    # {주차 인덱스: {subject_id: [메모]}} - 메모는 날짜순으로 조회되므로 그대로 정렬 유지
+    buckets = {}
+    memos = get_memos_between(list(subject_names), start_date, end_date)
+    for memo in sorted(memos, key=lambda m: m.date):
+        week_index = (memo.date - start_date).days // 7
+        buckets.setdefault(week_index, {}).setdefault(memo.subject_id, []).append({
+            "date": memo.date.strftime('%Y-%m-%d'),
+            "note": memo.note
+        })
+
+    weekly_memos_data = []
+    for week_index in sorted(buckets):
+        week_start_date = start_date + timedelta(weeks=week_index)
+        week_end_date = week_start_date + timedelta(days=6)
+        week_subjects = buckets[week_index]
+        weekly_memos_data.append({
+            "week_number": week_index + 1,
+            "date_range": f"{week_start_date.strftime('%m.%d')}~{week_end_date.strftime('%m.%d')}",
+            "subjects": [
+                {"subject_id": subject.id, "subject_name": subject.name, "memos": week_subjects[subject.id]}
+                for subject in subjects if subject.id in week_subjects
+            ]
+        })
+    return weekly_memos_data
+
+
+def migrate_memo_blobs():
+    """
+    Subject.memo JSON에 남아 있는 daily_memos를 subject_daily_memos 테이블로 이관
+    과목 단위 배치로 처리하며, 이미 테이블에 있는 날짜는 덮어쓰지 않습니다.
+    이관된 과목의 memo에서는 daily_memos 키를 제거합니다. 이관한 메모 수 반환
+    """
+    from models import db, Subject, SubjectDailyMemo
+
+    migrated_count = 0
+    last_id = 0
+    while True:
+        subjects = Subject.query.filter(
+            Subject.id > last_id,
+            Subject.memo.like('%daily_memos%')
+        ).order_by(Subject.id).limit(MEMO_MIGRATION_BATCH_SIZE).all()
+        if not subjects:
+            break
+        last_id = subjects[-1].id
+
+        for subject in subjects:
+            try:
+                memo_data = json.loads(subject.memo)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if not isinstance(memo_data, dict):
+                continue
+
+            daily_memos = memo_data.pop('daily_memos', None)
+            if isinstance(daily_memos, dict):
+                existing_dates = {
+                    row.date for row in db.session.query(SubjectDailyMemo.date).filter_by(subject_id=subject.id).all()
+                }
+                for date_str, note in daily_memos.items():
+                    try:
+                        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+                    except (ValueError, TypeError):
+                        continue
+                    if not isinstance(note, str) or not note.strip() or date_obj in existing_dates:
+                        continue
+                    db.session.add(SubjectDailyMemo(subject_id=subject.id, date=date_obj, note=note.strip()))
+                    migrated_count += 1
+
+            subject.memo = json.dumps(memo_data, ensure_ascii=False)
+
+        db.session.commit()
+
+    return migrated_count
@@ -0,0 +1,127 @@
+"""
+쿼리 실행 계획 점검 서비스
+엔드포인트가 실제로 실행하는 SELECT 문을 수집하고 EXPLAIN으로 지정한 인덱스를 쓰는지 확인합니다.
+(전체 스캔 여부만으로는 다른 인덱스나 인덱스 전체 순회를 구분할 수 없으므로 인덱스 이름과 탐색 방식까지 봅니다)
+"""
+import json
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+from sqlalchemy import event
+
+# 실행 계획에서 대상 테이블을 읽는 노드 하나
+# index_name: 사용한 인덱스 (없으면 None), index_only: 테이블(heap)을 읽지 않는지, full_scan: 조건 없이 전체를 순회하는지
+TableScan = namedtuple('TableScan', ['node_type', 'index_name', 'index_only', 'full_scan', 'detail'])
+
+_SQLITE_SCAN = re.compile(
+    r'^(?P<op>SCAN|SEARCH) (?P<table>\w+)(?: AS \w+)?(?: USING (?P<covering>COVERING )?INDEX (?P<index>\w+))?'
+)
+
+
+@contextmanager
+def capture_statements(engine, table_name):
+    """블록 안에서 실행된 SELECT 중 table_name을 읽는 문장을 [(sql, parameters)]로 수집"""
+    statements = []
+    table_pattern = re.compile(rf'\b{re.escape(table_name)}\b')
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and table_pattern.search(statement):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+
+
+def explain_statement(connection, statement, parameters):
+    """실행 계획 반환 (PostgreSQL: EXPLAIN (FORMAT JSON)의 최상위 Plan dict, SQLite: EXPLAIN QUERY PLAN 줄 목록)"""
+    if connection.dialect.name == 'postgresql':
+        # 작은 테이블에서는 인덱스가 있어도 전체 스캔을 고르므로 전체 스캔을 막고, 어떤 인덱스를 고르는지 확인
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        plan = json.loads(result) if isinstance(result, str) else result
+        return plan[0]['Plan']
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [str(row[-1]) for row in rows]
+
+
+def _walk_plan_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk_plan_nodes(child)
+
+
+def collect_table_scans(plan, table_name):
+    """실행 계획(explain_statement 결과)에서 table_name을 읽는 노드 목록"""
+    scans = []
+    if isinstance(plan, dict):
+        for node in _walk_plan_nodes(plan):
+            if node.get('Relation Name') != table_name:
+                continue
+            node_type = node['Node Type']
+            index_name = node.get('Index Name')
+            if node_type == 'Bitmap Heap Scan':
+                # 인덱스 이름은 하위 Bitmap Index Scan 노드에 있음
+                index_names = [n['Index Name'] for n in _walk_plan_nodes(node) if n.get('Node Type') == 'Bitmap Index Scan']
+                index_name = ', '.join(index_names) or None
+            full_scan = index_name is None or (
+                node_type in ('Index Scan', 'Index Only Scan') and 'Index Cond' not in node
+            )
+            scans.append(TableScan(
+                node_type, index_name, node_type == 'Index Only Scan', full_scan, json.dumps(node, ensure_ascii=False)[:300]
+            ))
+        return scans
+
+    for line in plan:
+        match = _SQLITE_SCAN.match(line.strip())
+        if not match or match.group('table') != table_name:
+            continue
+        # SQLite: "SCAN"은 테이블/인덱스 전체 순회, 인덱스 범위 탐색은 "SEARCH"
+        scans.append(TableScan(
+            match.group('op'), match.group('index'), bool(match.group('covering')), match.group('op') == 'SCAN', line.strip()
+        ))
+    return scans
+
+
+def find_index_problems(scans, index_name, require_index_only=False):
+    """table 읽기 노드 중 index_name 범위 탐색이 아닌 것(또는 index_only가 아닌 것)의 설명 목록"""
+    problems = []
+    for scan in scans:
+        if scan.index_name is None:
+            problems.append(f"{scan.node_type} without an index: {scan.detail}")
+        elif scan.index_name != index_name:
+            problems.append(f"{scan.node_type} uses {scan.index_name} instead of {index_name}: {scan.detail}")
+        elif scan.full_scan:
+            problems.append(f"{scan.node_type} walks the whole of {index_name}: {scan.detail}")
+        elif require_index_only and not scan.index_only:
+            problems.append(f"{scan.node_type} on {index_name} is not index-only: {scan.detail}")
+    return problems
+
+
+def is_covered_statement(statement, table_name, covered_columns):
+    """문장이 읽는 table_name 컬럼(table.column 형태)이 모두 covered_columns에 있는지"""
+    columns = set(re.findall(rf'\b{re.escape(table_name)}\.(\w+)', statement))
+    return bool(columns) and columns <= set(covered_columns)
+
+
+def check_index_usage(engine, table_name, index_name, run_requests, covered_columns=None):
+    """
+    run_requests()가 실행한 table_name 조회 문장이 모두 index_name으로 범위 탐색하는지 점검
+    covered_columns(인덱스가 담고 있는 컬럼)를 주면, 그 컬럼만 읽는 문장은 Index Only Scan(SQLite: COVERING INDEX)까지 요구합니다.
+    반환: (수집된 문장 목록, [(sql, 문제 목록)]) - 두 번째가 비어 있으면 모든 문장이 해당 인덱스를 사용
+    """
+    with capture_statements(engine, table_name) as statements:
+        run_requests()
+
+    failures = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            with connection.begin():
+                plan = explain_statement(connection, statement, parameters)
+            require_index_only = bool(covered_columns) and is_covered_statement(statement, table_name, covered_columns)
+            problems = find_index_problems(collect_table_scans(plan, table_name), index_name, require_index_only)
+            if problems:
+                failures.append((statement, problems))
+    return statements, failures
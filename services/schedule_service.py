@@ -0,0 +1,87 @@
+"""
+오늘 일정 조회 서비스
+개인 일정, 캘린더 이벤트, 오늘 수업을 고정된 개수의 쿼리로 모아서 반환
+"""
+from sqlalchemy.orm import joinedload
+from .semester_service import get_current_semester
+from .calendar_service import event_overlap_filter, expand_occurrence_dates, get_system_event_dicts
+
+
+def _schedule_sort_key(item):
+    return item['time'] if item['time'] != '종일' else '00:00'
+
+
+def get_today_schedule(user_id, today):
+    """
+    오늘 일정 목록 반환 (/api/schedule 용)
+    - 비로그인(user_id=None): 시스템 캘린더 이벤트만
+    - 로그인: 개인 일정 + 캘린더 이벤트(시스템 + 사용자) + 오늘 수업
+    이벤트 수와 무관하게 최대 4회의 쿼리로 처리합니다. (시스템 이벤트는 캐시 적중 시 쿼리 없음)
+    """
+    from models import Schedule, CalendarEvent, Subject, TimeSlot
+
+    schedule_list = []
+
+    # 1. 사용자가 직접 추가한 일정
+    if user_id:
+        user_schedules = Schedule.query.filter_by(user_id=user_id, date=today.strftime('%Y-%m-%d')).all()
+        for s in user_schedules:
+            schedule_list.append({"type": "schedule", "time": s.time, "title": s.title, "location": s.location})
+
+    # 2. 오늘과 겹치는 캘린더 이벤트
+    # 시스템 이벤트는 프로세스 캐시에서, 사용자 이벤트만 DB에서 조회 (카테고리는 JOIN으로 함께 로드)
+    for event_dict in get_system_event_dicts(today, today):
+        start = event_dict['start']
+        schedule_list.append({
+            "type": "calendar",
+            "time": start[11:16] if not event_dict['allDay'] and 'T' in start else '종일',
+            "title": event_dict['title'],
+            "location": event_dict['extendedProps']['category_name']
+        })
+
+    if user_id:
+        calendar_events = CalendarEvent.query.options(
+            joinedload(CalendarEvent.category)
+        ).filter(
+            CalendarEvent.user_id == user_id,
+            event_overlap_filter(today, today)
+        ).all()
+
+        for event in calendar_events:
+            # 반복 일정은 오늘 발생하는 경우만
+            if event.recurrence_type and not expand_occurrence_dates(
+                event.start_date, event.end_date, event.recurrence_type, event.recurrence_interval,
+                event.recurrence_end_date, today, today
+            ):
+                continue
+            schedule_list.append({
+                "type": "calendar",
+                "time": event.start_time.strftime('%H:%M') if event.start_time else '종일',
+                "title": event.title,
+                "location": event.category.name if event.category else ''
+            })
+
+    # 3. 오늘 요일의 시간표 (수업) - 로그인 사용자, 평일만
+    today_day_of_week = today.weekday() + 1  # 1:월 ~ 7:일
+    if user_id and 1 <= today_day_of_week <= 5:
+        current_semester = get_current_semester(user_id, today)
+        if current_semester and not current_semester.is_virtual:
+            today_slots = Subject.query.with_entities(
+                Subject.name, TimeSlot.start_time, TimeSlot.room
+            ).join(
+                TimeSlot, TimeSlot.subject_id == Subject.id
+            ).filter(
+                Subject.semester_id == current_semester.id,
+                TimeSlot.day_of_week == today_day_of_week
+            ).all()
+
+            for name, start_time, room in today_slots:
+                schedule_list.append({
+                    "type": "class",
+                    "time": start_time,
+                    "title": name,
+                    "location": room
+                })
+
+    schedule_list.sort(key=_schedule_sort_key)
+    return schedule_list
@@ -2,36 +2,32 @@
 학기 관리 서비스
 학사일정 로드, 학기 데이터 생성 및 관리
 """
-import csv
-import os
-from datetime import date, datetime
-from utils.constants import SEASONS, SEMESTER_YEAR_RANGE
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+import pytz
+from utils.constants import SEASONS, SEASON_ORDER, SEMESTER_YEAR_RANGE, DEFAULT_SEMESTER_WEEKS
+from .academic_calendar_service import get_academic_calendar
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-CALENDAR_PATH = os.path.join(BASE_DIR, 'schedules', 'Calendar.csv')
+KST = pytz.timezone('Asia/Seoul')
+
+# 전체 사용자 학기 생성 시 한 번에 처리할 사용자 수
+SEMESTER_PROVISION_BATCH_SIZE = 500
+# 현재 학기 캐시: 최대 항목 수 (사용자 x 날짜)와 다른 프로세스의 변경을 대비한 최대 유지 시간
+CURRENT_SEMESTER_CACHE_SIZE = 1024
+CURRENT_SEMESTER_CACHE_TTL_SECONDS = 300
+
+# 현재 학기 조회 결과 (프로세스 캐시에 ORM 객체 대신 저장)
+SemesterInfo = namedtuple('SemesterInfo', ['id', 'user_id', 'name', 'year', 'season', 'start_date', 'is_virtual'])
+
+# {(user_id, date): (저장 시각, SemesterInfo 또는 None)} - 최근 사용 순서 유지 (LRU)
+_current_semester_cache = OrderedDict()
+_current_semester_cache_lock = threading.Lock()
 
 def load_academic_calendar():
-    """학사일정 CSV 파일에서 개강일 정보를 로드"""
-    calendar_data = {}
-    try:
-        with open(CALENDAR_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) >= 4:
-                    year, month, day, event_name = row[0:4]
-                    try:
-                        event_date = date(int(year), int(month), int(day))
-                        if "개강" in event_name:
-                            semester_key = f"{year}-{month.zfill(2)}"
-                            if semester_key not in calendar_data or event_date < calendar_data[semester_key]:
-                                calendar_data[semester_key] = event_date
-                    except ValueError:
-                        continue
-    except Exception as e:
-        print(f"Error loading academic calendar: {e}")
-    return calendar_data
-
-ACADEMIC_CALENDAR = load_academic_calendar()
+    """학사일정에서 개강일 정보를 조회 {"YYYY-MM": 개강일}"""
+    return dict(get_academic_calendar().semester_starts)
 
 def _get_semester_start_date_fallback(year, season):
     """학사일정에 없을 때 기본 개강일 반환"""
@@ -57,52 +53,245 @@ def get_semester_start_date(year, season):
     elif "겨울학기" in season:
         month_key = f"{year}-12"
 
-    start_date = ACADEMIC_CALENDAR.get(month_key)
+    start_date = get_academic_calendar().get_semester_start(month_key)
     return start_date if start_date else _get_semester_start_date_fallback(year, season)
 
-def create_semesters_for_user(user_id):
-    """사용자에게 학기 데이터를 생성"""
+def _build_semester_rows(user_ids, years):
+    """사용자 x 연도 x 학기 조합의 Semester 행 목록"""
+    season_rows = [
+        (year, season, f"{year}년 {season}", get_semester_start_date(year, season))
+        for year in years
+        for season in SEASONS
+    ]
+    return [
+        {'user_id': user_id, 'name': name, 'year': year, 'season': season, 'start_date': start_date}
+        for user_id in user_ids
+        for year, season, name, start_date in season_rows
+    ]
+
+def _insert_semester_rows(rows):
+    """학기 행들을 INSERT ... ON CONFLICT DO NOTHING으로 삽입하고 새로 생성된 수 반환"""
     from models import Semester, db
+    from utils.helpers import get_upsert_insert
 
-    try:
-        start_year, end_year = SEMESTER_YEAR_RANGE
-        for year in range(start_year, end_year + 1):
-            for season in SEASONS:
-                semester_name = f"{year}년 {season}"
-                existing_semester = Semester.query.filter_by(user_id=user_id, name=semester_name).first()
-                if not existing_semester:
-                    start_date = get_semester_start_date(year, season)
-                    new_semester = Semester(user_id=user_id, name=semester_name, year=year, season=season, start_date=start_date)
-                    db.session.add(new_semester)
+    if not rows:
+        return 0
+
+    insert = get_upsert_insert(db.session)
+    if insert is not None:
+        stmt = insert(Semester).values(rows).on_conflict_do_nothing(index_elements=['user_id', 'name'])
+        return db.session.execute(stmt).rowcount
+
+    # 기타 DB: 이미 있는 학기를 한 번에 조회한 뒤 없는 행만 일괄 INSERT
+    existing = set(db.session.query(Semester.user_id, Semester.name).filter(
+        Semester.user_id.in_({row['user_id'] for row in rows}),
+        Semester.name.in_({row['name'] for row in rows})
+    ).all())
+    missing = [row for row in rows if (row['user_id'], row['name']) not in existing]
+    if missing:
+        db.session.execute(Semester.__table__.insert(), missing)
+    return len(missing)
+
+def provision_semesters(user_ids, years):
+    """
+    여러 사용자의 학기 행을 한 번의 INSERT ... ON CONFLICT DO NOTHING으로 생성 (commit은 호출자가 수행)
+    이미 있는 (user_id, name) 학기는 건너뜁니다. 새로 생성된 학기 수 반환
+    """
+    created_count = _insert_semester_rows(_build_semester_rows(user_ids, years))
+    if created_count:
+        invalidate_current_semester_cache()
+    return created_count
+
+def provision_semesters_for_all_users(years, batch_size=SEMESTER_PROVISION_BATCH_SIZE):
+    """모든 사용자의 학기 행을 사용자 배치 단위로 생성하고 배치마다 커밋. 새로 생성된 학기 수 반환"""
+    from models import User, db
+
+    created_count = 0
+    processed_users = 0
+    last_user_id = None
+    while True:
+        query = db.session.query(User.id).order_by(User.id)
+        if last_user_id is not None:
+            query = query.filter(User.id > last_user_id)
+        user_ids = [user_id for (user_id,) in query.limit(batch_size).all()]
+        if not user_ids:
+            break
+        last_user_id = user_ids[-1]
+
+        created_count += provision_semesters(user_ids, years)
         db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error creating semesters for user {user_id}: {e}")
-
-def manage_semesters_job(app):
-    """매년 12월 1일에 다음 년도 학기 데이터 자동 생성"""
-    from models import User, Semester, db
-
-    with app.app_context():
-        print(f"[{datetime.now()}] Starting semester management job...")
-        try:
-            today = date.today()
-            if today.month == 12 and today.day == 1:
-                next_year = today.year + 1
-                users = User.query.all()
-                for user in users:
-                    semester_name_check = f"{next_year}년 1학기"
-                    exists = Semester.query.filter_by(user_id=user.id, name=semester_name_check).first()
-                    if not exists:
-                        print(f"Generating future semesters ({next_year}) for user {user.id}...")
-                        for season in SEASONS:
-                            semester_name = f"{next_year}년 {season}"
-                            start_date = get_semester_start_date(next_year, season)
-                            new_semester = Semester(user_id=user.id, name=semester_name, year=next_year, season=season, start_date=start_date)
-                            db.session.add(new_semester)
-
-            db.session.commit()
-            print(f"[{datetime.now()}] Semester management job finished.")
-        except Exception as e:
-            db.session.rollback()
-            print(f"[{datetime.now()}] ERROR in semester management job: {e}")
+        processed_users += len(user_ids)
+        print(f"[{datetime.now()}] Semester provisioning: {processed_users} users processed, {created_count} semesters created.")
+
+    return created_count
+
+# --- [신규] 가상 학기 (DB에 저장되지 않은 학기) ---
+# 학기 행은 과목이나 할 일이 처음 추가될 때만 저장하고, 그 전에는 연도/학기로부터 가상 학기를 만들어 보여줍니다.
+# 가상 학기 ID는 음수: -(연도 * 10 + 학기 순서)  예) 2025년 2학기 -> -20253
+
+class VirtualSemester:
+    """아직 저장되지 않은 학기 (Semester와 같은 속성으로 조회 코드에서 함께 사용)"""
+    is_virtual = True
+
+    def __init__(self, user_id, year, season):
+        self.id = encode_virtual_semester_id(year, season)
+        self.user_id = user_id
+        self.name = f"{year}년 {season}"
+        self.year = year
+        self.season = season
+        self.start_date = get_semester_start_date(year, season)
+
+def encode_virtual_semester_id(year, season):
+    return -(year * 10 + SEASON_ORDER[season])
+
+def decode_virtual_semester_id(semester_id):
+    """가상 학기 ID를 (연도, 학기)로 변환 (잘못된 ID면 None)"""
+    year, season_order = divmod(-semester_id, 10)
+    for season, order in SEASON_ORDER.items():
+        if order == season_order and year in get_semester_years():
+            return year, season
+    return None
+
+def get_semester_years(today=None):
+    """학기를 보여줄 연도 범위 (KST 기준 12월부터는 다음 해 학기 포함)"""
+    today = today or datetime.now(KST).date()
+    start_year, end_year = SEMESTER_YEAR_RANGE
+    last_year = max(end_year, today.year + (1 if today.month == 12 else 0))
+    return range(start_year, last_year + 1)
+
+def get_user_semesters(user_id):
+    """저장된 학기와 가상 학기를 합친 사용자 학기 목록 (최신순)"""
+    from models import Semester
+
+    semesters = Semester.query.filter_by(user_id=user_id).all()
+    persisted_names = {s.name for s in semesters}
+    for year in get_semester_years():
+        for season in SEASONS:
+            if f"{year}년 {season}" not in persisted_names:
+                semesters.append(VirtualSemester(user_id, year, season))
+
+    semesters.sort(key=lambda s: (s.year, SEASON_ORDER.get(s.season, 99)), reverse=True)
+    return semesters
+
+def resolve_user_semester(user_id, semester_id):
+    """
+    학기 ID(저장된 학기 또는 가상 학기)를 사용자의 학기로 변환 (없거나 권한이 없으면 None)
+    가상 학기 ID라도 이미 저장된 학기가 있으면 저장된 학기를 반환합니다.
+    """
+    from models import Semester, db
+
+    try:
+        semester_id = int(semester_id)
+    except (TypeError, ValueError):
+        return None
+
+    if semester_id > 0:
+        semester = db.session.get(Semester, semester_id)
+        return semester if semester and semester.user_id == user_id else None
+
+    decoded = decode_virtual_semester_id(semester_id)
+    if not decoded:
+        return None
+    year, season = decoded
+    persisted = Semester.query.filter_by(user_id=user_id, name=f"{year}년 {season}").first()
+    return persisted or VirtualSemester(user_id, year, season)
+
+def materialize_semester(semester):
+    """가상 학기를 DB에 저장하고 저장된 Semester를 반환 (이미 저장된 학기는 그대로 반환)"""
+    from models import Semester
+
+    if not getattr(semester, 'is_virtual', False):
+        return semester
+
+    if _insert_semester_rows([{
+        'user_id': semester.user_id,
+        'name': semester.name,
+        'year': semester.year,
+        'season': semester.season,
+        'start_date': semester.start_date
+    }]):
+        invalidate_current_semester_cache(semester.user_id)
+    return Semester.query.filter_by(user_id=semester.user_id, name=semester.name).first()
+
+# --- [신규] 현재 학기 조회 (사용자 x 날짜 LRU 캐시) ---
+
+def _semester_info(semester):
+    return SemesterInfo(
+        semester.id, semester.user_id, semester.name, semester.year, semester.season,
+        semester.start_date, semester.is_virtual
+    )
+
+def _find_calendar_semester(user_id, target_date):
+    """학사일정 기준으로 target_date가 포함된 가장 늦게 시작한 학기 (가상 학기, 없으면 None)"""
+    semester_years = get_semester_years()
+    candidate = None
+    for year in (target_date.year - 1, target_date.year):
+        if year not in semester_years:
+            continue
+        for season in SEASONS:
+            start = get_semester_start_date(year, season)
+            if start <= target_date <= start + timedelta(weeks=DEFAULT_SEMESTER_WEEKS):
+                if candidate is None or start >= candidate.start_date:
+                    candidate = VirtualSemester(user_id, year, season)
+    return candidate
+
+def _resolve_current_semester(user_id, target_date):
+    from models import Semester
+    from sqlalchemy import or_
+
+    candidate = _find_calendar_semester(user_id, target_date)
+
+    # 저장된 학기 중 target_date가 포함된 학기 + 학사일정 기준 학기와 이름이 같은 저장된 학기 - 조회 1회
+    # (이전에 저장된 학기는 개강일이 학사일정과 다를 수 있으므로 이름으로도 찾음)
+    range_start = target_date - timedelta(weeks=DEFAULT_SEMESTER_WEEKS)
+    in_range = Semester.start_date.between(range_start, target_date)
+    condition = or_(in_range, Semester.name == candidate.name) if candidate else in_range
+    rows = Semester.query.filter(Semester.user_id == user_id, condition).order_by(Semester.start_date.desc()).all()
+
+    persisted = next((s for s in rows if s.start_date and range_start <= s.start_date <= target_date), None)
+    if candidate is None:
+        if persisted:
+            return persisted
+    else:
+        stored_candidate = next((s for s in rows if s.name == candidate.name), None)
+        # 학사일정 학기보다 늦게 시작한 다른 저장된 학기(예: 계절학기)가 있으면 그 학기
+        if persisted and persisted.name != candidate.name and persisted.start_date >= candidate.start_date:
+            return persisted
+        return stored_candidate or candidate
+
+    # 학기 범위 밖의 날짜: 가장 최근 학기로 대체
+    all_semesters = get_user_semesters(user_id)
+    return all_semesters[0] if all_semesters else None
+
+def get_current_semester(user_id, target_date):
+    """
+    target_date가 포함된 사용자의 현재 학기 (없으면 가장 최근 학기, 학기가 없으면 None)
+    결과는 (user_id, 날짜)별로 LRU 캐시하며, 학기가 저장되면 해당 사용자의 항목을 비웁니다.
+    반환값은 SemesterInfo (id, name, year, season, start_date, is_virtual)
+    """
+    key = (user_id, target_date)
+    now = time.monotonic()
+    with _current_semester_cache_lock:
+        cached = _current_semester_cache.get(key)
+        if cached and now - cached[0] < CURRENT_SEMESTER_CACHE_TTL_SECONDS:
+            _current_semester_cache.move_to_end(key)
+            return cached[1]
+
+    semester = _resolve_current_semester(user_id, target_date)
+    info = _semester_info(semester) if semester else None
+
+    with _current_semester_cache_lock:
+        _current_semester_cache[key] = (now, info)
+        _current_semester_cache.move_to_end(key)
+        while len(_current_semester_cache) > CURRENT_SEMESTER_CACHE_SIZE:
+            _current_semester_cache.popitem(last=False)
+    return info
+
+def invalidate_current_semester_cache(user_id=None):
+    """현재 학기 캐시 비우기 (user_id가 주어지면 해당 사용자 항목만)"""
+    with _current_semester_cache_lock:
+        if user_id is None:
+            _current_semester_cache.clear()
+            return
+        for key in [key for key in _current_semester_cache if key[0] == user_id]:
+            del _current_semester_cache[key]
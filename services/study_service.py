@@ -0,0 +1,378 @@
+"""
+공부 시간 기록 서비스
+StudyLog 삽입과 일일/시간대별 집계(study_daily_totals, study_hourly_totals) 갱신, 집계 기반 통계 조회
+"""
+from datetime import datetime, time, timedelta
+from sqlalchemy import func, select
+from utils.constants import STUDY_SEGMENT_MAX_SECONDS
+from utils.helpers import get_upsert_insert
+
+# 연속 학습 일수는 최대 100일까지만 계산
+MAX_STREAK_DAYS = 100
+
+
+def _upsert_daily_totals(user_id, totals):
+    """일일 집계 행들에 시간/세션 수를 원자적으로 더함 (없으면 생성). totals: {date: (seconds, sessions)}"""
+    from models import db, StudyDailyTotal
+
+    rows = [
+        {'user_id': user_id, 'date': date_obj, 'total_seconds': seconds, 'session_count': sessions}
+        for date_obj, (seconds, sessions) in sorted(totals.items())
+    ]
+    if not rows:
+        return
+
+    insert = get_upsert_insert(db.session)
+    if insert is not None:
+        stmt = insert(StudyDailyTotal).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StudyDailyTotal.user_id, StudyDailyTotal.date],
+            set_={
+                'total_seconds': StudyDailyTotal.total_seconds + stmt.excluded.total_seconds,
+                'session_count': StudyDailyTotal.session_count + stmt.excluded.session_count
+            }
+        )
+        db.session.execute(stmt)
+        return
+
+    # 기타 DB: UPDATE 후 갱신된 행이 없으면 INSERT
+    for row in rows:
+        updated = StudyDailyTotal.query.filter_by(user_id=user_id, date=row['date']).update({
+            StudyDailyTotal.total_seconds: StudyDailyTotal.total_seconds + row['total_seconds'],
+            StudyDailyTotal.session_count: StudyDailyTotal.session_count + row['session_count']
+        }, synchronize_session=False)
+        if not updated:
+            db.session.add(StudyDailyTotal(**row))
+
+
+def _upsert_daily_total(user_id, date_obj, seconds, sessions):
+    """일일 집계 행에 시간/세션 수를 원자적으로 더함 (없으면 생성)"""
+    _upsert_daily_totals(user_id, {date_obj: (seconds, sessions)})
+
+
+def split_into_hours(started_at, ended_at, duration_seconds=None):
+    """
+    [started_at, ended_at) 구간을 시간대별 초로 나눔 -> {(date, hour): seconds}
+    시간대별 초의 합은 duration_seconds(없으면 구간 길이를 반올림한 값)와 항상 같습니다.
+    (초 미만 단위는 버리고 남은 초를 마지막 시간대에 더하므로 일일 집계와 어긋나지 않음)
+    """
+    if duration_seconds is None:
+        duration_seconds = int(round((ended_at - started_at).total_seconds()))
+    buckets = {}
+    assigned = 0
+    current = started_at
+    key = None
+    while current < ended_at:
+        next_hour = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        segment_end = min(next_hour, ended_at)
+        key = (current.date(), current.hour)
+        seconds = min(int((segment_end - current).total_seconds()), duration_seconds - assigned)
+        buckets[key] = buckets.get(key, 0) + seconds
+        assigned += seconds
+        current = segment_end
+    if key is not None and assigned < duration_seconds:
+        buckets[key] += duration_seconds - assigned
+    return buckets
+
+
+def _upsert_hourly_totals(user_id, buckets):
+    """시간대별 집계 행들에 초를 원자적으로 더함 (여러 행을 INSERT 1회로 처리)"""
+    from models import db, StudyHourlyTotal
+
+    rows = [
+        {'user_id': user_id, 'date': date_obj, 'hour': hour, 'total_seconds': seconds}
+        for (date_obj, hour), seconds in sorted(buckets.items()) if seconds > 0
+    ]
+    if not rows:
+        return
+
+    insert = get_upsert_insert(db.session)
+    if insert is not None:
+        stmt = insert(StudyHourlyTotal).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StudyHourlyTotal.user_id, StudyHourlyTotal.date, StudyHourlyTotal.hour],
+            set_={'total_seconds': StudyHourlyTotal.total_seconds + stmt.excluded.total_seconds}
+        )
+        db.session.execute(stmt)
+        return
+
+    for row in rows:
+        updated = StudyHourlyTotal.query.filter_by(
+            user_id=user_id, date=row['date'], hour=row['hour']
+        ).update({
+            StudyHourlyTotal.total_seconds: StudyHourlyTotal.total_seconds + row['total_seconds']
+        }, synchronize_session=False)
+        if not updated:
+            db.session.add(StudyHourlyTotal(**row))
+
+
+def resolve_session_times(date_obj, duration_seconds, now):
+    """
+    시각 정보 없이 저장 요청된 공부 기록의 (started_at, ended_at) 추정
+    타이머는 종료 시점에 저장되므로 요청 시각을 종료 시각으로 보고,
+    시작 시각이 기록 날짜에 속하지 않거나 시간이 범위를 벗어나면 (None, None)
+    now: KST 기준 현재 시각 (timezone 없음)
+    """
+    if not 0 < duration_seconds <= STUDY_SEGMENT_MAX_SECONDS:
+        return None, None
+    started_at = now - timedelta(seconds=duration_seconds)
+    if started_at.date() != date_obj:
+        return None, None
+    return started_at, now
+
+
+def add_study_log(user_id, date_obj, duration_seconds, subject_id=None, started_at=None, ended_at=None):
+    """
+    StudyLog를 추가하고 일일/시간대별 집계를 같은 트랜잭션에서 갱신 (commit은 호출자가 수행)
+    started_at/ended_at이 있으면 공부 구간을 시간대별로 나누어 study_hourly_totals에 더합니다.
+    """
+    from models import db, StudyLog
+
+    new_log = StudyLog(
+        user_id=user_id,
+        subject_id=subject_id,
+        date=date_obj,
+        duration_seconds=duration_seconds,
+        started_at=started_at,
+        ended_at=ended_at
+    )
+    db.session.add(new_log)
+    _upsert_daily_total(user_id, date_obj, duration_seconds, 1)
+    if started_at and ended_at:
+        _upsert_hourly_totals(user_id, split_into_hours(started_at, ended_at, duration_seconds))
+    return new_log
+
+
+def split_segment_by_date(segment):
+    """
+    자정을 넘는 구간을 날짜별 구간 목록으로 나눔 (일일 합계와 시간대별 합계가 같은 날짜에 쌓이도록)
+    첫 구간은 원래 client_key를, 이후 구간은 "client_key@YYYY-MM-DD"를 사용하므로 재전송해도 한 번만 저장됩니다.
+    """
+    started_at, ended_at = segment['started_at'], segment['ended_at']
+    if not started_at or not ended_at or started_at.date() == ended_at.date():
+        return [segment]
+
+    pieces = []
+    remaining = segment['duration_seconds']
+    cursor = started_at
+    while cursor.date() < ended_at.date():
+        boundary = datetime.combine(cursor.date() + timedelta(days=1), time.min)
+        seconds = min(remaining, int(round((boundary - cursor).total_seconds())))
+        pieces.append((cursor, boundary, seconds))
+        remaining -= seconds
+        cursor = boundary
+    pieces.append((cursor, ended_at, remaining))
+
+    parts = []
+    for piece_start, piece_end, seconds in pieces:
+        if seconds <= 0:
+            continue
+        key = segment['client_key'] if not parts else f"{segment['client_key']}@{piece_start.date().isoformat()}"
+        parts.append(dict(
+            segment, client_key=key, date=piece_start.date(),
+            duration_seconds=seconds, started_at=piece_start, ended_at=piece_end
+        ))
+    return parts
+
+
+def add_study_segments(user_id, segments):
+    """
+    타이머 구간 여러 개를 INSERT 1회로 저장하고 일일/시간대별 집계를 같은 트랜잭션에서 갱신 (commit은 호출자가 수행)
+    segments: [{"client_key", "subject_id", "date", "duration_seconds", "started_at", "ended_at"}]
+    이미 저장된 client_key의 구간은 건너뜁니다 (재전송 중복 방지). 새로 저장된 구간의 client_key 집합 반환
+    """
+    from models import db, StudyLog
+
+    rows = {}
+    for segment in segments:
+        rows.setdefault(segment['client_key'], dict(segment, user_id=user_id))
+    if not rows:
+        return set()
+
+    insert = get_upsert_insert(db.session)
+    if insert is not None:
+        stmt = insert(StudyLog).values(list(rows.values())).on_conflict_do_nothing(
+            index_elements=[StudyLog.user_id, StudyLog.client_key]
+        ).returning(StudyLog.client_key)
+        inserted_keys = set(db.session.execute(stmt).scalars())
+    else:
+        # 기타 DB: 이미 저장된 키를 한 번에 조회한 뒤 없는 구간만 일괄 INSERT
+        existing_keys = set(db.session.execute(
+            select(StudyLog.client_key).where(StudyLog.user_id == user_id, StudyLog.client_key.in_(list(rows)))
+        ).scalars())
+        inserted_keys = set(rows) - existing_keys
+        if inserted_keys:
+            db.session.execute(StudyLog.__table__.insert(), [rows[key] for key in inserted_keys])
+
+    daily_totals = {}
+    hourly_buckets = {}
+    for key in inserted_keys:
+        row = rows[key]
+        seconds, sessions = daily_totals.get(row['date'], (0, 0))
+        daily_totals[row['date']] = (seconds + row['duration_seconds'], sessions + 1)
+        if row['started_at'] and row['ended_at']:
+            split = split_into_hours(row['started_at'], row['ended_at'], row['duration_seconds'])
+            for bucket, bucket_seconds in split.items():
+                hourly_buckets[bucket] = hourly_buckets.get(bucket, 0) + bucket_seconds
+    _upsert_daily_totals(user_id, daily_totals)
+    _upsert_hourly_totals(user_id, hourly_buckets)
+    return inserted_keys
+
+
+def get_daily_totals_for_dates(user_id, dates):
+    """여러 날짜의 총 공부 시간(초) {date: seconds} - 쿼리 1회 (기록 없는 날짜는 0)"""
+    from models import db, StudyDailyTotal
+
+    dates = set(dates)
+    if not dates:
+        return {}
+    rows = db.session.query(StudyDailyTotal.date, StudyDailyTotal.total_seconds).filter(
+        StudyDailyTotal.user_id == user_id,
+        StudyDailyTotal.date.in_(dates)
+    ).all()
+    totals = dict.fromkeys(dates, 0)
+    totals.update({row.date: row.total_seconds for row in rows})
+    return totals
+
+
+def get_daily_total(user_id, date_obj):
+    """특정 날짜의 총 공부 시간(초)"""
+    from models import db, StudyDailyTotal
+
+    return db.session.query(StudyDailyTotal.total_seconds).filter_by(
+        user_id=user_id, date=date_obj
+    ).scalar() or 0
+
+
+def get_total_between(user_id, start_date, end_date):
+    """기간 내 총 공부 시간(초)"""
+    from models import db, StudyDailyTotal
+
+    return db.session.query(func.sum(StudyDailyTotal.total_seconds)).filter(
+        StudyDailyTotal.user_id == user_id,
+        StudyDailyTotal.date.between(start_date, end_date)
+    ).scalar() or 0
+
+
+def get_daily_totals_between(user_id, start_date, end_date):
+    """기간 내 날짜별 총 공부 시간 {date: seconds}"""
+    from models import db, StudyDailyTotal
+
+    rows = db.session.query(StudyDailyTotal.date, StudyDailyTotal.total_seconds).filter(
+        StudyDailyTotal.user_id == user_id,
+        StudyDailyTotal.date.between(start_date, end_date)
+    ).all()
+    return {row.date: row.total_seconds for row in rows}
+
+
+def get_hourly_totals_between(user_id, start_date, end_date):
+    """기간 내 시간대별(0-23시) 총 공부 시간 리스트 - 시간대로 GROUP BY 한 쿼리 1회"""
+    from models import db, StudyHourlyTotal
+
+    rows = db.session.query(StudyHourlyTotal.hour, func.sum(StudyHourlyTotal.total_seconds)).filter(
+        StudyHourlyTotal.user_id == user_id,
+        StudyHourlyTotal.date.between(start_date, end_date)
+    ).group_by(StudyHourlyTotal.hour).all()
+
+    hourly = [0] * 24
+    for hour, seconds in rows:
+        hourly[hour] = int(seconds or 0)
+    return hourly
+
+
+def get_streak_and_today_total(user_id, today):
+    """
+    (오늘부터 거꾸로 이어지는 연속 학습 일수, 오늘 총 공부 시간) - 쿼리 1회
+    최근 MAX_STREAK_DAYS일의 학습일만 한 번에 조회하여 첫 공백(gap)까지 셉니다.
+    """
+    from models import db, StudyDailyTotal
+
+    window_start = today - timedelta(days=MAX_STREAK_DAYS - 1)
+    study_days = db.session.query(StudyDailyTotal.date, StudyDailyTotal.total_seconds).filter(
+        StudyDailyTotal.user_id == user_id,
+        StudyDailyTotal.date.between(window_start, today),
+        StudyDailyTotal.total_seconds > 0
+    ).order_by(StudyDailyTotal.date.desc()).all()
+
+    today_total = study_days[0].total_seconds if study_days and study_days[0].date == today else 0
+    streak = 0
+    expected = today
+    for study_date, _ in study_days:
+        if study_date != expected:
+            break
+        streak += 1
+        expected -= timedelta(days=1)
+    return streak, today_total
+
+
+def get_study_streak(user_id, today):
+    """오늘부터 거꾸로 이어지는 연속 학습 일수"""
+    return get_streak_and_today_total(user_id, today)[0]
+
+
+def get_study_window_aggregates(user_id, start_date, end_date, prev_start, prev_end):
+    """
+    공부 분석용 study_logs 집계를 한 번의 쿼리로 계산
+    현재 기간과 이전 기간을 합친 범위를 (과목, 날짜)로 GROUP BY 한 뒤 기간별로 나눕니다.
+    반환: {
+        "daily": {date: 초} (현재 기간), "subjects": {subject_id: {"name", "semester_id", "time"}} (현재 기간, 개인 공부는 None 키),
+        "total": 현재 기간 총 초, "previous_total": 이전 기간 총 초, "log_count": 현재 기간 로그 수
+    }
+    """
+    from models import db, StudyLog, Subject
+
+    rows = db.session.query(
+        StudyLog.subject_id,
+        Subject.name,
+        Subject.semester_id,
+        StudyLog.date,
+        func.sum(StudyLog.duration_seconds),
+        func.count()  # entry_id는 인덱스에 없으므로 COUNT(*) (Index Only Scan 유지)
+    ).outerjoin(
+        Subject, Subject.id == StudyLog.subject_id
+    ).filter(
+        StudyLog.user_id == user_id,
+        StudyLog.date.between(min(start_date, prev_start), max(end_date, prev_end))
+    ).group_by(
+        StudyLog.subject_id, Subject.name, Subject.semester_id, StudyLog.date
+    ).all()
+
+    aggregates = {'daily': {}, 'subjects': {}, 'total': 0, 'previous_total': 0, 'log_count': 0}
+    for subject_id, subject_name, semester_id, log_date, seconds, log_count in rows:
+        seconds = int(seconds or 0)
+        if prev_start <= log_date <= prev_end:
+            aggregates['previous_total'] += seconds
+        if not start_date <= log_date <= end_date:
+            continue
+        aggregates['total'] += seconds
+        aggregates['log_count'] += log_count
+        aggregates['daily'][log_date] = aggregates['daily'].get(log_date, 0) + seconds
+        subject = aggregates['subjects'].setdefault(subject_id, {'name': subject_name, 'semester_id': semester_id, 'time': 0})
+        subject['time'] += seconds
+    return aggregates
+
+
+def rebuild_daily_totals(user_id=None):
+    """study_logs로부터 일일 집계를 다시 생성 (백필/복구용). 생성된 행 수 반환"""
+    from models import db, StudyLog, StudyDailyTotal
+
+    delete_query = StudyDailyTotal.query
+    source = select(
+        StudyLog.user_id,
+        StudyLog.date,
+        func.sum(StudyLog.duration_seconds),
+        func.count(StudyLog.entry_id)
+    )
+    if user_id:
+        delete_query = delete_query.filter_by(user_id=user_id)
+        source = source.where(StudyLog.user_id == user_id)
+    source = source.group_by(StudyLog.user_id, StudyLog.date)
+
+    delete_query.delete(synchronize_session=False)
+    result = db.session.execute(
+        StudyDailyTotal.__table__.insert().from_select(
+            ['user_id', 'date', 'total_seconds', 'session_count'], source
+        )
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,337 @@
+"""
+쓰기 지연(write-behind) 큐 서비스
+요청마다 트랜잭션을 여는 작은 쓰기(게시물 좋아요 토글)를 프로세스 내 큐에 모았다가
+백그라운드 스레드가 주기적으로(또는 일정 개수가 쌓이면) 일괄 반영합니다.
+
+- (post_id, user_id)별로 최종 상태만 남김 (좋아요 후 취소는 쓰기 없이 상쇄)
+- 반영 전 요청에는 대기 중인 상태를 덧붙여 응답 - 같은 프로세스(gunicorn 워커)의 대기 상태만 보이므로,
+  다른 워커에 대기 중인 변경이 있으면 응답의 like_count가 반영 주기(수백 ms) 동안 실제와 다를 수 있음
+  (반영 시에는 실제로 추가/삭제된 행 수만큼만 like_count를 바꾸므로 저장된 값은 어긋나지 않음)
+- 클라이언트는 토글 대신 원하는 좋아요 상태를 보내므로 재전송/중복 요청은 결과를 바꾸지 않음
+  [한계] 반영 주기 안에 같은 게시물의 좋아요와 취소가 서로 다른 워커로 나뉘면, 나중 워커는 앞선 워커의 대기 상태를
+  볼 수 없어 DB 상태 기준으로 판단하므로 앞선 변경이 최종 상태로 남을 수 있음 (다시 누르면 원하는 상태로 맞춰짐)
+- 공부 기록은 요청이 성공하면 클라이언트가 버퍼를 비우므로 큐에 넣지 않고 요청 안에서 바로 저장합니다.
+프로세스 종료 시 app.py의 atexit 훅이 남은 작업을 반영합니다.
+"""
+import os
+import threading
+import time
+from contextlib import nullcontext
+from flask import current_app, has_app_context
+from sqlalchemy import case, select, tuple_
+from utils.constants import WRITE_BEHIND_FLUSH_INTERVAL_SECONDS, WRITE_BEHIND_FLUSH_THRESHOLD
+from utils.helpers import get_upsert_insert
+
+
+def _flush_post_likes(likes):
+    """
+    좋아요 최종 상태 {(post_id, user_id): liked}를 반영하고 실제로 바뀐 행 수만큼 like_count 갱신 (commit은 호출자가 수행)
+    INSERT 1회 + 기존 행 조회/DELETE 각 1회 + 카운터 UPDATE 1회
+    """
+    from models import db, Post, PostLike
+
+    to_like = [key for key, liked in likes.items() if liked]
+    to_unlike = [key for key, liked in likes.items() if not liked]
+    deltas = {}
+
+    if to_like:
+        rows = [{'post_id': post_id, 'user_id': user_id} for post_id, user_id in to_like]
+        insert = get_upsert_insert(db.session)
+        if insert is not None:
+            stmt = insert(PostLike).values(rows).on_conflict_do_nothing(
+                index_elements=[PostLike.post_id, PostLike.user_id]
+            ).returning(PostLike.post_id)
+            inserted = db.session.execute(stmt).scalars().all()
+        else:
+            existing = set(db.session.execute(
+                select(PostLike.post_id, PostLike.user_id).where(tuple_(PostLike.post_id, PostLike.user_id).in_(to_like))
+            ).tuples())
+            missing = [row for row in rows if (row['post_id'], row['user_id']) not in existing]
+            if missing:
+                db.session.execute(PostLike.__table__.insert(), missing)
+            inserted = [row['post_id'] for row in missing]
+        for post_id in inserted:
+            deltas[post_id] = deltas.get(post_id, 0) + 1
+
+    if to_unlike:
+        pair_filter = tuple_(PostLike.post_id, PostLike.user_id).in_(to_unlike)
+        deleted = db.session.execute(select(PostLike.post_id).where(pair_filter)).scalars().all()
+        if deleted:
+            db.session.execute(PostLike.__table__.delete().where(pair_filter))
+        for post_id in deleted:
+            deltas[post_id] = deltas.get(post_id, 0) - 1
+
+    deltas = {post_id: delta for post_id, delta in deltas.items() if delta}
+    if deltas:
+        db.session.execute(
+            Post.__table__.update().where(Post.id.in_(list(deltas))).values(
+                like_count=Post.like_count + case(deltas, value=Post.id, else_=0)
+            )
+        )
+
+
+class WriteBehindQueue:
+    """프로세스 내 쓰기 지연 큐 (요청 스레드는 enqueue만, 반영은 백그라운드 스레드가 수행)"""
+
+    def __init__(self, flush_interval, flush_threshold, enabled=None):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._enabled = enabled
+        self._app = None
+        self._thread = None
+        self._stopping = False
+        self._lock = threading.Lock()        # 대기열/보정값 보호
+        self._flush_lock = threading.Lock()  # 반영은 한 번에 하나만
+        self._wakeup = threading.Event()
+
+        self._likes = {}              # (post_id, user_id) -> (반영된 상태, 원하는 상태)
+        self._in_flight_likes = {}    # (post_id, user_id) -> 반영 중인 상태
+        self._like_deltas = {}        # post_id -> 대기+반영 중인 like_count 변화량 (응답 보정용)
+
+        self._metrics = {
+            'enqueued': 0,        # 요청된 쓰기 수
+            'coalesced': 0,       # 다른 대기 작업과 합쳐지거나 상쇄되어 별도로 쓰지 않은 쓰기 수
+            'flushes': 0,
+            'flushed_items': 0,
+            'failed_items': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0
+        }
+
+    @property
+    def enabled(self):
+        """
+        큐 사용 여부 - enabled를 지정하지 않으면 처음 사용할 때 WRITE_BEHIND_ENABLED 환경 변수를 읽음
+        (모듈 import는 app.py의 load_dotenv()보다 먼저 일어나므로 import 시점에 읽으면 .env 값이 반영되지 않음)
+        """
+        if self._enabled is None:
+            self._enabled = os.environ.get('WRITE_BEHIND_ENABLED', 'True').lower() == 'true'
+        return self._enabled
+
+    # --- 시작/종료 ---
+
+    def start(self, app):
+        """백그라운드 스레드 시작 (첫 enqueue 때 호출, 이미 시작된 경우 무시)"""
+        with self._lock:
+            if self._thread is not None or not self.enabled:
+                self._app = self._app or app
+                return
+            self._app = app
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """스레드를 멈추고 남은 작업을 반영 (app.py의 atexit 훅에서 호출)"""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=10)
+        self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error in write-behind worker: {e}")
+
+    def _after_enqueue(self, depth):
+        if not self.enabled:
+            # 큐 비활성화(WRITE_BEHIND_ENABLED=false): 요청 스레드에서 바로 반영
+            self._app = current_app._get_current_object()
+            self.flush()
+            return
+        if self._thread is None:
+            self.start(current_app._get_current_object())
+        if depth >= self.flush_threshold:
+            self._wakeup.set()
+
+    # --- 좋아요 ---
+
+    def _current_like_state(self, key):
+        """대기/반영 중인 좋아요 상태 (없으면 None - DB 조회 필요), self._lock 안에서 호출"""
+        if key in self._likes:
+            return self._likes[key][1]
+        return self._in_flight_likes.get(key)
+
+    def toggle_post_like(self, post_id, user_id, load_persisted):
+        """좋아요 토글을 큐에 넣고 토글 후 상태(True=좋아요) 반환"""
+        return self.set_post_like(post_id, user_id, None, load_persisted)
+
+    def set_post_like(self, post_id, user_id, liked, load_persisted):
+        """
+        좋아요 상태를 liked로 정하는 작업을 큐에 넣고 그 상태 반환 (liked=None이면 현재 상태를 뒤집음)
+        같은 상태를 다시 요청해도 결과가 같으므로 재전송/중복 클릭에 안전합니다.
+        load_persisted(): 대기 중인 상태가 없을 때 DB의 현재 상태를 읽는 함수
+        """
+        key = (post_id, user_id)
+        persisted = None
+        while True:
+            with self._lock:
+                pending = key in self._likes
+                if pending:
+                    base, current = self._likes[key]
+                else:
+                    base = current = self._in_flight_likes.get(key, persisted)
+                if base is not None:
+                    if liked is None:
+                        liked = not current
+                    if liked != current:
+                        self._add_like_delta(post_id, 1 if liked else -1)
+                    if liked == base:
+                        # 대기 중인 작업과 상쇄되거나 이미 그 상태 -> 쓰기 없음
+                        self._likes.pop(key, None)
+                        self._metrics['coalesced'] += 2 if pending else 1
+                    else:
+                        self._likes[key] = (base, liked)
+                        if pending:
+                            self._metrics['coalesced'] += 1
+                    break
+            # 대기/반영 중인 상태가 없으면 DB 상태를 읽고 다시 확인 (락 밖에서 조회)
+            persisted = load_persisted()
+
+        with self._lock:
+            self._metrics['enqueued'] += 1
+            depth = self._depth()
+        self._after_enqueue(depth)
+        return liked
+
+    def _add_like_delta(self, post_id, amount):
+        """like_count 보정값 갱신, self._lock 안에서 호출"""
+        delta = self._like_deltas.get(post_id, 0) + amount
+        if delta:
+            self._like_deltas[post_id] = delta
+        else:
+            self._like_deltas.pop(post_id, None)
+
+    def get_pending_like_delta(self, post_id):
+        """아직 반영되지 않은 like_count 변화량"""
+        with self._lock:
+            return self._like_deltas.get(post_id, 0)
+
+    def apply_pending_likes(self, user_id, liked_post_ids, post_ids):
+        """DB 기준 좋아요 게시물 집합에 대기 중인 토글을 반영한 집합 반환"""
+        liked_post_ids = set(liked_post_ids)
+        with self._lock:
+            for post_id in post_ids:
+                state = self._current_like_state((post_id, user_id))
+                if state is True:
+                    liked_post_ids.add(post_id)
+                elif state is False:
+                    liked_post_ids.discard(post_id)
+        return liked_post_ids
+
+    # --- 반영 ---
+
+    def _depth(self):
+        return len(self._likes)
+
+    def flush(self):
+        """대기 중인 작업을 한 트랜잭션으로 반영 (실패 시 게시물 단위로 나누어 재시도). 반영한 작업 수 반환"""
+        with self._flush_lock:
+            with self._lock:
+                likes, self._likes = self._likes, {}
+                self._in_flight_likes = {key: desired for key, (_, desired) in likes.items()}
+            if not likes:
+                return 0
+            if self._app is None:
+                print(f"Write-behind queue has no app; dropping {len(likes)} pending writes.")
+                return 0
+
+            like_states = {key: desired for key, (_, desired) in likes.items()}
+
+            started = time.perf_counter()
+            failed = 0
+            # 요청 안에서 바로 반영하는 경우(큐 비활성화)는 요청의 세션을 그대로 사용
+            in_request_app = has_app_context() and current_app._get_current_object() is self._app
+            with nullcontext() if in_request_app else self._app.app_context():
+                if not self._commit(lambda: _flush_post_likes(like_states)):
+                    # 삭제된 게시물 등 일부 작업 때문에 전체가 실패하지 않도록 게시물 단위로 재시도
+                    for post_id in {post_id for post_id, _ in like_states}:
+                        post_likes = {key: liked for key, liked in like_states.items() if key[0] == post_id}
+                        if not self._commit(lambda: _flush_post_likes(post_likes)):
+                            failed += len(post_likes)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            with self._lock:
+                self._in_flight_likes = {}
+                for (post_id, _), liked in like_states.items():
+                    self._add_like_delta(post_id, -1 if liked else 1)
+
+                count = len(likes)
+                self._metrics['flushes'] += 1
+                self._metrics['flushed_items'] += count - failed
+                self._metrics['failed_items'] += failed
+                self._metrics['last_flush_ms'] = elapsed_ms
+                self._metrics['max_flush_ms'] = max(self._metrics['max_flush_ms'], elapsed_ms)
+                self._metrics['total_flush_ms'] += elapsed_ms
+            if failed:
+                print(f"Write-behind flush dropped {failed} writes after retry.")
+            return count - failed
+
+    @staticmethod
+    def _commit(apply):
+        from models import db
+
+        try:
+            apply()
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error flushing write-behind queue: {e}")
+            return False
+
+    def get_metrics(self):
+        """큐 길이, 반영 지연 시간, 병합 비율"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['queue_depth'] = self._depth()
+        metrics['coalescing_ratio'] = round(metrics['coalesced'] / metrics['enqueued'], 4) if metrics['enqueued'] else 0.0
+        metrics['avg_flush_ms'] = round(metrics['total_flush_ms'] / metrics['flushes'], 3) if metrics['flushes'] else 0.0
+        for name in ('last_flush_ms', 'max_flush_ms', 'total_flush_ms'):
+            metrics[name] = round(metrics[name], 3)
+        metrics['enabled'] = self.enabled
+        metrics['running'] = self._thread is not None and self._thread.is_alive()
+        return metrics
+
+
+write_behind_queue = WriteBehindQueue(WRITE_BEHIND_FLUSH_INTERVAL_SECONDS, WRITE_BEHIND_FLUSH_THRESHOLD)
+
+
+def queue_post_like(post_id, user_id, liked=None):
+    """좋아요 상태 변경을 쓰기 지연 큐에 넣고 변경 후 상태(True=좋아요) 반환 (liked=None이면 토글)"""
+    from models import db, PostLike
+
+    def load_persisted():
+        return db.session.query(PostLike.id).filter_by(post_id=post_id, user_id=user_id).first() is not None
+
+    return write_behind_queue.set_post_like(post_id, user_id, liked, load_persisted)
+
+
+def get_pending_like_delta(post_id):
+    return write_behind_queue.get_pending_like_delta(post_id)
+
+
+def apply_pending_likes(user_id, liked_post_ids, post_ids):
+    return write_behind_queue.apply_pending_likes(user_id, liked_post_ids, post_ids)
+
+
+def flush_write_behind():
+    """대기 중인 작업을 즉시 반영"""
+    return write_behind_queue.flush()
+
+
+def stop_write_behind():
+    """백그라운드 스레드를 멈추고 남은 작업 반영 (프로세스 종료 시)"""
+    write_behind_queue.stop()
+
+
+def get_write_behind_metrics():
+    return write_behind_queue.get_metrics()
@@ -939,11 +939,14 @@ async function loadEventToForm(eventId) {
         if(eventRecurrenceEndDateInput) eventRecurrenceEndDateInput.value = '';
     }
 
-    const startDate = event.start.split('T')[0];
+    // 반복 일정의 개별 발생이면 반복 전체(원본)의 시작/종료를 사용
+    const eventStart = event.extendedProps.series_start || event.start;
+    const eventEnd = event.extendedProps.series_start ? event.extendedProps.series_end : event.end;
+    const startDate = eventStart.split('T')[0];
     if(eventStartDateInput) eventStartDateInput.value = startDate;
     let endDate = '';
-    if (event.end) {
-        endDate = event.end.split('T')[0];
+    if (eventEnd) {
+        endDate = eventEnd.split('T')[0];
         if (event.allDay) {
             const endDateObj = new Date(endDate + 'T00:00:00');
             endDateObj.setDate(endDateObj.getDate() - 1); endDate = formatDate(endDateObj);
@@ -951,12 +954,12 @@ async function loadEventToForm(eventId) {
     }
     if(eventEndDateInput) eventEndDateInput.value = endDate;
 
-    if (!event.allDay && event.start.includes('T')) {
-        const startTime = event.start.split('T')[1].substring(0, 5);
+    if (!event.allDay && eventStart.includes('T')) {
+        const startTime = eventStart.split('T')[1].substring(0, 5);
         if(startTimeInput) { startTimeInput.value = startTime; startTimeInput.style.display = 'block'; }
         let endTime = '';
-        if (event.end && event.end.includes('T')) {
-            endTime = event.end.split('T')[1].substring(0, 5);
+        if (eventEnd && eventEnd.includes('T')) {
+            endTime = eventEnd.split('T')[1].substring(0, 5);
         }
         if(endTimeInput) { endTimeInput.value = endTime; endTimeInput.style.display = 'block'; }
     } else {
@@ -33,6 +33,110 @@ document.addEventListener('DOMContentLoaded', () => {
         // communityFeed.addEventListener('submit', (e) => { ... });
     }
 
+    // --- [신규] 무한 스크롤: 센티널이 보이면 다음 페이지 로드 ---
+    const feedSentinel = document.getElementById('feedSentinel');
+    let nextCursor = communityFeed ? (communityFeed.dataset.nextCursor || null) : null;
+    let isLoadingPage = false;
+
+    if (communityFeed && feedSentinel && 'IntersectionObserver' in window) {
+        const observer = new IntersectionObserver((entries) => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadNextPage();
+            }
+        }, { rootMargin: '400px 0px' });
+        observer.observe(feedSentinel);
+    }
+
+    /**
+     * 커서 기반으로 다음 피드 페이지를 가져와 그리드 끝에 추가합니다.
+     */
+    async function loadNextPage() {
+        if (isLoadingPage || !nextCursor) return;
+        isLoadingPage = true;
+
+        const category = communityFeed.dataset.category || 'all';
+        const params = new URLSearchParams({ category, cursor: nextCursor });
+
+        try {
+            const response = await fetch(`/api/community/posts?${params.toString()}`);
+            const result = await response.json();
+
+            if (result.status !== 'success') {
+                throw new Error(result.message || '게시물 조회 실패');
+            }
+
+            const fragment = document.createDocumentFragment();
+            result.posts.forEach(post => fragment.appendChild(createPostCard(post)));
+            communityFeed.appendChild(fragment);
+
+            nextCursor = result.next_cursor;
+            communityFeed.dataset.nextCursor = nextCursor || '';
+        } catch (error) {
+            console.error('Feed page error:', error);
+        } finally {
+            isLoadingPage = false;
+        }
+    }
+
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text == null ? '' : String(text);
+        return div.innerHTML;
+    }
+
+    /**
+     * fragments/_post_card.html 과 같은 구조의 게시물 카드를 생성합니다.
+     */
+    function createPostCard(post) {
+        const article = document.createElement('article');
+        article.className = 'post-card';
+        article.dataset.postId = post.id;
+
+        let avatarIcon = '<i class="fas fa-user"></i>';
+        if (post.author_permission === 'admin') {
+            avatarIcon = '<i class="fas fa-shield-alt" title="관리자"></i>';
+        } else if (post.author_permission === 'associate') {
+            avatarIcon = '<i class="fas fa-user-tie" title="협력회원"></i>';
+        }
+
+        const images = post.image_filenames || [];
+        const imagesHtml = images.length ? `
+                <div class="post-card-images cols-${Math.min(images.length, 3)}">
+                    ${images.map(filename => `<img src="/uploads/${encodeURIComponent(filename)}" alt="${escapeHtml(post.title)} 이미지" class="post-card-image">`).join('')}
+                </div>` : '';
+
+        article.innerHTML = `
+            <header class="post-card-header">
+                <div class="post-author-avatar">${avatarIcon}</div>
+                <div class="post-author-info">
+                    <span class="post-author-name">${escapeHtml(post.author_name)}</span>
+                    <span class="post-timestamp">${escapeHtml(post.created_at_kst)} (KST)</span>
+                </div>
+            </header>
+            <a href="/post/${post.id}" class="post-card-link-wrapper">
+                <div class="post-card-body">
+                    <h2 class="post-card-title">${escapeHtml(post.title)}</h2>
+                    <div class="post-card-content-preview">${post.content || ''}</div>
+                    ${imagesHtml}
+                </div>
+            </a>
+            <footer class="post-card-actions">
+                <button class="action-button like-btn ${post.liked ? 'liked' : ''}" data-post-id="${post.id}">
+                    <i class="fas fa-heart"></i>
+                    <span class="like-count">${post.like_count}</span>
+                </button>
+                <a href="/post/${post.id}" class="action-button comment-btn">
+                    <i class="fas fa-comment-alt"></i>
+                    <span class="comment-count">${post.comment_count}</span>
+                </a>
+                <button class="action-button share-btn" data-post-id="${post.id}">
+                    <i class="fas fa-share-alt"></i>
+                    <span>공유</span>
+                </button>
+            </footer>`;
+        return article;
+    }
+
     /**
      * 서버에 좋아요/좋아요 취소를 요청합니다.
      * (이 함수는 피드 페이지에 남아 있어야 합니다)
@@ -46,8 +150,11 @@ document.addEventListener('DOMContentLoaded', () => {
         const currentCount = parseInt(countSpan.textContent, 10);
 
         try {
+            // 토글 대신 원하는 상태를 보내 재전송/중복 요청에도 결과가 같도록 함
             const response = await fetch(`/api/posts/${postId}/like`, {
                 method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ liked: !isLiked })
             });
             const result = await response.json();
 
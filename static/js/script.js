@@ -3,6 +3,7 @@ let timerInterval = null;
 let shuttleUpdateInterval = null; // 셔틀버스 실시간 업데이트 인터벌
 let timerSeconds = 0;
 let isTimerRunning = false;
+let timerSavedSeconds = 0; // 페이지를 벗어날 때 이미 버퍼에 넘긴 시간 (초)
 let todayStudyTime = 0; // DB에서 불러온 오늘의 총 공부 시간 (초)
 
 let currentTimetableItem = null; // 현재 선택된 'Subject' 객체
@@ -169,11 +170,12 @@ function stopTimer() {
         document.getElementById('startTimer').disabled = false;
         document.getElementById('stopTimer').disabled = true;
 
-        saveStudyTime(timerSeconds).then(() => {
+        saveStudyTime(timerSeconds - timerSavedSeconds).then(() => {
             loadStudyStats();
         });
 
         timerSeconds = 0;
+        timerSavedSeconds = 0;
         updateTimerDisplay();
         updateTimerProgress();
     }
@@ -196,25 +198,27 @@ function updateTimerProgress() {
     if (circle) circle.style.strokeDashoffset = 283 - progress;
 }
 
+// 타이머 구간을 버퍼(study_buffer.js)에 넣고 바로 일괄 전송 (실패한 구간은 버퍼에 남아 자동 재전송)
 async function saveStudyTime(durationToAdd) {
     if (durationToAdd <= 0) return;
-    const data = {
-        duration_to_add: durationToAdd,
-        date: new Date().toISOString().split('T')[0]
-    };
+    window.StudyTimeBuffer.add(durationToAdd, null);
     try {
-        const response = await fetch('/api/study-time', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(data)
-        });
-        if (!response.ok) throw new Error('Server error');
+        await window.StudyTimeBuffer.flush();
     } catch (error) {
         console.error('Failed to save study time:', error);
-        alert('공부 시간 저장에 실패했습니다.');
+        alert('공부 시간 저장에 실패했습니다. 잠시 후 자동으로 다시 저장합니다.');
     }
 }
 
+// 타이머가 켜진 채로 페이지를 벗어나면 그때까지의 시간을 구간으로 넘김 (sendBeacon으로 전송됨)
+if (window.StudyTimeBuffer) {
+    window.StudyTimeBuffer.onUnload(() => {
+        if (!isTimerRunning || timerSeconds <= timerSavedSeconds) return;
+        window.StudyTimeBuffer.add(timerSeconds - timerSavedSeconds, null);
+        timerSavedSeconds = timerSeconds;
+    });
+}
+
 async function loadStudyStats() {
     try {
         const response = await fetch('/api/study-stats');
@@ -21,7 +21,8 @@
             seconds: 0,
             interval: null,
             selectedSubject: null,
-            startTime: null
+            startTime: null,
+            savedSeconds: 0 // 페이지를 벗어날 때 이미 버퍼에 넘긴 시간 (초)
         },
         charts: {
             main: null,
@@ -265,33 +266,14 @@
             return await response.json();
         },
 
-        // 공부 시간 저장 (과목별)
-        async saveStudyTime(subjectId, seconds, date) {
-            const response = await fetch('/api/study-log/subject', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    subject_id: subjectId,
-                    duration_seconds: seconds,
-                    date_str: utils.formatDate(date)
-                })
-            });
-            if (!response.ok) throw new Error('학습 시간을 저장할 수 없습니다.');
-            return await response.json();
-        },
-
-        // 공부 시간 저장 (개인)
-        async savePersonalStudyTime(seconds, date) {
-            const response = await fetch('/api/study-time', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    duration_to_add: seconds,
-                    date: utils.formatDate(date)
-                })
-            });
-            if (!response.ok) throw new Error('학습 시간을 저장할 수 없습니다.');
-            return await response.json();
+        // 공부 시간 저장 (subjectId가 없으면 개인 공부) - 버퍼에 넣고 일괄 전송, 실패한 구간은 버퍼에 남아 자동 재전송
+        async saveStudyTime(subjectId, seconds) {
+            if (seconds > 0) window.StudyTimeBuffer.add(seconds, subjectId || null);
+            try {
+                return await window.StudyTimeBuffer.flush();
+            } catch (error) {
+                throw new Error('학습 시간을 저장할 수 없습니다.');
+            }
         }
     };
 
@@ -838,12 +820,8 @@
             utils.showLoading(true);
 
             try {
-                // API 호출
-                if (subjectId) {
-                    await api.saveStudyTime(subjectId, seconds, new Date());
-                } else {
-                    await api.savePersonalStudyTime(seconds, new Date());
-                }
+                // API 호출 (페이지를 벗어날 때 이미 넘긴 시간은 제외)
+                await api.saveStudyTime(subjectId, seconds - state.timer.savedSeconds);
 
                 utils.showNotification(`${utils.formatDuration(seconds)} 학습 완료!`, 'success');
 
@@ -864,6 +842,7 @@
             state.timer.seconds = 0;
             state.timer.selectedSubject = null;
             state.timer.startTime = null;
+            state.timer.savedSeconds = 0;
             this.updateDisplay();
             this.updateCircle();
             this.updateUI();
@@ -1166,6 +1145,18 @@
 
         elements.stopBtn.addEventListener('click', () => timer.stop());
 
+        // 타이머가 켜진 채로 페이지를 벗어나면 그때까지의 시간을 구간으로 넘김 (sendBeacon으로 전송됨)
+        window.StudyTimeBuffer.onUnload(() => {
+            if (!state.timer.isRunning) return;
+            if (!state.timer.isPaused) {
+                state.timer.seconds = Math.floor((Date.now() - state.timer.startTime) / 1000);
+            }
+            const unsaved = state.timer.seconds - state.timer.savedSeconds;
+            if (unsaved <= 0) return;
+            window.StudyTimeBuffer.add(unsaved, state.timer.selectedSubject);
+            state.timer.savedSeconds = state.timer.seconds;
+        });
+
         // 목표 저장
         elements.saveGoalBtn.addEventListener('click', () => {
             const goal = parseFloat(elements.dailyGoalInput.value);
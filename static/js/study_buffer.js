@@ -0,0 +1,150 @@
+// ===========================
+// 공부 시간 구간 버퍼 (홈 타이머 / 학습 분석 타이머 공용)
+// ===========================
+// 타이머 구간을 localStorage에 모았다가 /api/study-log/batch로 한 번에 전송합니다.
+// 구간마다 고유 key를 붙이므로 전송 결과를 모르는 경우(페이지 종료, 네트워크 오류) 다시 보내도 한 번만 저장됩니다.
+
+(function() {
+    'use strict';
+
+    const BATCH_URL = '/api/study-log/batch';
+    // 같은 브라우저의 다른 계정 구간이 섞이지 않도록 사용자별로 저장 (<script data-user="학번">)
+    const STORAGE_KEY = `studyTimeBuffer:${(document.currentScript && document.currentScript.dataset.user) || ''}`;
+    const MAX_BATCH_SIZE = 200;       // 서버 STUDY_BATCH_MAX_SEGMENTS와 동일
+    const FLUSH_THRESHOLD = 20;       // 이만큼 쌓이면 바로 전송
+    const FLUSH_INTERVAL_MS = 30000;  // 남은 구간 주기적 재전송
+
+    const unloadHandlers = [];
+    let flushing = null;
+
+    function createKey() {
+        if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+            return window.crypto.randomUUID();
+        }
+        return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+    }
+
+    function load() {
+        try {
+            const segments = JSON.parse(localStorage.getItem(STORAGE_KEY) || '[]');
+            return Array.isArray(segments) ? segments : [];
+        } catch (error) {
+            return [];
+        }
+    }
+
+    function save(segments) {
+        try {
+            if (segments.length) {
+                localStorage.setItem(STORAGE_KEY, JSON.stringify(segments));
+            } else {
+                localStorage.removeItem(STORAGE_KEY);
+            }
+        } catch (error) {
+            console.warn('Could not persist study time buffer:', error);
+        }
+    }
+
+    // 구간 추가 (seconds: 공부한 시간, subjectId: 과목 ID 또는 null(개인 공부), endedAt: 종료 시각 ms)
+    function add(seconds, subjectId = null, endedAt = Date.now()) {
+        seconds = Math.floor(seconds);
+        if (!(seconds > 0)) return null;
+
+        const segment = {
+            key: createKey(),
+            subject_id: subjectId ? Number(subjectId) : null,
+            duration_seconds: seconds,
+            ended_at: endedAt
+        };
+        const segments = load();
+        segments.push(segment);
+        save(segments);
+
+        if (segments.length >= FLUSH_THRESHOLD) {
+            flush().catch(error => console.warn('Study time flush failed:', error.message));
+        }
+        return segment.key;
+    }
+
+    // 서버가 처리한 구간(저장/중복/거부)을 버퍼에서 제거
+    function acknowledge(result) {
+        const done = new Set([...result.inserted, ...result.duplicates, ...result.rejected]);
+        save(load().filter(segment => !done.has(segment.key)));
+    }
+
+    async function sendBatch(segments) {
+        const response = await fetch(BATCH_URL, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ segments })
+        });
+        // 로그인이 풀린 경우 로그인 페이지로 리다이렉트됨 - 구간은 남겨두고 다시 로그인하면 전송
+        if (!response.ok || response.redirected) throw new Error('Server error or not logged in');
+        const result = (await response.json()).data;
+        acknowledge(result);
+        return result;
+    }
+
+    // 쌓인 구간 전송. 반환: 날짜별 총 공부 시간 {YYYY-MM-DD: 초} (보낼 구간이 없으면 빈 객체)
+    function flush() {
+        if (flushing) {
+            return flushing.then(() => flush());
+        }
+        flushing = (async () => {
+            const dayTotals = {};
+            let segments = load();
+            while (segments.length) {
+                const result = await sendBatch(segments.slice(0, MAX_BATCH_SIZE));
+                Object.assign(dayTotals, result.day_totals);
+                const remaining = load();
+                if (remaining.length >= segments.length) break; // 처리된 구간이 없으면 중단 (무한 반복 방지)
+                segments = remaining;
+            }
+            return dayTotals;
+        })();
+        return flushing.finally(() => { flushing = null; });
+    }
+
+    // 페이지 종료 시 sendBeacon으로 전송 (결과를 알 수 없으므로 버퍼는 남겨두고 다음 방문 때 재전송 - 중복은 key로 무시됨)
+    function beacon() {
+        unloadHandlers.forEach(handler => {
+            try {
+                handler();
+            } catch (error) {
+                console.warn('Study time unload handler failed:', error);
+            }
+        });
+
+        const segments = load();
+        if (!segments.length || !navigator.sendBeacon) return;
+        const body = new Blob(
+            [JSON.stringify({ segments: segments.slice(0, MAX_BATCH_SIZE) })],
+            { type: 'text/plain' }
+        );
+        navigator.sendBeacon(BATCH_URL, body);
+    }
+
+    // 페이지 종료 직전에 실행할 함수 등록 (진행 중인 타이머 구간을 add()로 넘길 때 사용)
+    function onUnload(handler) {
+        unloadHandlers.push(handler);
+    }
+
+    window.addEventListener('pagehide', beacon);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') beacon();
+    });
+
+    // 이전 방문에서 남은 구간 전송 + 주기적 재시도
+    function flushPending() {
+        if (!load().length) return;
+        flush().catch(error => console.warn('Study time flush failed:', error.message));
+    }
+    setInterval(flushPending, FLUSH_INTERVAL_MS);
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', flushPending);
+    } else {
+        flushPending();
+    }
+
+    window.StudyTimeBuffer = { add, flush, onUnload, pendingCount: () => load().length };
+})();
@@ -116,7 +116,12 @@ document.addEventListener('DOMContentLoaded', () => {
         const currentCount = parseInt(likeCountEl.textContent, 10);
 
         try {
-            const response = await fetch(`/api/posts/${postId}/like`, { method: 'POST' });
+            // 토글 대신 원하는 상태를 보내 재전송/중복 요청에도 결과가 같도록 함
+            const response = await fetch(`/api/posts/${postId}/like`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ liked: !isLiked })
+            });
             const result = await response.json();
 
             if (result.status === 'success') {
@@ -0,0 +1,96 @@
+"""
+테스트 공통 설정
+앱은 PostgreSQL 접속 정보로 초기화되므로, 테스트마다 메모리 SQLite 엔진으로 교체하여 빈 스키마를 만듭니다.
+"""
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+for _name, _value in {
+    'FLASK_SECRET_KEY': 'test-secret',
+    'DB_USER': 'test',
+    'DB_PASSWORD': 'test',
+    'DB_HOST': 'localhost',
+    'DB_PORT': '5432',
+    'DB_NAME': 'test',
+    'WRITE_BEHIND_ENABLED': 'False',
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import app as app_module  # noqa: E402
+from models import db, User  # noqa: E402
+from services import bump_system_events_version, invalidate_current_semester_cache  # noqa: E402
+
+TEST_USER_ID = '2023000001'
+
+
+@pytest.fixture
+def app():
+    flask_app = app_module.app
+    flask_app.config['TESTING'] = True
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    engines = db._app_engines[flask_app]
+    original_engine = engines[None]
+    engines[None] = engine
+    with flask_app.app_context():
+        db.create_all()
+        # 프로세스 캐시는 이전 테스트 DB의 행을 들고 있을 수 있으므로 비움
+        bump_system_events_version()
+        invalidate_current_semester_cache()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+    engines[None] = original_engine
+    engine.dispose()
+
+
+@pytest.fixture
+def user(app):
+    test_user = User(
+        id=TEST_USER_ID,
+        name='테스트',
+        dob='2000-01-01',
+        college='과학기술대학',
+        department='컴퓨터융합소프트웨어학과',
+        password_hash='x'
+    )
+    db.session.add(test_user)
+    db.session.commit()
+    return test_user
+
+
+@pytest.fixture
+def client(app, user):
+    """테스트 사용자로 로그인된 클라이언트"""
+    test_client = app.test_client()
+    with test_client.session_transaction() as sess:
+        sess['student_id'] = user.id
+    return test_client
+
+
+@pytest.fixture
+def count_queries(app):
+    """블록 안에서 실행된 SQL 문장 목록을 모으는 컨텍스트 (with count_queries() as statements: ...)"""
+    from contextlib import contextmanager
+
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+
+    return _count
@@ -0,0 +1,73 @@
+"""학사일정 인덱스 테스트 (파일 변경 확인 간격과 재로드)"""
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from services import academic_calendar_service as service
+
+
+@pytest.fixture
+def calendar_file(tmp_path, monkeypatch):
+    path = tmp_path / 'Calendar.csv'
+    path.write_text('2025,3,4,2025학년도 제1학기 개강\n2025,3,5~7,수강신청 정정 및 확인\n', encoding='utf-8')
+    clock = SimpleNamespace(now=1000.0)
+    stat_calls = []
+    original_get_mtime = service._get_calendar_mtime
+
+    def _counting_get_mtime():
+        stat_calls.append(clock.now)
+        return original_get_mtime()
+
+    monkeypatch.setattr(service, 'CALENDAR_PATH', str(path))
+    monkeypatch.setattr(service, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(service, '_get_calendar_mtime', _counting_get_mtime)
+    monkeypatch.setattr(service, '_academic_calendar', {'mtime': None, 'checked_at': 0.0, 'index': None})
+    return SimpleNamespace(path=path, clock=clock, stat_calls=stat_calls)
+
+
+def _rewrite(path, text):
+    path.write_text(text, encoding='utf-8')
+    # 같은 초 안에 다시 써도 mtime이 달라지도록
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_parses_entries_and_semester_starts(calendar_file):
+    index = service.get_academic_calendar()
+
+    assert index.get_semester_start('2025-03') == date(2025, 3, 4)
+    assert index.entries[1] == service.AcademicCalendarEntry(date(2025, 3, 5), date(2025, 3, 7), '수강신청 정정 및 확인')
+
+
+def test_mtime_is_checked_once_per_interval(calendar_file):
+    first = service.get_academic_calendar()
+    for _ in range(100):
+        assert service.get_academic_calendar() is first
+    assert len(calendar_file.stat_calls) == 1
+
+    calendar_file.clock.now += service.ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS
+    assert service.get_academic_calendar() is first
+    assert len(calendar_file.stat_calls) == 2
+
+
+def test_changed_file_is_reloaded_after_interval(calendar_file):
+    service.get_academic_calendar()
+    _rewrite(calendar_file.path, '2025,9,1,2025학년도 제2학기 개강\n')
+
+    # 확인 간격 안에서는 이전 인덱스를 그대로 사용
+    assert service.get_academic_calendar().get_semester_start('2025-09') is None
+
+    calendar_file.clock.now += service.ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS
+    index = service.get_academic_calendar()
+    assert index.get_semester_start('2025-09') == date(2025, 9, 1)
+    assert index.get_semester_start('2025-03') is None
+
+
+def test_unreadable_file_keeps_previous_index(calendar_file):
+    first = service.get_academic_calendar()
+    calendar_file.path.unlink()
+
+    calendar_file.clock.now += service.ACADEMIC_CALENDAR_CHECK_INTERVAL_SECONDS
+    assert service.get_academic_calendar() is first
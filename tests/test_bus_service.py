@@ -0,0 +1,71 @@
+"""셔틀버스 다음 출발편 조회 테스트"""
+from datetime import date, datetime
+
+import pytest
+
+from services import bus_service
+from services.bus_service import build_shuttle_index, get_next_departures, get_shuttle_day_type
+
+
+def _entry(time, day_type='평일', route_group='Jochiwon', route_code='School_to_Station'):
+    return {'time': time, 'route_code': route_code, 'route': route_code, 'type': day_type,
+            'note': route_group, 'route_group': route_group}
+
+
+@pytest.fixture
+def shuttle_index(monkeypatch):
+    # 2025-10-03(금) 개천절만 공휴일로 둠
+    monkeypatch.setattr(bus_service, 'load_holidays', lambda: [
+        {'year': 2025, 'month': 10, 'day': 3, 'name': '개천절', 'is_substitute': False}
+    ])
+    return build_shuttle_index([
+        _entry('09:00'), _entry('09:30'), _entry('10:00'),
+        _entry('09:10', route_group='Osong_Included'), _entry('09:40', route_group='Osong_Included'),
+        _entry('13:00', day_type='일요일'),
+        _entry('20:00', day_type='기타'),
+        _entry('09:05', route_code='Station_to_School'),
+        _entry('bad'),
+    ])
+
+
+def _times(departures):
+    return [d['time'] for d in departures]
+
+
+def test_day_type_uses_sunday_and_holiday_timetable(shuttle_index):
+    assert get_shuttle_day_type(shuttle_index, date(2025, 10, 2)) == '평일'
+    assert get_shuttle_day_type(shuttle_index, date(2025, 10, 3)) == '일요일'  # 공휴일(금)
+    assert get_shuttle_day_type(shuttle_index, date(2025, 10, 4)) == '평일'  # 토요일은 평일 시간표
+    assert get_shuttle_day_type(shuttle_index, date(2025, 10, 5)) == '일요일'
+
+
+def test_departures_merge_route_groups_in_time_order(shuttle_index):
+    day_type, departures = get_next_departures(shuttle_index, 'School_to_Station', datetime(2025, 10, 2, 8, 55), limit=10)
+
+    assert day_type == '평일'
+    assert _times(departures) == ['09:00', '09:10', '09:30', '09:40', '10:00', '20:00']
+    assert [d['route_group'] for d in departures[:2]] == ['Jochiwon', 'Osong_Included']
+    assert [d['minutes_until'] for d in departures[:3]] == [5, 15, 35]
+
+
+def test_limit_cuts_off_merged_departures(shuttle_index):
+    now = datetime(2025, 10, 2, 9, 0)  # 지금 출발하는 09:00 편은 제외
+
+    assert _times(get_next_departures(shuttle_index, 'School_to_Station', now, limit=2)[1]) == ['09:10', '09:30']
+    assert _times(get_next_departures(shuttle_index, 'School_to_Station', now, limit=1)[1]) == ['09:10']
+    assert _times(get_next_departures(
+        shuttle_index, 'School_to_Station', now, limit=2, route_group='Jochiwon'
+    )[1]) == ['09:30', '10:00']
+
+
+def test_holiday_and_sunday_use_sunday_departures(shuttle_index):
+    for now in (datetime(2025, 10, 3, 8, 0), datetime(2025, 10, 5, 8, 0)):
+        day_type, departures = get_next_departures(shuttle_index, 'School_to_Station', now)
+        assert day_type == '일요일'
+        assert _times(departures) == ['13:00', '20:00']
+
+
+def test_no_departures_after_last_bus_or_for_unknown_route(shuttle_index):
+    assert get_next_departures(shuttle_index, 'School_to_Station', datetime(2025, 10, 2, 21, 0))[1] == []
+    assert get_next_departures(shuttle_index, 'Nowhere', datetime(2025, 10, 2, 8, 0))[1] == []
+    assert shuttle_index['route_codes'] == {'School_to_Station', 'Station_to_School'}
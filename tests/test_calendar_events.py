@@ -0,0 +1,225 @@
+"""캘린더 이벤트 조회 테스트 (반복 일정 펼치기, 이벤트 수와 무관하게 쿼리 수가 일정한지 확인)"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models import db, CalendarCategory, CalendarEvent
+from models.calendar import compute_span_end_date
+from services.calendar_service import (
+    MAX_OCCURRENCES_PER_WINDOW,
+    bump_system_events_version,
+    expand_occurrence_dates
+)
+
+
+def _add_events(user_id, count):
+    """카테고리마다 일반/반복 일정을 하나씩 추가 (count개 카테고리)"""
+    for i in range(count):
+        category = CalendarCategory(user_id=user_id, name=f'카테고리{i}', color='#112233')
+        db.session.add(category)
+        db.session.flush()
+        db.session.add(CalendarEvent(
+            user_id=user_id, category_id=category.id, title=f'일정{i}',
+            start_date=date(2025, 3, 1) + timedelta(days=i % 28)
+        ))
+        db.session.add(CalendarEvent(
+            user_id=user_id, category_id=category.id, title=f'반복{i}',
+            start_date=date(2025, 3, 3), recurrence_type='weekly', recurrence_interval=1
+        ))
+    system_category = CalendarCategory(name='학사일정', color='#445566', is_system=True)
+    db.session.add(system_category)
+    db.session.flush()
+    db.session.add(CalendarEvent(
+        category_id=system_category.id, title=f'학사{count}', start_date=date(2025, 3, 10), is_system=True
+    ))
+    db.session.commit()
+
+
+def _count_request(client, count_queries, query_string):
+    bump_system_events_version()
+    with count_queries() as statements:
+        response = client.get('/api/calendar/events', query_string=query_string)
+    assert response.status_code == 200
+    return len(statements), response.get_json()['events']
+
+
+@pytest.mark.parametrize('query_string', [
+    {'start': '2025-03-01', 'end': '2025-04-01'},
+    {},
+])
+def test_event_load_query_count_does_not_grow_with_events(client, user, count_queries, query_string):
+    _add_events(user.id, 2)
+    few_queries, few_events = _count_request(client, count_queries, query_string)
+
+    _add_events(user.id, 20)
+    many_queries, many_events = _count_request(client, count_queries, query_string)
+
+    assert len(many_events) > len(few_events)
+    assert many_queries == few_queries
+
+
+def test_windowed_load_expands_occurrences_with_category_colors(client, user, count_queries):
+    _add_events(user.id, 3)
+
+    query_count, events = _count_request(client, count_queries, {'start': '2025-03-01', 'end': '2025-04-01'})
+
+    weekly = [e for e in events if e['title'] == '반복0']
+    assert [e['start'] for e in weekly] == ['2025-03-03', '2025-03-10', '2025-03-17', '2025-03-24', '2025-03-31']
+    assert {e['title'] for e in events if e['backgroundColor'] == '#445566'} == {'학사3'}
+    # 로그인 사용자 + 사용자 이벤트 + 카테고리 IN 조회 + 시스템 이벤트 월 캐시 적재(3월, 4월)
+    assert query_count == 6
+
+
+def _naive_occurrence_dates(start_date, end_date, recurrence_type, interval, recurrence_end_date, window_start, window_end):
+    """처음 발생부터 하나씩 순회하며 창과 겹치는 발생을 찾는 기준 구현"""
+    duration = (end_date or start_date) - start_date
+    last_start = min(window_end, recurrence_end_date) if recurrence_end_date else window_end
+    occurrences = []
+    count = 0
+    while True:
+        if recurrence_type in ('daily', 'weekly'):
+            occurrence = start_date + timedelta(days=count * interval * (1 if recurrence_type == 'daily' else 7))
+        else:
+            months = count * interval * (1 if recurrence_type == 'monthly' else 12)
+            year, month = start_date.year + (start_date.month - 1 + months) // 12, (start_date.month - 1 + months) % 12 + 1
+            if (year, month) > (last_start.year, last_start.month):
+                break
+            try:
+                occurrence = date(year, month, start_date.day)
+            except ValueError:  # 31일/윤일이 없는 달은 건너뜀
+                count += 1
+                continue
+        if occurrence > last_start:
+            break
+        if occurrence + duration >= window_start:
+            occurrences.append(occurrence)
+        count += 1
+    return occurrences
+
+
+@pytest.mark.parametrize('recurrence_type', ['daily', 'weekly', 'monthly', 'yearly'])
+def test_expand_occurrence_dates_matches_naive_expansion(recurrence_type):
+    rng = random.Random(recurrence_type)
+    for _ in range(300):
+        start_date = date(2020, 1, 1) + timedelta(days=rng.randrange(0, 2000))
+        end_date = start_date + timedelta(days=rng.choice([0, 0, 1, 3, 10])) if rng.random() < 0.5 else None
+        interval = rng.choice([1, 1, 2, 3])
+        recurrence_end_date = start_date + timedelta(days=rng.randrange(0, 3000)) if rng.random() < 0.5 else None
+        window_start = date(2020, 1, 1) + timedelta(days=rng.randrange(0, 3000))
+        window_end = window_start + timedelta(days=rng.choice([0, 6, 30, 41]))
+        args = (start_date, end_date, recurrence_type, interval, recurrence_end_date, window_start, window_end)
+
+        assert expand_occurrence_dates(*args) == _naive_occurrence_dates(*args), args
+
+
+def test_expand_occurrence_dates_edge_cases():
+    # 31일 매월 반복: 31일이 없는 달은 건너뜀
+    assert expand_occurrence_dates(
+        date(2025, 1, 31), None, 'monthly', 1, None, date(2025, 2, 1), date(2025, 5, 31)
+    ) == [date(2025, 3, 31), date(2025, 5, 31)]
+    # 윤일 매년 반복
+    assert expand_occurrence_dates(
+        date(2020, 2, 29), None, 'yearly', 1, None, date(2021, 1, 1), date(2028, 12, 31)
+    ) == [date(2024, 2, 29), date(2028, 2, 29)]
+    # 창 시작 전에 시작했지만 창까지 이어지는 여러 날 일정
+    assert expand_occurrence_dates(
+        date(2025, 3, 3), date(2025, 3, 5), 'weekly', 1, None, date(2025, 3, 12), date(2025, 3, 12)
+    ) == [date(2025, 3, 10)]
+    # 반복 종료일 이후의 창
+    assert expand_occurrence_dates(
+        date(2025, 3, 3), None, 'daily', 1, date(2025, 3, 10), date(2025, 3, 11), date(2025, 3, 20)
+    ) == []
+
+
+def test_expand_occurrence_dates_is_capped_per_window():
+    occurrences = expand_occurrence_dates(date(2000, 1, 1), None, 'daily', 1, None, date(2000, 1, 1), date(2010, 1, 1))
+
+    assert len(occurrences) == MAX_OCCURRENCES_PER_WINDOW
+
+
+def test_series_started_before_window_is_returned(client, user):
+    category = CalendarCategory(user_id=user.id, name='수업', color='#112233')
+    db.session.add(category)
+    db.session.flush()
+    db.session.add_all([
+        CalendarEvent(user_id=user.id, category_id=category.id, title='주간 스터디',
+                      start_date=date(2024, 9, 2), recurrence_type='weekly', recurrence_interval=2),
+        CalendarEvent(user_id=user.id, category_id=category.id, title='끝난 반복',
+                      start_date=date(2024, 9, 2), recurrence_type='daily', recurrence_end_date=date(2025, 2, 28)),
+    ])
+    db.session.commit()
+    bump_system_events_version()
+
+    response = client.get('/api/calendar/events', query_string={'start': '2025-03-01', 'end': '2025-03-31'})
+
+    events = response.get_json()['events']
+    assert [e['start'] for e in events if e['title'] == '주간 스터디'] == ['2025-03-03', '2025-03-17', '2025-03-31']
+    assert not [e for e in events if e['title'] == '끝난 반복']
+
+
+def test_month_loaded_across_version_bump_is_not_cached(app, monkeypatch):
+    from services import calendar_service
+
+    loads = []
+    original_load = calendar_service._load_system_event_month
+
+    def _load_and_bump(year, month):
+        loads.append((year, month))
+        entries = original_load(year, month)
+        if len(loads) == 1:
+            # 조회 도중 다른 스레드가 시스템 이벤트를 갱신한 상황
+            bump_system_events_version()
+        return entries
+
+    monkeypatch.setattr(calendar_service, '_load_system_event_month', _load_and_bump)
+    calendar_service.get_system_event_dicts(date(2025, 3, 1), date(2025, 3, 31))
+    calendar_service.get_system_event_dicts(date(2025, 3, 1), date(2025, 3, 31))
+    calendar_service.get_system_event_dicts(date(2025, 3, 1), date(2025, 3, 31))
+
+    # 첫 결과는 버리고 다시 읽은 결과만 캐시
+    assert loads == [(2025, 3), (2025, 3)]
+
+
+def test_system_event_month_cache_is_bounded(app, monkeypatch):
+    from services import calendar_service
+
+    monkeypatch.setattr(calendar_service, 'SYSTEM_EVENT_CACHE_MAX_MONTHS', 3)
+    calendar_service.get_system_event_dicts(date(2025, 1, 1), date(2025, 6, 30))
+    calendar_service.get_system_event_dicts(date(2025, 4, 1), date(2025, 4, 30))
+    calendar_service.get_system_event_dicts(date(2025, 7, 1), date(2025, 7, 31))
+
+    # 최근에 조회한 4월은 남고, 가장 오래 조회되지 않은 달부터 제거
+    assert list(calendar_service._system_event_cache['months']) == [(2025, 6), (2025, 4), (2025, 7)]
+
+
+def test_span_end_date_never_precedes_start_date():
+    assert compute_span_end_date(date(2025, 3, 10), date(2025, 3, 5), None, None) == date(2025, 3, 10)
+    assert compute_span_end_date(date(2025, 3, 10), None, 'weekly', date(2025, 3, 1)) == date(2025, 3, 10)
+    assert compute_span_end_date(date(2025, 3, 10), date(2025, 3, 12), 'weekly', date(2025, 3, 24)) == date(2025, 3, 26)
+
+
+def test_event_ending_before_start_is_rejected(client, user):
+    category = CalendarCategory(user_id=user.id, name='수업', color='#112233')
+    db.session.add(category)
+    db.session.commit()
+    base = {'title': '발표', 'start_date': '2025-03-10', 'category_id': category.id}
+
+    assert client.post('/api/calendar/events', json=dict(base, end_date='2025-03-09')).status_code == 400
+    assert client.post('/api/calendar/events', json=dict(
+        base, recurrence_type='weekly', recurrence_end_date='2025-03-01')).status_code == 400
+    assert CalendarEvent.query.count() == 0
+
+    response = client.post('/api/calendar/events', json=dict(base, end_date='2025-03-11'))
+    assert response.status_code == 201
+    event_id = response.get_json()['event']['id']
+
+    # 시작일만 종료일 뒤로 옮기는 수정도 거부하고 기존 값 유지
+    assert client.put(f'/api/calendar/events/{event_id}', json={'start_date': '2025-03-12'}).status_code == 400
+    assert client.put(f'/api/calendar/events/{event_id}', json={
+        'recurrence_type': 'daily', 'recurrence_end_date': '2025-03-01'}).status_code == 400
+    event = db.session.get(CalendarEvent, event_id)
+    assert (event.start_date, event.span_end_date, event.recurrence_type) == (date(2025, 3, 10), date(2025, 3, 11), None)
+
+    assert client.put(f'/api/calendar/events/{event_id}', json={
+        'start_date': '2025-03-12', 'end_date': '2025-03-13'}).status_code == 200
@@ -0,0 +1,138 @@
+"""커뮤니티 서비스 테스트 (피드 키셋 페이지네이션, 좋아요/댓글 카운터)"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, Post, PostLike, Comment
+from services.community_service import get_feed_page, increment_post_counter, reconcile_post_counters
+
+BASE_TIME = datetime(2025, 10, 1, 12, 0)
+
+
+def _add_posts(user_id, created_ats, **overrides):
+    posts = []
+    for i, created_at in enumerate(created_ats):
+        fields = dict(title=f'글{i}', content='내용', author_id=user_id, category='일반',
+                      is_approved=True, is_visible=True, created_at=created_at)
+        fields.update(overrides)
+        posts.append(Post(**fields))
+    db.session.add_all(posts)
+    db.session.commit()
+    return posts
+
+
+def _walk_pages(limit, category=None):
+    pages = []
+    cursor = None
+    while True:
+        posts, cursor = get_feed_page(category=category, cursor=cursor, limit=limit)
+        pages.append([post.id for post in posts])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_posts_with_equal_created_at(user):
+    # 같은 시각에 작성된 게시물이 페이지 경계에 걸치도록 배치
+    created_ats = [BASE_TIME] * 5 + [BASE_TIME - timedelta(minutes=1)] * 3 + [BASE_TIME + timedelta(minutes=1)]
+    posts = _add_posts(user.id, created_ats)
+    expected = [post.id for post in sorted(posts, key=lambda p: (p.created_at, p.id), reverse=True)]
+
+    pages = _walk_pages(limit=2)
+
+    assert [post_id for page in pages for post_id in page] == expected
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 1]
+
+
+def test_last_full_page_has_no_next_cursor(user):
+    _add_posts(user.id, [BASE_TIME - timedelta(minutes=i) for i in range(4)])
+
+    first, cursor = get_feed_page(limit=2)
+    second, next_cursor = get_feed_page(cursor=cursor, limit=2)
+
+    assert len(first) == len(second) == 2
+    assert next_cursor is None
+
+
+def test_feed_skips_hidden_unapproved_and_expired_posts(user):
+    visible = _add_posts(user.id, [BASE_TIME])
+    _add_posts(user.id, [BASE_TIME], is_approved=False)
+    _add_posts(user.id, [BASE_TIME], is_visible=False)
+    _add_posts(user.id, [BASE_TIME], expires_at=datetime.utcnow() - timedelta(days=1))
+    _add_posts(user.id, [BASE_TIME], category='공지')
+
+    assert [post.id for post in get_feed_page(category='일반')[0]] == [visible[0].id]
+
+
+def test_feed_api_pages_with_next_cursor(client, user):
+    _add_posts(user.id, [BASE_TIME] * 3)
+
+    first = client.get('/api/community/posts?limit=2').get_json()
+    second = client.get('/api/community/posts', query_string={'limit': 2, 'cursor': first['next_cursor']}).get_json()
+
+    assert len(first['posts']) == 2 and first['next_cursor']
+    assert len(second['posts']) == 1 and second['next_cursor'] is None
+    assert {p['id'] for p in first['posts']}.isdisjoint(p['id'] for p in second['posts'])
+
+
+@pytest.mark.parametrize('cursor', ['abc', 'yesterday|3', f'{BASE_TIME.isoformat()}|x'])
+def test_feed_api_bad_cursor_returns_400(client, cursor):
+    response = client.get('/api/community/posts', query_string={'cursor': cursor})
+
+    assert response.status_code == 400
+
+
+def _counters(post_id):
+    db.session.expire_all()
+    post = db.session.get(Post, post_id)
+    return post.like_count, post.comment_count
+
+
+def test_increment_post_counter_is_relative(user):
+    post_id = _add_posts(user.id, [BASE_TIME])[0].id
+
+    increment_post_counter(post_id, 'like_count', 3)
+    increment_post_counter(post_id, 'like_count', -1)
+    increment_post_counter(post_id, 'comment_count')
+    db.session.commit()
+
+    assert _counters(post_id) == (2, 1)
+
+
+def test_counters_follow_likes_and_comments(client, user):
+    post_id = _add_posts(user.id, [BASE_TIME])[0].id
+    url = f'/api/posts/{post_id}'
+
+    assert client.post(f'{url}/comments', json={'content': '첫 댓글'}).get_json()['total_comments'] == 1
+    parent_id = Comment.query.filter_by(post_id=post_id).one().id
+    assert client.post(f'{url}/comments', json={'content': '답글', 'parent_id': parent_id}).get_json()['total_comments'] == 2
+    assert client.post(f'{url}/comments', json={'content': '  '}).status_code == 400
+    client.post(f'{url}/like', json={'liked': True})
+
+    assert _counters(post_id) == (1, 2)
+    client.post(f'{url}/like', json={'liked': False})
+    assert _counters(post_id) == (0, 2)
+    assert reconcile_post_counters() == 0
+
+
+def test_reconcile_repairs_drifted_counters(user):
+    drifted, healthy, other = _add_posts(user.id, [BASE_TIME] * 3)
+    db.session.add_all([
+        PostLike(post_id=drifted.id, user_id=user.id),
+        Comment(post_id=drifted.id, user_id=user.id, content='댓글'),
+        Comment(post_id=drifted.id, user_id=user.id, content='댓글2'),
+        PostLike(post_id=healthy.id, user_id=user.id),
+    ])
+    healthy.like_count = 1
+    other.like_count, other.comment_count = 5, 7
+    db.session.commit()
+
+    # 지정한 게시물만 보정
+    assert reconcile_post_counters([drifted.id]) == 1
+    assert _counters(drifted.id) == (1, 2)
+    assert _counters(other.id) == (5, 7)
+    assert reconcile_post_counters([]) == 0
+
+    assert reconcile_post_counters() == 1
+    assert _counters(other.id) == (0, 0)
+    assert _counters(healthy.id) == (1, 0)
+    assert reconcile_post_counters() == 0
@@ -0,0 +1,146 @@
+"""식단 크롤러 테스트 (로컬 HTTP 서버로 조건부 요청/해시 비교 경로 확인)"""
+import json
+import os
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import crawling
+
+ETAG = '"menu-v1"'
+
+
+def _menu_table(menu):
+    return f"""
+    <table>
+      <thead><tr><th>구분</th><th>03.02(월)</th></tr></thead>
+      <tbody><tr><th>중식(11:30~13:30)</th><td><p class="offTxt">{menu}<br/>김치</p></td></tr></tbody>
+    </table>"""
+
+
+def _menu_page(menu):
+    return f"""<html><body>
+    <div class="diet-menu"><p class="title">2025.03.02 ~ 2025.03.08 교직원식당</p>{_menu_table('된장찌개')}</div>
+    <div class="diet-menu"><p class="title">2025.03.02 ~ 2025.03.08 학생식당</p>{_menu_table(menu)}</div>
+    </body></html>"""
+
+
+class _MenuServer:
+    """요청 헤더를 기록하고, If-None-Match가 현재 ETag와 같으면 304를 돌려주는 서버"""
+
+    def __init__(self):
+        self.page = _menu_page('제육볶음')
+        self.etag = ETAG
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if self.headers.get('If-None-Match') == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = server.page.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('ETag', server.etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}/menu'
+
+
+@pytest.fixture
+def menu_server(tmp_path, monkeypatch):
+    server = _MenuServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(crawling, 'MENU_URL', server.url)
+    monkeypatch.setattr(crawling, 'SAVE_DIR', str(tmp_path))
+    monkeypatch.setattr(crawling, 'CRAWL_STATE_PATH', str(tmp_path / '.crawl_state.json'))
+    monkeypatch.setattr(crawling, 'notify_meal_cache', lambda: None)
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+def _mtime_ns(tmp_path, name):
+    return os.stat(tmp_path / name).st_mtime_ns
+
+
+def test_first_crawl_saves_menu_and_state(menu_server, tmp_path):
+    result = crawling.crawl_and_save_menu()
+
+    assert result['학생식당']['메뉴']['03.02(월)']['중식']['메뉴'] == ['제육볶음', '김치']
+    state = json.loads((tmp_path / '.crawl_state.json').read_text(encoding='utf-8'))
+    assert state['etag'] == ETAG
+    assert 'If-None-Match' not in menu_server.requests[0]
+
+
+def test_saved_files_are_world_readable(menu_server, tmp_path):
+    crawling.crawl_and_save_menu()
+
+    for name in ('student_menu.json', 'staff_menu.json', '.crawl_state.json'):
+        assert stat.S_IMODE(os.stat(tmp_path / name).st_mode) == 0o644
+
+
+def test_write_keeps_existing_file_mode(tmp_path):
+    path = tmp_path / 'student_menu.json'
+    path.write_text('{}', encoding='utf-8')
+    os.chmod(path, 0o640)
+
+    crawling.write_json_atomic(str(path), {'a': 1})
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert json.loads(path.read_text(encoding='utf-8')) == {'a': 1}
+
+
+def test_not_modified_response_skips_parsing_and_writes(menu_server, tmp_path, monkeypatch):
+    crawling.crawl_and_save_menu()
+    before = _mtime_ns(tmp_path, 'student_menu.json')
+    monkeypatch.setattr(crawling, 'parse_menu_page', lambda html: pytest.fail('304 응답은 파싱하지 않아야 함'))
+
+    assert crawling.crawl_and_save_menu() is None
+
+    assert menu_server.requests[-1]['If-None-Match'] == ETAG
+    assert _mtime_ns(tmp_path, 'student_menu.json') == before
+
+
+def test_unchanged_content_does_not_rewrite_menu_files(menu_server, tmp_path):
+    crawling.crawl_and_save_menu()
+    before = _mtime_ns(tmp_path, 'student_menu.json')
+    # ETag만 바뀌고 식단 내용은 그대로인 경우
+    menu_server.etag = '"menu-v2"'
+
+    assert crawling.crawl_and_save_menu() is None
+
+    assert _mtime_ns(tmp_path, 'student_menu.json') == before
+    state = json.loads((tmp_path / '.crawl_state.json').read_text(encoding='utf-8'))
+    assert state['etag'] == '"menu-v2"'
+
+
+def test_changed_content_rewrites_menu_files(menu_server, tmp_path):
+    crawling.crawl_and_save_menu()
+    menu_server.etag = '"menu-v2"'
+    menu_server.page = _menu_page('돈까스')
+
+    result = crawling.crawl_and_save_menu()
+
+    assert result['학생식당']['메뉴']['03.02(월)']['중식']['메뉴'] == ['돈까스', '김치']
+    saved = json.loads((tmp_path / 'student_menu.json').read_text(encoding='utf-8'))
+    assert saved['메뉴']['03.02(월)']['중식']['메뉴'] == ['돈까스', '김치']
+
+
+def test_force_ignores_conditional_headers(menu_server):
+    crawling.crawl_and_save_menu()
+
+    assert crawling.crawl_and_save_menu(force=True) is not None
+    assert 'If-None-Match' not in menu_server.requests[-1]
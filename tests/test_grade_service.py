@@ -0,0 +1,157 @@
+"""성적 집계 테스트 (평점 10배 정수 집계가 과목별 GPA 계산과 같은 결과를 내는지 확인)"""
+import random
+
+import pytest
+
+from models import db, Semester, Subject
+from services.grade_service import (
+    parse_subject_credits,
+    seed_grade_points,
+    query_gpa_by_semester,
+    rebuild_grade_totals,
+    get_user_grade_summary,
+    get_semester_grade_summaries
+)
+from utils.constants import GRADE_MAP
+from utils.helpers import calculate_gpa
+
+GRADES = list(GRADE_MAP) + ['P', 'NP', 'Not Set']
+
+
+@pytest.fixture
+def semesters(app, user):
+    seed_grade_points()
+    rows = [
+        Semester(user_id=user.id, name=f'{year}년 {season}', year=year, season=season)
+        for year in (2023, 2024) for season in ('1학기', '2학기')
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def _add_subject(user_id, semester, name, credits, grade):
+    subject = Subject(user_id=user_id, semester_id=semester.id, name=name, credits=credits, grade=grade)
+    db.session.add(subject)
+    return subject
+
+
+def _add_fixed_subjects(user_id, semesters):
+    """F/P/미입력 성적, 0학점 과목, 재수강(같은 과목 F 후 A0)을 포함한 과목"""
+    first, second = semesters[0], semesters[1]
+    _add_subject(user_id, first, '자료구조', 3, 'F')
+    _add_subject(user_id, first, '미적분학', 3, 'A+')
+    _add_subject(user_id, first, '채플', 0, 'P')
+    _add_subject(user_id, first, '사회봉사', 1, 'P')
+    _add_subject(user_id, first, '글쓰기', 2, 'C+')
+    _add_subject(user_id, second, '자료구조', 3, 'A0')
+    _add_subject(user_id, second, '운영체제', 3, 'Not Set')
+    _add_subject(user_id, second, '선형대수', 3, 'D+')
+    db.session.commit()
+
+
+def _add_random_subjects(user_id, semesters, count=300):
+    rng = random.Random(20)
+    for i in range(count):
+        _add_subject(user_id, rng.choice(semesters), f'과목{i}', rng.choice([0, 1, 2, 3, 3, 3, 4]), rng.choice(GRADES))
+    db.session.commit()
+
+
+def _expected_by_semester(user_id):
+    subjects = Subject.query.filter_by(user_id=user_id).all()
+    by_semester = {}
+    for subject in subjects:
+        by_semester.setdefault(subject.semester_id, []).append(subject)
+    return {sid: calculate_gpa(rows) for sid, rows in by_semester.items()}, calculate_gpa(subjects)
+
+
+@pytest.mark.parametrize('add_subjects', [_add_fixed_subjects, _add_random_subjects])
+def test_query_gpa_by_semester_matches_per_subject_calculation(user, semesters, add_subjects):
+    add_subjects(user.id, semesters)
+    expected_semesters, expected_overall = _expected_by_semester(user.id)
+
+    result = query_gpa_by_semester(user.id)
+
+    assert result['semesters'] == expected_semesters
+    assert result['overall'] == expected_overall
+
+
+def test_query_gpa_by_semester_runs_one_grouped_statement(user, semesters, count_queries):
+    user_id = user.id
+    _add_random_subjects(user_id, semesters, count=40)
+
+    with count_queries() as statements:
+        result = query_gpa_by_semester(user_id)
+
+    # 학기 수나 과목 수와 무관하게 GROUP BY semester_id 쿼리 1회
+    assert len(result['semesters']) == len(semesters)
+    assert len(statements) == 1
+    assert 'GROUP BY subjects.semester_id' in statements[0]
+
+
+@pytest.mark.parametrize('add_subjects', [_add_fixed_subjects, _add_random_subjects])
+def test_rebuilt_totals_match_per_subject_calculation(user, semesters, add_subjects):
+    add_subjects(user.id, semesters)
+    expected_semesters, expected_overall = _expected_by_semester(user.id)
+
+    rebuild_grade_totals(user.id)
+
+    assert get_user_grade_summary(user.id) == expected_overall
+    summaries = {s.pop('semester_id'): s for s in get_semester_grade_summaries(user.id)}
+    for semester_id, expected in expected_semesters.items():
+        summary = summaries[semester_id]
+        assert {k: summary[k] for k in expected} == expected
+
+
+def test_fixed_subjects_gpa_values(user, semesters):
+    _add_fixed_subjects(user.id, semesters)
+
+    result = query_gpa_by_semester(user.id)
+
+    # F(3학점)는 평점에 포함, P/미입력은 이수 학점에만 포함
+    assert result['semesters'][semesters[0].id] == {'gpa': 2.31, 'total_credits': 8, 'earned_credits': 9}
+    assert result['semesters'][semesters[1].id] == {'gpa': 2.75, 'total_credits': 6, 'earned_credits': 9}
+    assert result['overall'] == {'gpa': 2.5, 'total_credits': 14, 'earned_credits': 18}
+
+
+def test_incremental_totals_follow_subject_api_changes(client, user, semesters):
+    semester_id = semesters[0].id
+    created = []
+    for credits in (3, 2, 1):
+        response = client.post('/api/subjects', json={'semester_id': semester_id, 'name': f'과목{credits}', 'credits': credits})
+        assert response.status_code == 201
+        created.append(response.get_json()['subject']['id'])
+
+    client.put(f'/api/subjects/{created[0]}', json={'grade': 'A+'})
+    client.put(f'/api/subjects/{created[1]}', json={'grade': 'F', 'credits': '4'})
+    client.put(f'/api/subjects/{created[2]}', json={'grade': 'P'})
+    client.delete(f'/api/subjects/{created[2]}')
+
+    subjects = Subject.query.filter_by(user_id=user.id).all()
+    assert get_user_grade_summary(user.id) == calculate_gpa(subjects)
+    assert query_gpa_by_semester(user.id)['overall'] == calculate_gpa(subjects)
+
+
+@pytest.mark.parametrize('value, expected', [(3, 3), ('2', 2), (' 1 ', 1), (0, 0)])
+def test_parse_subject_credits_accepts_non_negative_integers(value, expected):
+    assert parse_subject_credits(value) == expected
+
+
+@pytest.mark.parametrize('value', ['abc', '', -1, '-3', 2.5, True, None, [3]])
+def test_parse_subject_credits_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_subject_credits(value)
+
+
+@pytest.mark.parametrize('credits', ['abc', -1, 1.5, None])
+def test_subject_api_rejects_invalid_credits(client, user, semesters, credits):
+    response = client.post('/api/subjects', json={'semester_id': semesters[0].id, 'name': '과목', 'credits': credits})
+    assert response.status_code == 400
+    assert Subject.query.count() == 0
+
+    subject = _add_subject(user.id, semesters[0], '기존 과목', 3, 'A0')
+    db.session.commit()
+    response = client.put(f'/api/subjects/{subject.id}', json={'credits': credits})
+    assert response.status_code == 400
+    db.session.expire_all()
+    assert db.session.get(Subject, subject.id).credits == 3
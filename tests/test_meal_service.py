@@ -0,0 +1,116 @@
+"""식단 캐시 테스트 (KST 날짜 변경, 파일 변경 시 재로드, 연도 구분)"""
+import json
+import os
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+from services import meal_service
+
+NO_MEAL = '식단 정보 없음'
+
+
+def _menu(period_start, period_end, days):
+    """days: {'11.03(월)': '중식 메뉴'} -> 학생/교직원 식단 JSON"""
+    return {
+        '기간': {'시작일': period_start, '종료일': period_end},
+        '메뉴': {key: {'중식-한식': {'메뉴': [name]}, '중식': {'메뉴': [name]}} for key, name in days.items()}
+    }
+
+
+@pytest.fixture
+def menu_files(tmp_path, monkeypatch):
+    student_path = tmp_path / 'student_menu.json'
+    staff_path = tmp_path / 'staff_menu.json'
+    monkeypatch.setattr(meal_service, 'STUDENT_MENU_PATH', str(student_path))
+    monkeypatch.setattr(meal_service, 'STAFF_MENU_PATH', str(staff_path))
+    monkeypatch.setattr(meal_service, '_meal_cache', {'mtimes': None, 'data': None, 'formatted': {}, 'weekly': None})
+
+    def write(menu):
+        for path in (student_path, staff_path):
+            existed = path.exists()
+            old_mtime_ns = os.stat(path).st_mtime_ns if existed else 0
+            path.write_text(json.dumps(menu, ensure_ascii=False), encoding='utf-8')
+            if existed:
+                # 같은 시각에 다시 써도 mtime이 달라지도록
+                stat = os.stat(path)
+                os.utime(path, ns=(stat.st_atime_ns, max(stat.st_mtime_ns, old_mtime_ns) + 10 ** 9))
+
+    write(_menu('2025.11.03', '2025.11.09', {'11.03(월)': '비빔밥', '11.04(화)': '김치찌개'}))
+    return write
+
+
+def _freeze_kst(monkeypatch, *args):
+    now = pytz.timezone('Asia/Seoul').localize(datetime(*args))
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz) if tz else now.replace(tzinfo=None)
+
+    monkeypatch.setattr(meal_service, 'datetime', _FrozenDatetime)
+
+
+def _lunch(cafeteria='student', day=None):
+    meal = meal_service.get_meal_for_date(cafeteria, day) if day else meal_service.get_today_meal(cafeteria)
+    return meal['lunch']['korean'] if cafeteria == 'student' else meal['lunch']
+
+
+def test_today_meal_follows_kst_date_rollover(menu_files, monkeypatch):
+    _freeze_kst(monkeypatch, 2025, 11, 3, 23, 59)
+    assert _lunch() == '비빔밥'
+    cache = meal_service._meal_cache
+
+    # 자정이 지나면 파일을 다시 읽지 않고 같은 캐시에서 다음 날 식단을 꺼냄
+    _freeze_kst(monkeypatch, 2025, 11, 4, 0, 0)
+    assert _lunch() == '김치찌개'
+    assert _lunch('faculty') == '김치찌개'
+    assert meal_service._meal_cache is cache
+
+    _freeze_kst(monkeypatch, 2025, 11, 5, 9, 0)
+    assert _lunch() == NO_MEAL
+
+
+def test_changed_menu_file_is_reloaded(menu_files):
+    assert _lunch(day=date(2025, 11, 3)) == '비빔밥'
+    cache = meal_service._meal_cache
+    assert _lunch(day=date(2025, 11, 3)) == '비빔밥'
+    assert meal_service._meal_cache is cache
+
+    menu_files(_menu('2025.11.10', '2025.11.16', {'11.10(월)': '돈까스'}))
+
+    assert _lunch(day=date(2025, 11, 10)) == '돈까스'
+    assert _lunch(day=date(2025, 11, 3)) == NO_MEAL
+    assert meal_service.get_weekly_meal()['기간']['시작일'] == '2025.11.10'
+
+
+def test_broken_menu_file_keeps_previous_cache(menu_files, tmp_path):
+    assert _lunch(day=date(2025, 11, 3)) == '비빔밥'
+    student_path = tmp_path / 'student_menu.json'
+    student_path.write_text('{"메뉴": ', encoding='utf-8')  # 크롤러가 쓰는 중
+    stat = os.stat(student_path)
+    os.utime(student_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert _lunch(day=date(2025, 11, 3)) == '비빔밥'
+
+
+def test_same_month_day_in_another_year_has_no_meal(menu_files):
+    # 작년/내년의 같은 월.일에는 이번 식단을 보여주지 않음
+    assert _lunch(day=date(2025, 11, 3)) == '비빔밥'
+    assert _lunch(day=date(2024, 11, 3)) == NO_MEAL
+    assert _lunch(day=date(2026, 11, 3)) == NO_MEAL
+
+
+def test_week_crossing_new_year_uses_next_year_for_january(menu_files):
+    menu_files(_menu('2025.12.29', '2026.01.04', {'12.31(수)': '김밥', '1.02(금)': '떡국'}))
+
+    assert _lunch(day=date(2025, 12, 31)) == '김밥'
+    assert _lunch(day=date(2026, 1, 2)) == '떡국'
+    assert _lunch(day=date(2025, 1, 2)) == NO_MEAL
+
+
+def test_menu_without_period_uses_nearest_year():
+    assert meal_service._resolve_meal_date(12, 31, None, date(2026, 1, 1)) == date(2025, 12, 31)
+    assert meal_service._resolve_meal_date(1, 2, None, date(2026, 1, 1)) == date(2026, 1, 2)
+    assert meal_service._resolve_meal_date(2, 29, None, date(2025, 3, 1)) == date(2024, 2, 29)
@@ -0,0 +1,123 @@
+"""과목 날짜별 메모 테스트 (주차별 메모 요약이 날짜별 조회 방식과 같은 결과를 내는지 확인)"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models import db, Semester, Subject
+from services.memo_service import build_weekly_memo_digest, get_daily_memo_note, save_daily_memo
+
+SEMESTER_START = date(2025, 3, 3)
+
+
+def _digest_per_day(subjects, start_date, weeks):
+    """주차마다 과목별로 하루씩 메모를 조회하던 이전 방식 (비교 기준)"""
+    digest = []
+    for week_index in range(weeks):
+        week_start_date = start_date + timedelta(weeks=week_index)
+        week_end_date = week_start_date + timedelta(days=6)
+        week_subjects = []
+        for subject in subjects:
+            memos = []
+            for offset in range(7):
+                day = week_start_date + timedelta(days=offset)
+                note = get_daily_memo_note(subject.id, day).strip()
+                if note:
+                    memos.append({"date": day.strftime('%Y-%m-%d'), "note": note})
+            if memos:
+                week_subjects.append({"subject_id": subject.id, "subject_name": subject.name, "memos": memos})
+        if week_subjects:
+            digest.append({
+                "week_number": week_index + 1,
+                "date_range": f"{week_start_date.strftime('%m.%d')}~{week_end_date.strftime('%m.%d')}",
+                "subjects": week_subjects
+            })
+    return digest
+
+
+@pytest.fixture
+def semester(user):
+    semester = Semester(user_id=user.id, name='2025년 1학기', year=2025, season='1학기', start_date=SEMESTER_START)
+    db.session.add(semester)
+    db.session.commit()
+    return semester
+
+
+def _add_subjects(user_id, semester, count):
+    subjects = [Subject(user_id=user_id, semester_id=semester.id, name=f'과목{i}', credits=3) for i in range(count)]
+    db.session.add_all(subjects)
+    db.session.flush()
+    return subjects
+
+
+def _add_memos(subjects, rng, count):
+    # 학기 시작 전날부터 17주차까지 (범위 밖 메모도 섞음)
+    for _ in range(count):
+        day = SEMESTER_START + timedelta(days=rng.randrange(-3, 17 * 7))
+        save_daily_memo(rng.choice(subjects).id, day, rng.choice(['복습', '  과제 제출 ', '퀴즈 준비', '']))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('weeks', [1, 8, 16, 26])
+def test_weekly_digest_matches_per_day_lookup(user, semester, weeks):
+    subjects = _add_subjects(user.id, semester, 4)
+    _add_memos(subjects, random.Random(weeks), 200)
+    # 주 경계(첫날/마지막 날)의 메모
+    save_daily_memo(subjects[0].id, SEMESTER_START, '개강')
+    save_daily_memo(subjects[1].id, SEMESTER_START + timedelta(weeks=weeks, days=-1), '마지막 날')
+    db.session.commit()
+
+    assert build_weekly_memo_digest(subjects, SEMESTER_START, weeks) == _digest_per_day(subjects, SEMESTER_START, weeks)
+
+
+def test_weekly_digest_without_memos(user, semester):
+    subjects = _add_subjects(user.id, semester, 2)
+
+    assert build_weekly_memo_digest(subjects, SEMESTER_START) == []
+    assert build_weekly_memo_digest([], SEMESTER_START) == []
+
+
+def test_weekly_digest_query_count_does_not_grow_with_subjects(client, user, semester, count_queries):
+    rng = random.Random(6)
+    _add_memos(_add_subjects(user.id, semester, 2), rng, 20)
+    with count_queries() as few:
+        assert client.get(f'/api/semesters/{semester.id}/all-memos-by-week').status_code == 200
+
+    _add_memos(_add_subjects(user.id, semester, 20), rng, 300)
+    with count_queries() as many:
+        response = client.get(f'/api/semesters/{semester.id}/all-memos-by-week')
+
+    assert response.status_code == 200
+    assert len(many) == len(few)
+
+
+def test_weekly_digest_week_count_is_clamped(client, user, semester):
+    subjects = _add_subjects(user.id, semester, 1)
+    save_daily_memo(subjects[0].id, SEMESTER_START + timedelta(weeks=20), '계절학기 이후')
+    db.session.commit()
+
+    short = client.get(f'/api/semesters/{semester.id}/all-memos-by-week?weeks=0').get_json()['data']
+    long = client.get(f'/api/semesters/{semester.id}/all-memos-by-week?weeks=100').get_json()['data']
+
+    assert short == []
+    assert [week['week_number'] for week in long] == [21]
+    assert client.get(f'/api/semesters/{semester.id}/all-memos-by-week?weeks=abc').status_code == 400
+
+
+def test_daily_memo_round_trip(user, semester):
+    subject = _add_subjects(user.id, semester, 1)[0]
+    long_note = '강의 정리 ' * 2000  # 인덱스 항목 크기 제한보다 긴 메모도 저장되어야 함
+
+    save_daily_memo(subject.id, SEMESTER_START, long_note)
+    db.session.commit()
+    assert get_daily_memo_note(subject.id, SEMESTER_START) == long_note.strip()
+
+    save_daily_memo(subject.id, SEMESTER_START, '수정')
+    db.session.commit()
+    assert get_daily_memo_note(subject.id, SEMESTER_START) == '수정'
+
+    # 빈 메모는 행을 삭제
+    save_daily_memo(subject.id, SEMESTER_START, '   ')
+    db.session.commit()
+    assert get_daily_memo_note(subject.id, SEMESTER_START) == ''
+    assert subject.daily_memos.count() == 0
@@ -0,0 +1,79 @@
+"""쿼리 실행 계획 점검 테스트 (미리 만든 실행 계획 사용)"""
+from services.query_plan_service import collect_table_scans, find_index_problems, is_covered_statement
+
+INDEX = 'ix_study_logs_user_date'
+
+
+def _pg_plan(scan_node):
+    return {
+        'Node Type': 'Aggregate',
+        'Plans': [{
+            'Node Type': 'Nested Loop',
+            'Plans': [scan_node, {'Node Type': 'Index Scan', 'Relation Name': 'subjects', 'Index Name': 'subjects_pkey',
+                                  'Index Cond': '(id = study_logs.subject_id)'}]
+        }]
+    }
+
+
+def _problems(plan, require_index_only=False):
+    return find_index_problems(collect_table_scans(plan, 'study_logs'), INDEX, require_index_only)
+
+
+def test_postgres_index_only_scan_on_expected_index_passes():
+    plan = _pg_plan({'Node Type': 'Index Only Scan', 'Relation Name': 'study_logs', 'Index Name': INDEX,
+                     'Index Cond': "((user_id = '1') AND (date >= '2026-10-01'))"})
+    assert _problems(plan, require_index_only=True) == []
+
+
+def test_postgres_wrong_index_fails():
+    # enable_seqscan = off 상태에서도 user_id 단일 인덱스를 고르면 실패해야 함
+    plan = _pg_plan({'Node Type': 'Index Scan', 'Relation Name': 'study_logs', 'Index Name': 'ix_study_logs_user_id',
+                     'Index Cond': "(user_id = '1')"})
+    problems = _problems(plan)
+    assert len(problems) == 1 and 'ix_study_logs_user_id instead of ix_study_logs_user_date' in problems[0]
+
+
+def test_postgres_bitmap_scan_on_wrong_index_fails():
+    plan = _pg_plan({'Node Type': 'Bitmap Heap Scan', 'Relation Name': 'study_logs', 'Plans': [
+        {'Node Type': 'Bitmap Index Scan', 'Index Name': 'uq_study_logs_user_client_key', 'Index Cond': "(user_id = '1')"}
+    ]})
+    assert 'uq_study_logs_user_client_key instead of' in _problems(plan)[0]
+
+
+def test_postgres_full_index_scan_fails():
+    plan = _pg_plan({'Node Type': 'Index Only Scan', 'Relation Name': 'study_logs', 'Index Name': INDEX,
+                     'Filter': "(user_id = '1')"})
+    assert 'walks the whole of' in _problems(plan)[0]
+
+
+def test_postgres_heap_scan_fails_where_coverage_is_claimed():
+    plan = _pg_plan({'Node Type': 'Index Scan', 'Relation Name': 'study_logs', 'Index Name': INDEX,
+                     'Index Cond': "(user_id = '1')"})
+    assert _problems(plan) == []
+    assert 'is not index-only' in _problems(plan, require_index_only=True)[0]
+
+
+def test_postgres_seq_scan_fails():
+    plan = _pg_plan({'Node Type': 'Seq Scan', 'Relation Name': 'study_logs', 'Filter': "(user_id = '1')"})
+    assert 'without an index' in _problems(plan)[0]
+
+
+def test_sqlite_plans():
+    assert _problems([f'SEARCH study_logs USING INDEX {INDEX} (user_id=? AND date>? AND date<?)',
+                      'SEARCH subjects USING INTEGER PRIMARY KEY (rowid=?)']) == []
+    assert 'instead of' in _problems(['SEARCH study_logs USING INDEX ix_study_logs_user_id (user_id=?)'])[0]
+    assert 'walks the whole of' in _problems([f'SCAN study_logs USING INDEX {INDEX}'])[0]
+    assert 'without an index' in _problems(['SCAN study_logs'])[0]
+    assert _problems([f'SEARCH study_logs USING COVERING INDEX {INDEX} (user_id=?)'], require_index_only=True) == []
+
+
+def test_is_covered_statement():
+    covered = ('user_id', 'date', 'duration_seconds', 'subject_id')
+    assert is_covered_statement(
+        'SELECT study_logs.subject_id, sum(study_logs.duration_seconds), count(*) FROM study_logs '
+        'WHERE study_logs.user_id = %(u)s AND study_logs.date BETWEEN %(a)s AND %(b)s', 'study_logs', covered
+    )
+    assert not is_covered_statement(
+        'SELECT study_logs.date FROM study_logs WHERE study_logs.user_id = %(u)s ORDER BY study_logs.entry_id DESC',
+        'study_logs', covered
+    )
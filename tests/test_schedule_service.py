@@ -0,0 +1,98 @@
+"""오늘 일정 조회 테스트 (이벤트 수와 무관하게 쿼리 수가 고정되는지 확인)"""
+from datetime import date, time, timedelta
+
+import pytest
+
+from models import db, CalendarCategory, CalendarEvent, Schedule, Semester, Subject, TimeSlot
+from services.schedule_service import get_today_schedule
+
+TODAY = date(2025, 3, 12)  # 수요일
+
+
+@pytest.fixture
+def timetable(user):
+    semester = Semester(user_id=user.id, name='2025년 1학기', year=2025, season='1학기', start_date=date(2025, 3, 4))
+    db.session.add(semester)
+    db.session.flush()
+    subject = Subject(user_id=user.id, semester_id=semester.id, name='자료구조', credits=3)
+    db.session.add(subject)
+    db.session.flush()
+    db.session.add_all([
+        TimeSlot(subject_id=subject.id, day_of_week=3, start_time='10:30', end_time='11:45', room='과학기술1관 201'),
+        TimeSlot(subject_id=subject.id, day_of_week=1, start_time='10:30', end_time='11:45', room='과학기술1관 201'),
+    ])
+    db.session.add(Schedule(user_id=user.id, date=TODAY.strftime('%Y-%m-%d'), time='18:00', title='동아리'))
+    db.session.commit()
+    return subject
+
+
+def _add_calendar_events(user_id, count):
+    category = CalendarCategory(user_id=user_id, name=f'개인{count}', color='#112233')
+    system_category = CalendarCategory(name=f'학사일정{count}', color='#445566', is_system=True)
+    db.session.add_all([category, system_category])
+    db.session.flush()
+    for i in range(count):
+        db.session.add(CalendarEvent(
+            user_id=user_id, category_id=category.id, title=f'오늘{i}', start_date=TODAY,
+            all_day=False, start_time=time(9, i % 60)
+        ))
+        # 어제 시작해 오늘까지 이어지는 일정, 오늘 발생하지 않는 반복 일정
+        db.session.add(CalendarEvent(
+            user_id=user_id, category_id=category.id, title=f'이어짐{i}',
+            start_date=TODAY - timedelta(days=1), end_date=TODAY
+        ))
+        db.session.add(CalendarEvent(
+            user_id=user_id, category_id=category.id, title=f'격주{i}',
+            start_date=TODAY - timedelta(days=7), recurrence_type='weekly', recurrence_interval=2
+        ))
+    db.session.add(CalendarEvent(
+        category_id=system_category.id, title=f'수강정정{count}', start_date=TODAY, is_system=True
+    ))
+    db.session.commit()
+
+
+def _count_today_schedule(count_queries, user_id):
+    with count_queries() as statements:
+        schedule = get_today_schedule(user_id, TODAY)
+    return len(statements), schedule
+
+
+def test_today_schedule_query_count_is_fixed(user, timetable, count_queries):
+    _add_calendar_events(user.id, 3)
+    # 시스템 이벤트 캐시와 현재 학기 캐시를 채운 뒤 측정
+    get_today_schedule(user.id, TODAY)
+    few_queries, few = _count_today_schedule(count_queries, user.id)
+
+    _add_calendar_events(user.id, 60)
+    get_today_schedule(user.id, TODAY)
+    many_queries, many = _count_today_schedule(count_queries, user.id)
+
+    assert len(many) > len(few)
+    assert many_queries == few_queries
+    # 개인 일정, 사용자 이벤트(카테고리 JOIN), 오늘 수업
+    assert many_queries == 3
+
+
+def test_today_schedule_contents(user, timetable):
+    _add_calendar_events(user.id, 2)
+
+    schedule = get_today_schedule(user.id, TODAY)
+
+    titles = [item['title'] for item in schedule]
+    # 수업은 이벤트 수와 관계없이 한 번만
+    assert titles.count('자료구조') == 1
+    assert {'오늘0', '오늘1', '이어짐0', '이어짐1', '수강정정2', '동아리'} <= set(titles)
+    assert not [title for title in titles if title.startswith('격주')]
+    # 종일 일정이 먼저, 나머지는 시각순
+    sort_keys = [item['time'] if item['time'] != '종일' else '00:00' for item in schedule]
+    assert sort_keys == sorted(sort_keys)
+
+
+def test_anonymous_today_schedule_has_system_events_only(user, timetable, count_queries):
+    _add_calendar_events(user.id, 2)
+
+    query_count, schedule = _count_today_schedule(count_queries, None)
+
+    assert [item['title'] for item in schedule] == ['수강정정2']
+    # 시스템 이벤트 월 캐시 적재 (이벤트 + 카테고리)
+    assert query_count <= 2
@@ -0,0 +1,75 @@
+"""학기 서비스 테스트 (날짜 경계는 서버 시간대가 아닌 KST 기준)"""
+from datetime import date, datetime
+
+import pytz
+
+from models import db, Semester, Subject
+from services import semester_service
+from utils.constants import SEASONS
+
+# UTC 2026-11-30 15:30 == KST 2026-12-01 00:30
+NOW_UTC = datetime(2026, 11, 30, 15, 30, tzinfo=pytz.utc)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW_UTC.astimezone(tz) if tz else NOW_UTC.replace(tzinfo=None)
+
+
+def test_semester_years_use_kst_date(monkeypatch):
+    monkeypatch.setattr(semester_service, 'datetime', _FrozenDatetime)
+
+    # KST로는 이미 12월이므로 다음 해 학기까지 포함
+    assert semester_service.get_semester_years()[-1] == 2027
+
+
+def test_provision_semesters_command_creates_missing_rows(app, user):
+    db.session.add(Semester(user_id=user.id, name='2026년 1학기', year=2026, season='1학기', start_date=date(2026, 3, 2)))
+    db.session.commit()
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['provision-semesters', '--year', '2026'])
+
+    assert result.exit_code == 0, result.output
+    assert 'Semesters provisioned (3 semesters created).' in result.output
+    assert sorted(s.name for s in Semester.query.filter_by(user_id=user.id)) == sorted(
+        f'2026년 {season}' for season in SEASONS
+    )
+    # 다시 실행해도 이미 있는 학기는 건너뜀
+    assert '(0 semesters created)' in runner.invoke(args=['provision-semesters', '--year', '2026']).output
+
+
+def test_stored_semester_with_different_start_beats_virtual_candidate(user):
+    # 학사일정(2025-03-04 개강)과 개강일이 다르게 저장된 기존 학기
+    stored = Semester(user_id=user.id, name='2025년 1학기', year=2025, season='1학기', start_date=date(2025, 3, 1))
+    db.session.add(stored)
+    db.session.flush()
+    db.session.add(Subject(user_id=user.id, semester_id=stored.id, name='자료구조', credits=3))
+    db.session.commit()
+
+    current = semester_service.get_current_semester(user.id, date(2025, 3, 10))
+
+    assert current.id == stored.id
+    assert current.is_virtual is False
+
+
+def test_later_stored_semester_still_wins(user):
+    db.session.add_all([
+        Semester(user_id=user.id, name='2025년 1학기', year=2025, season='1학기', start_date=date(2025, 3, 1)),
+        Semester(user_id=user.id, name='2025년 여름학기', year=2025, season='여름학기', start_date=date(2025, 6, 25)),
+    ])
+    db.session.commit()
+
+    assert semester_service.get_current_semester(user.id, date(2025, 6, 26)).name == '2025년 여름학기'
+
+
+def test_virtual_candidate_without_stored_row(user, count_queries):
+    user_id = user.id
+
+    with count_queries() as statements:
+        current = semester_service.get_current_semester(user_id, date(2025, 3, 10))
+
+    assert current.is_virtual is True
+    assert current.name == '2025년 1학기'
+    assert len(statements) == 1
@@ -0,0 +1,148 @@
+"""타이머 구간 일괄 저장 API 테스트 (/api/study-log/batch)"""
+import json
+from datetime import date, datetime
+
+import pytz
+
+from models import db, User, Semester, Subject, StudyLog, StudyDailyTotal, StudyHourlyTotal
+from services.study_service import split_segment_by_date
+
+KST = pytz.timezone('Asia/Seoul')
+BATCH_URL = '/api/study-log/batch'
+
+
+def _epoch_ms(*args):
+    return int(KST.localize(datetime(*args)).timestamp() * 1000)
+
+
+def _segment(key, seconds, ended_at_ms, subject_id=None):
+    return {'key': key, 'subject_id': subject_id, 'duration_seconds': seconds, 'ended_at': ended_at_ms}
+
+
+def _post(client, segments):
+    response = client.post(BATCH_URL, json={'segments': segments})
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+
+def _daily(user_id):
+    return {row.date: row.total_seconds for row in StudyDailyTotal.query.filter_by(user_id=user_id)}
+
+
+def _hourly_by_date(user_id):
+    totals = {}
+    for row in StudyHourlyTotal.query.filter_by(user_id=user_id):
+        totals[row.date] = totals.get(row.date, 0) + row.total_seconds
+    return totals
+
+
+def _subject(user_id, name='자료구조'):
+    semester = Semester(user_id=user_id, name='2025년 2학기', year=2025, season='2학기')
+    db.session.add(semester)
+    db.session.flush()
+    subject = Subject(user_id=user_id, semester_id=semester.id, name=name, credits=3)
+    db.session.add(subject)
+    db.session.commit()
+    return subject
+
+
+def test_saves_segments_and_returns_day_totals(client, user):
+    user_id = user.id
+    data = _post(client, [
+        _segment('a', 600, _epoch_ms(2025, 10, 17, 10, 0)),
+        _segment('b', 1200, _epoch_ms(2025, 10, 17, 15, 0)),
+        _segment('c', 300, _epoch_ms(2025, 10, 16, 9, 0)),
+    ])
+
+    assert data['inserted'] == ['a', 'b', 'c']
+    assert data['duplicates'] == [] and data['rejected'] == []
+    assert data['day_totals'] == {'2025-10-16': 300, '2025-10-17': 1800}
+    assert _daily(user_id) == _hourly_by_date(user_id) == {date(2025, 10, 16): 300, date(2025, 10, 17): 1800}
+
+
+def test_resent_segments_are_reported_as_duplicates(client, user):
+    user_id = user.id
+    first = [_segment('a', 600, _epoch_ms(2025, 10, 17, 10, 0))]
+    _post(client, first)
+
+    data = _post(client, first + [_segment('b', 60, _epoch_ms(2025, 10, 17, 11, 0)), _segment('b', 60, _epoch_ms(2025, 10, 17, 11, 0))])
+
+    assert data['inserted'] == ['b']
+    assert data['duplicates'] == ['a']
+    assert data['day_totals'] == {'2025-10-17': 660}
+    assert StudyLog.query.filter_by(user_id=user_id).count() == 2
+
+
+def test_invalid_and_foreign_subject_segments_are_rejected(client, user):
+    user_id = user.id
+    own_subject = _subject(user_id)
+    other = User(id='2023000002', name='다른 학생', dob='2000-01-01', college='과학기술대학',
+                 department='컴퓨터융합소프트웨어학과', password_hash='x')
+    db.session.add(other)
+    db.session.commit()
+    foreign_subject = _subject(other.id, '남의 과목')
+    own_subject_id, foreign_subject_id = own_subject.id, foreign_subject.id
+
+    data = _post(client, [
+        _segment('ok', 600, _epoch_ms(2025, 10, 17, 10, 0), own_subject_id),
+        _segment('foreign', 600, _epoch_ms(2025, 10, 17, 10, 0), foreign_subject_id),
+        _segment('zero', 0, _epoch_ms(2025, 10, 17, 10, 0)),
+        _segment('too-long', 24 * 3600 + 1, _epoch_ms(2025, 10, 17, 10, 0)),
+        _segment('bad-time', 600, 'yesterday'),
+        _segment('x' * 53, 600, _epoch_ms(2025, 10, 17, 10, 0)),  # key가 너무 길면 응답 없이 무시
+    ])
+
+    assert data['inserted'] == ['ok']
+    assert sorted(data['rejected']) == ['bad-time', 'foreign', 'too-long', 'zero']
+    assert [log.subject_id for log in StudyLog.query.filter_by(user_id=user_id)] == [own_subject_id]
+
+
+def test_beacon_text_plain_body_is_accepted(client, user):
+    body = json.dumps({'segments': [_segment('beacon', 900, _epoch_ms(2025, 10, 17, 22, 0))]})
+
+    response = client.post(BATCH_URL, data=body, content_type='text/plain')
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['inserted'] == ['beacon']
+
+
+def test_empty_or_oversized_batch_is_rejected(client, user):
+    assert client.post(BATCH_URL, json={'segments': []}).status_code == 400
+    assert client.post(BATCH_URL, data='not json', content_type='text/plain').status_code == 400
+    too_many = [_segment(f'k{i}', 60, _epoch_ms(2025, 10, 17, 10, 0)) for i in range(201)]
+    assert client.post(BATCH_URL, json={'segments': too_many}).status_code == 400
+
+
+def test_segment_crossing_midnight_is_split_by_date(client, user):
+    user_id = user.id
+    segment = [_segment('night', 1800, _epoch_ms(2025, 10, 18, 0, 10))]
+
+    data = _post(client, segment)
+
+    assert data['inserted'] == ['night']
+    assert data['day_totals'] == {'2025-10-17': 1200, '2025-10-18': 600}
+    assert _daily(user_id) == _hourly_by_date(user_id) == {date(2025, 10, 17): 1200, date(2025, 10, 18): 600}
+
+    # 재전송해도 두 날짜 모두 중복 처리
+    resend = _post(client, segment)
+    assert resend['inserted'] == [] and resend['duplicates'] == ['night']
+    assert _daily(user_id) == {date(2025, 10, 17): 1200, date(2025, 10, 18): 600}
+
+
+def test_split_segment_by_date_keeps_total_duration():
+    segment = {
+        'client_key': 'k', 'subject_id': None, 'date': date(2025, 10, 18), 'duration_seconds': 7200,
+        'started_at': datetime(2025, 10, 17, 22, 30), 'ended_at': datetime(2025, 10, 18, 0, 30)
+    }
+
+    parts = split_segment_by_date(segment)
+
+    assert [(p['client_key'], p['date'], p['duration_seconds']) for p in parts] == [
+        ('k', date(2025, 10, 17), 5400), ('k@2025-10-18', date(2025, 10, 18), 1800)
+    ]
+    # 1초 미만의 자투리는 나누지 않고, 나눈 구간의 합은 항상 원래 길이
+    long_segment = dict(segment, duration_seconds=86400,
+                        started_at=datetime(2025, 10, 17, 0, 0, 0, 700000), ended_at=datetime(2025, 10, 18, 0, 0, 0, 700000))
+    assert sum(p['duration_seconds'] for p in split_segment_by_date(long_segment)) == 86400
+    same_day = dict(segment, started_at=datetime(2025, 10, 18, 9), ended_at=datetime(2025, 10, 18, 10), duration_seconds=3600)
+    assert split_segment_by_date(same_day) == [same_day]
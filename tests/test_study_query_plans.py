@@ -0,0 +1,43 @@
+"""공부 통계 API의 study_logs 조회가 ix_study_logs_user_date 인덱스로 범위 탐색하는지 확인 (SQLite 실행 계획)"""
+from datetime import date, timedelta
+
+from models import db, Semester, Subject, StudyLog
+from services.query_plan_service import check_index_usage
+
+INDEX = 'ix_study_logs_user_date'
+
+
+def test_study_endpoints_range_scan_user_date_index(app, client, user):
+    user_id = user.id
+    semester = Semester(user_id=user_id, name='2025년 2학기', year=2025, season='2학기', start_date=date(2025, 9, 1))
+    db.session.add(semester)
+    db.session.flush()
+    subject = Subject(user_id=user_id, semester_id=semester.id, name='자료구조', credits=3)
+    db.session.add(subject)
+    db.session.flush()
+    # 다른 사용자 기록 없이도 user_id 단일 인덱스나 전체 스캔을 고르지 않아야 함
+    db.session.add_all([
+        StudyLog(user_id=user_id, subject_id=subject.id if day % 2 else None,
+                 date=date(2025, 9, 1) + timedelta(days=day), duration_seconds=600 + day)
+        for day in range(120)
+    ])
+    db.session.commit()
+    semester_id = semester.id
+
+    def run_study_requests():
+        assert client.get('/api/study-stats').status_code == 200
+        for period in ('daily', 'weekly', 'monthly'):
+            response = client.get(f'/api/study-analysis-data?semester_id={semester_id}&period={period}')
+            assert response.status_code == 200
+
+    statements, failures = check_index_usage(db.engine, 'study_logs', INDEX, run_study_requests)
+
+    assert statements
+    assert failures == []
+
+
+def test_user_id_only_index_is_not_created(app):
+    indexes = {ix['name'] for ix in db.inspect(db.engine).get_indexes('study_logs')}
+
+    assert INDEX in indexes
+    assert 'ix_study_logs_user_id' not in indexes
@@ -0,0 +1,211 @@
+"""공부 시간 기록 서비스 테스트"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models import db, Semester, Subject, StudyLog, StudyDailyTotal, StudyHourlyTotal
+from services.study_service import (
+    add_study_log,
+    add_study_segments,
+    get_streak_and_today_total,
+    get_study_window_aggregates,
+    rebuild_daily_totals,
+    resolve_session_times,
+    split_into_hours
+)
+
+
+def _hourly_sum(user_id):
+    return db.session.query(db.func.sum(StudyHourlyTotal.total_seconds)).filter_by(user_id=user_id).scalar()
+
+
+def _daily_sum(user_id):
+    return db.session.query(db.func.sum(StudyDailyTotal.total_seconds)).filter_by(user_id=user_id).scalar()
+
+
+def test_split_into_hours_keeps_duration_with_sub_second_offsets():
+    started_at = datetime(2026, 10, 17, 9, 15, 0, 400000)
+    ended_at = datetime(2026, 10, 17, 10, 46, 0, 400000)
+
+    buckets = split_into_hours(started_at, ended_at, 5460)
+
+    assert set(buckets) == {(date(2026, 10, 17), 9), (date(2026, 10, 17), 10)}
+    assert sum(buckets.values()) == 5460
+
+
+def test_split_into_hours_crossing_midnight():
+    buckets = split_into_hours(datetime(2026, 10, 17, 23, 30, 0, 700000), datetime(2026, 10, 18, 1, 10, 0, 700000))
+
+    assert buckets[(date(2026, 10, 18), 0)] == 3600
+    assert sum(buckets.values()) == 100 * 60
+
+
+def test_hourly_rollup_matches_daily_rollup(user):
+    add_study_log(
+        user.id, date(2026, 10, 17), 5460,
+        started_at=datetime(2026, 10, 17, 9, 15, 0, 400000),
+        ended_at=datetime(2026, 10, 17, 10, 46, 0, 400000)
+    )
+    add_study_segments(user.id, [{
+        'client_key': 'segment-1',
+        'subject_id': None,
+        'date': date(2026, 10, 17),
+        'duration_seconds': 1801,
+        'started_at': datetime(2026, 10, 17, 13, 45, 10, 999999),
+        'ended_at': datetime(2026, 10, 17, 14, 15, 11, 999999)
+    }])
+    db.session.commit()
+
+    assert _daily_sum(user.id) == 5460 + 1801
+    assert _hourly_sum(user.id) == _daily_sum(user.id)
+
+
+def test_resolve_session_times_rejects_out_of_range_durations():
+    now = datetime(2026, 10, 18, 9, 0)
+
+    assert resolve_session_times(date(2026, 10, 18), 10 ** 9, now) == (None, None)
+    assert resolve_session_times(date(2026, 10, 18), 0, now) == (None, None)
+    # 시작 시각이 전날이면 시간대 집계를 만들지 않음
+    assert resolve_session_times(date(2026, 10, 18), 10 * 3600, now) == (None, None)
+    assert resolve_session_times(date(2026, 10, 18), 600, now) == (datetime(2026, 10, 18, 8, 50), now)
+
+
+def _window_aggregates_per_query(user_id, start_date, end_date, prev_start, prev_end):
+    """기간마다 따로 조회하던 이전 방식의 집계 (비교 기준)"""
+    def in_window(first, last):
+        return db.session.query(StudyLog).filter(StudyLog.user_id == user_id, StudyLog.date.between(first, last))
+
+    current = in_window(start_date, end_date)
+    daily = {}
+    subjects = {}
+    for log in current.all():
+        daily[log.date] = daily.get(log.date, 0) + log.duration_seconds
+        subject = db.session.get(Subject, log.subject_id) if log.subject_id else None
+        entry = subjects.setdefault(log.subject_id, {
+            'name': subject.name if subject else None,
+            'semester_id': subject.semester_id if subject else None,
+            'time': 0
+        })
+        entry['time'] += log.duration_seconds
+    return {
+        'daily': daily,
+        'subjects': subjects,
+        'total': sum(log.duration_seconds for log in current.all()),
+        'previous_total': sum(log.duration_seconds for log in in_window(prev_start, prev_end).all()),
+        'log_count': current.count()
+    }
+
+
+@pytest.fixture
+def study_logs(user):
+    """2026-10 전후의 경계 날짜(월/주 시작·끝)에 과목/개인 공부 로그를 배치"""
+    semester = Semester(user_id=user.id, name='2026년 2학기', year=2026, season='2학기')
+    db.session.add(semester)
+    db.session.flush()
+    subjects = [Subject(user_id=user.id, semester_id=semester.id, name=name, credits=3) for name in ('자료구조', '운영체제')]
+    db.session.add_all(subjects)
+    db.session.flush()
+
+    edge_days = [
+        date(2026, 8, 31), date(2026, 9, 1), date(2026, 9, 30), date(2026, 10, 1),
+        date(2026, 10, 4), date(2026, 10, 5), date(2026, 10, 11), date(2026, 10, 12),
+        date(2026, 10, 18), date(2026, 10, 19), date(2026, 10, 31), date(2026, 11, 1)
+    ]
+    for i, day in enumerate(edge_days):
+        add_study_log(user.id, day, 600 + i, subject_id=subjects[i % 2].id)
+        add_study_log(user.id, day, 60 + i)
+        if i % 3 == 0:
+            add_study_log(user.id, day, 30, subject_id=subjects[0].id)
+    db.session.commit()
+    return subjects
+
+
+@pytest.mark.parametrize('start_date, end_date, prev_start, prev_end', [
+    # 주간 (월요일 시작), 이전 주
+    (date(2026, 10, 12), date(2026, 10, 18), date(2026, 10, 5), date(2026, 10, 11)),
+    # 월간 (1일 시작), 이전 달
+    (date(2026, 10, 1), date(2026, 10, 31), date(2026, 9, 1), date(2026, 9, 30)),
+    # 일간 (월의 첫날), 전날
+    (date(2026, 10, 1), date(2026, 10, 1), date(2026, 9, 30), date(2026, 9, 30)),
+    # 로그가 없는 기간과 이전 기간
+    (date(2026, 12, 7), date(2026, 12, 13), date(2026, 11, 30), date(2026, 12, 6)),
+    # 현재 기간은 비어 있고 이전 기간에만 로그
+    (date(2026, 11, 2), date(2026, 11, 8), date(2026, 10, 26), date(2026, 11, 1)),
+])
+def test_window_aggregates_match_per_window_queries(user, study_logs, start_date, end_date, prev_start, prev_end):
+    expected = _window_aggregates_per_query(user.id, start_date, end_date, prev_start, prev_end)
+
+    assert get_study_window_aggregates(user.id, start_date, end_date, prev_start, prev_end) == expected
+
+
+def test_window_aggregates_for_empty_user(user):
+    aggregates = get_study_window_aggregates(user.id, date(2026, 10, 12), date(2026, 10, 18), date(2026, 10, 5), date(2026, 10, 11))
+
+    assert aggregates == {'daily': {}, 'subjects': {}, 'total': 0, 'previous_total': 0, 'log_count': 0}
+
+
+
+@pytest.mark.parametrize('period', ['daily', 'weekly', 'monthly'])
+def test_analysis_data_statement_count_per_period(client, user, study_logs, count_queries, period):
+    semester_id = study_logs[0].semester_id
+
+    with count_queries() as statements:
+        response = client.get(f'/api/study-analysis-data?semester_id={semester_id}&period={period}&date_str=2026-10-14')
+
+    assert response.status_code == 200
+    # 로그인 사용자 + 학기 + 현재/이전 기간 집계 + 시간대별 합계 + 연속 학습 일수 + 최근 활동 로그 (기간과 무관)
+    assert len(statements) == 6
+    assert sum('GROUP BY' in statement and 'FROM study_logs' in statement for statement in statements) == 1
+
+
+def _study_on(user_id, days, seconds=600):
+    for day in days:
+        add_study_log(user_id, day, seconds)
+    db.session.commit()
+
+
+def test_streak_stops_at_first_gap(user):
+    today = date(2026, 10, 18)
+    _study_on(user.id, [today, today - timedelta(days=1), today - timedelta(days=2), today - timedelta(days=4)])
+    add_study_log(user.id, today, 300)
+    db.session.commit()
+
+    assert get_streak_and_today_total(user.id, today) == (3, 900)
+
+
+def test_streak_is_zero_without_study_today(user):
+    today = date(2026, 10, 18)
+    _study_on(user.id, [today - timedelta(days=1), today - timedelta(days=2)])
+
+    assert get_streak_and_today_total(user.id, today) == (0, 0)
+    # 미래 날짜 기록은 오늘 기준 집계에 포함되지 않음
+    _study_on(user.id, [today + timedelta(days=1)])
+    assert get_streak_and_today_total(user.id, today) == (0, 0)
+    assert get_streak_and_today_total(user.id, today - timedelta(days=1)) == (2, 600)
+
+
+def test_streak_is_capped_at_window(user):
+    today = date(2026, 10, 18)
+    _study_on(user.id, [today - timedelta(days=i) for i in range(120)])
+
+    assert get_streak_and_today_total(user.id, today)[0] == 100
+
+
+def test_rebuild_daily_totals_matches_study_logs(user):
+    user_id = user.id
+    _study_on(user_id, [date(2026, 10, 16), date(2026, 10, 17), date(2026, 10, 17)])
+    before = {(row.date, row.total_seconds, row.session_count) for row in StudyDailyTotal.query.filter_by(user_id=user_id)}
+    # 집계가 어긋난 상황 (잘못된 값 + study_logs에 없는 날짜)
+    StudyDailyTotal.query.filter_by(user_id=user_id, date=date(2026, 10, 17)).update({'total_seconds': 1})
+    db.session.add(StudyDailyTotal(user_id=user_id, date=date(2026, 10, 1), total_seconds=50, session_count=1))
+    db.session.commit()
+
+    assert rebuild_daily_totals(user_id) == 2
+
+    rebuilt = {(row.date, row.total_seconds, row.session_count) for row in StudyDailyTotal.query.filter_by(user_id=user_id)}
+    expected = {
+        (day, total, count) for day, total, count in db.session.query(
+            StudyLog.date, db.func.sum(StudyLog.duration_seconds), db.func.count(StudyLog.entry_id)
+        ).filter_by(user_id=user_id).group_by(StudyLog.date)
+    }
+    assert rebuilt == expected == before == {(date(2026, 10, 16), 600, 1), (date(2026, 10, 17), 1200, 2)}
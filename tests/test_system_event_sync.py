@@ -0,0 +1,99 @@
+"""시스템 일정 동기화 테스트 (CSV와 DB를 비교하여 바뀐 행만 추가/수정/삭제)"""
+from datetime import date
+
+import pytest
+
+from models import db, CalendarEvent
+from services import academic_calendar_service, calendar_service
+from services.calendar_service import initialize_system_categories, sync_system_events
+
+CALENDAR_CSV = '2025,3,4,2025학년도 제1학기 개강\n2025,3,5~7,수강신청 정정 및 확인\n'
+HOLIDAYS_CSV = 'year,month,day,name,is_substitute\n2025,3,1,삼일절,0\n2025,3,3,대체공휴일,1\n'
+
+
+@pytest.fixture
+def csv_files(app, tmp_path, monkeypatch):
+    calendar_path = tmp_path / 'Calendar.csv'
+    holidays_path = tmp_path / 'holidays.csv'
+    monkeypatch.setattr(academic_calendar_service, 'CALENDAR_PATH', str(calendar_path))
+    monkeypatch.setattr(calendar_service, 'HOLIDAYS_PATH', str(holidays_path))
+
+    def write(calendar_text, holidays_text):
+        calendar_path.write_text(calendar_text, encoding='utf-8')
+        holidays_path.write_text(holidays_text, encoding='utf-8')
+        # 파일 변경 확인 간격과 무관하게 다시 읽도록 학사일정 인덱스를 비움
+        monkeypatch.setattr(academic_calendar_service, '_academic_calendar', {'mtime': None, 'checked_at': 0.0, 'index': None})
+
+    write(CALENDAR_CSV, HOLIDAYS_CSV)
+    initialize_system_categories()
+    return write
+
+
+def _system_events():
+    return {
+        (event.title, event.start_date): (event.end_date, event.span_end_date)
+        for event in CalendarEvent.query.filter_by(is_system=True)
+    }
+
+
+def _writes(statements):
+    return [s for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+
+def test_first_sync_inserts_every_row(csv_files):
+    assert sync_system_events() == (4, 0, 0)
+
+    assert _system_events() == {
+        ('2025학년도 제1학기 개강', date(2025, 3, 4)): (None, date(2025, 3, 4)),
+        ('수강신청 정정 및 확인', date(2025, 3, 5)): (date(2025, 3, 7), date(2025, 3, 7)),
+        ('삼일절', date(2025, 3, 1)): (None, date(2025, 3, 1)),
+        ('대체공휴일', date(2025, 3, 3)): (None, date(2025, 3, 3)),
+    }
+
+
+def test_unchanged_csv_resync_writes_nothing(csv_files, count_queries):
+    sync_system_events()
+    version = calendar_service._system_events_version
+
+    with count_queries() as statements:
+        assert sync_system_events() == (0, 0, 0)
+
+    assert _writes(statements) == []
+    # 변경이 없으면 시스템 이벤트 캐시도 그대로 사용
+    assert calendar_service._system_events_version == version
+
+
+def test_changed_csv_applies_insert_update_delete(csv_files, count_queries):
+    sync_system_events()
+    version = calendar_service._system_events_version
+    untouched_id = CalendarEvent.query.filter_by(title='삼일절').one().id
+
+    # 정정 기간 연장(수정), 대체공휴일 삭제, 새 공휴일 추가
+    csv_files(
+        '2025,3,4,2025학년도 제1학기 개강\n2025,3,5~10,수강신청 정정 및 확인\n',
+        'year,month,day,name,is_substitute\n2025,3,1,삼일절,0\n2025,5,5,어린이날,0\n'
+    )
+    with count_queries() as statements:
+        assert sync_system_events() == (1, 1, 1)
+
+    assert len(_writes(statements)) == 3
+    events = _system_events()
+    assert events[('수강신청 정정 및 확인', date(2025, 3, 5))] == (date(2025, 3, 10), date(2025, 3, 10))
+    assert ('어린이날', date(2025, 5, 5)) in events
+    assert ('대체공휴일', date(2025, 3, 3)) not in events
+    assert len(events) == 4
+    # 바뀌지 않은 행은 다시 만들지 않음
+    assert CalendarEvent.query.filter_by(title='삼일절').one().id == untouched_id
+    assert calendar_service._system_events_version == version + 1
+
+
+def test_duplicate_system_rows_are_removed(csv_files):
+    sync_system_events()
+    original = CalendarEvent.query.filter_by(title='삼일절').one()
+    db.session.add(CalendarEvent(
+        category_id=original.category_id, title='삼일절', start_date=date(2025, 3, 1), is_system=True
+    ))
+    db.session.commit()
+
+    assert sync_system_events() == (0, 0, 1)
+    assert [event.id for event in CalendarEvent.query.filter_by(title='삼일절')] == [original.id]
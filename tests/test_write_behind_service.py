@@ -0,0 +1,100 @@
+"""쓰기 지연 큐 테스트"""
+from services.write_behind_service import WriteBehindQueue
+
+
+def test_enabled_flag_is_read_on_first_use(monkeypatch):
+    monkeypatch.delenv('WRITE_BEHIND_ENABLED', raising=False)
+    queue = WriteBehindQueue(10, 100)
+
+    # 큐를 만든 뒤(.env 로드 전 import 상황)에 설정된 값이 반영되어야 함
+    monkeypatch.setenv('WRITE_BEHIND_ENABLED', 'False')
+    assert queue.enabled is False
+
+
+def test_explicit_enabled_flag_wins(monkeypatch):
+    monkeypatch.setenv('WRITE_BEHIND_ENABLED', 'False')
+    assert WriteBehindQueue(10, 100, enabled=True).enabled is True
+
+
+def test_like_then_unlike_cancels_without_writes(app, user, count_queries, monkeypatch):
+    from models import db, Post, PostLike
+
+    post = Post(title='t', content='c', author_id=user.id, category='일반', is_approved=True, is_visible=True)
+    db.session.add(post)
+    db.session.commit()
+
+    queue = WriteBehindQueue(10, 100, enabled=True)
+    # 백그라운드 스레드 없이 flush()를 직접 호출
+    monkeypatch.setattr(queue, 'start', lambda flask_app: setattr(queue, '_app', flask_app))
+    assert queue.toggle_post_like(post.id, user.id, lambda: False) is True
+    assert queue.toggle_post_like(post.id, user.id, lambda: False) is False
+    assert queue.toggle_post_like(post.id, user.id, lambda: False) is True
+    assert queue.get_pending_like_delta(post.id) == 1
+
+    with count_queries() as statements:
+        assert queue.flush() == 1
+    assert not any(s.lstrip().upper().startswith('DELETE') for s in statements)
+
+    db.session.expire_all()
+    assert PostLike.query.filter_by(post_id=post.id, user_id=user.id).count() == 1
+    assert db.session.get(Post, post.id).like_count == 1
+    assert queue.get_pending_like_delta(post.id) == 0
+    metrics = queue.get_metrics()
+    assert metrics['enqueued'] == 3 and metrics['coalesced'] == 2 and metrics['queue_depth'] == 0
+
+
+def test_study_time_is_written_before_responding(client, user):
+    from datetime import datetime
+    from app import KST
+    from models import StudyLog
+
+    today = datetime.now(KST).date()
+    response = client.post('/api/study-time', json={'duration_to_add': 120, 'date': today.isoformat()})
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['total_duration'] == 120
+    assert StudyLog.query.filter_by(user_id=user.id).count() == 1
+
+
+def test_set_like_is_idempotent(app, user, monkeypatch):
+    from models import db, Post, PostLike
+
+    post = Post(title='t', content='c', author_id=user.id, category='일반', is_approved=True, is_visible=True)
+    db.session.add(post)
+    db.session.commit()
+
+    queue = WriteBehindQueue(10, 100, enabled=True)
+    monkeypatch.setattr(queue, 'start', lambda flask_app: setattr(queue, '_app', flask_app))
+    # 같은 상태를 두 번 보내도 (재전송) 좋아요는 한 번만
+    assert queue.set_post_like(post.id, user.id, True, lambda: False) is True
+    assert queue.set_post_like(post.id, user.id, True, lambda: False) is True
+    assert queue.get_pending_like_delta(post.id) == 1
+    assert queue.flush() == 1
+
+    # 이미 반영된 상태와 같은 요청은 쓰기 없음
+    assert queue.set_post_like(post.id, user.id, True, lambda: True) is True
+    assert queue.get_metrics()['queue_depth'] == 0
+    assert queue.set_post_like(post.id, user.id, False, lambda: True) is False
+    assert queue.set_post_like(post.id, user.id, False, lambda: True) is False
+    assert queue.flush() == 1
+
+    db.session.expire_all()
+    assert PostLike.query.filter_by(post_id=post.id).count() == 0
+    assert db.session.get(Post, post.id).like_count == 0
+
+
+def test_like_api_sets_requested_state(client, user):
+    from models import db, Post
+
+    post = Post(title='t', content='c', author_id=user.id, category='일반', is_approved=True, is_visible=True)
+    db.session.add(post)
+    db.session.commit()
+    url = f'/api/posts/{post.id}/like'
+
+    for _ in range(2):
+        data = client.post(url, json={'liked': True}).get_json()
+        assert data['liked'] is True and data['like_count'] == 1
+    assert client.post(url, json={'liked': False}).get_json()['like_count'] == 0
+    # 본문이 없으면 기존처럼 토글
+    assert client.post(url).get_json()['liked'] is True
+    assert client.post(url, json={'liked': 'yes'}).status_code == 400
@@ -7,6 +7,8 @@
 SEASONS = ["1학기", "여름학기", "2학기", "겨울학기"]
 SEASON_ORDER = {"1학기": 1, "여름학기": 2, "2학기": 3, "겨울학기": 4}
 SEMESTER_YEAR_RANGE = (2020, 2025)
+DEFAULT_SEMESTER_WEEKS = 16
+MAX_SEMESTER_WEEKS = 26
 
 # 권한 관련 상수
 PERMISSIONS = ['general', 'associate', 'admin']
@@ -15,6 +17,20 @@ PERMISSION_MAP = {'general': '일반회원', 'associate': '협력회원', 'admin
 # 게시물 카테고리
 POST_CATEGORIES = ['공지', '홍보', '안내', '업데이트', '일반']
 
+# 커뮤니티 피드 페이지 크기
+COMMUNITY_PAGE_SIZE = 12
+COMMUNITY_MAX_PAGE_SIZE = 50
+
+# 공부 시간 일괄 저장 (타이머 구간) 제한
+STUDY_BATCH_MAX_SEGMENTS = 200
+STUDY_SEGMENT_MAX_SECONDS = 24 * 60 * 60
+# 자정을 넘어 나뉜 구간은 client_key에 "@YYYY-MM-DD"를 붙여 저장하므로 컬럼 길이(64)보다 11자 이상 짧게
+STUDY_CLIENT_KEY_MAX_LENGTH = 52
+
+# 쓰기 지연 큐 (좋아요 토글 일괄 반영)
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = 0.25
+WRITE_BEHIND_FLUSH_THRESHOLD = 100
+
 # 파일 업로드 설정
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 MAX_IMAGE_UPLOADS = 3
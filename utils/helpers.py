@@ -26,6 +26,17 @@ def calculate_gpa(subjects):
         'earned_credits': earned_credits
     }
 
+def get_upsert_insert(session):
+    """ON CONFLICT 구문을 지원하는 DB(PostgreSQL/SQLite)의 insert 함수 반환 (그 외 DB는 None)"""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
 def allowed_file(filename, allowed_extensions):
     """파일 확장자 검증"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions